@@ -7,6 +7,7 @@ import re
 from six import add_metaclass
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy, ugettext as _
 from django.core.urlresolvers import resolve
 
@@ -17,6 +18,7 @@ from openedx.core.lib.courses import course_image_url
 from search.search_engine_base import SearchEngine
 from xmodule.annotator_mixin import html_to_text
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.library_tools import normalize_key_for_search
 
 # REINDEX_AGE is the default amount of time that we look back for changes
@@ -26,6 +28,11 @@ from xmodule.library_tools import normalize_key_for_search
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# INDEX_BATCH_SIZE is the default number of items whose index is submitted to
+# the search engine in each bulk request, so that the indexes of large courses
+# aren't all held in memory and sent in a single request.
+INDEX_BATCH_SIZE = 100
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -67,6 +74,10 @@ class SearchIndexerBase(object):
     DOCUMENT_TYPE = None
     ENABLE_INDEXING_KEY = None
 
+    # The split modulestore branch whose structure versions are compared to
+    # index structures incrementally; None if they are always fully indexed.
+    INDEXED_BRANCH = None
+
     INDEX_EVENT = {
         'name': None,
         'category': None
@@ -114,7 +125,99 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def _get_split_store(cls, modulestore, structure_key):
+        """
+        Returns the split modulestore that holds the structure, or None if the
+        structure is held in another modulestore or the indexer does not
+        index structures incrementally
+        """
+        if cls.INDEXED_BRANCH is None:
+            return None
+        store = modulestore
+        if hasattr(store, '_get_modulestore_for_courselike'):
+            store = store._get_modulestore_for_courselike(structure_key)  # pylint: disable=protected-access
+        if store.get_modulestore_type(structure_key) != ModuleStoreEnum.Type.split:
+            return None
+        return store
+
+    @classmethod
+    def _indexed_version_cache_key(cls, structure_key):
+        """ Cache key of the structure version that was last indexed """
+        return u'{}.indexed_version.{}'.format(cls.INDEX_NAME, structure_key)
+
+    @staticmethod
+    def _get_reachable_blocks(structure):
+        """
+        Returns a dict of the blocks that can be reached from the root of the
+        split structure, mapping each block's key to the key of the root's child
+        it is reached through (None for the root itself)
+        """
+        blocks = structure['blocks']
+        root = structure['root']
+        reachable = {root: None}
+        stack = [(BlockKey(*child), BlockKey(*child)) for child in blocks[root].fields.get('children', [])]
+        while stack:
+            block_key, top_level_key = stack.pop()
+            if block_key in reachable or block_key not in blocks:
+                continue
+            reachable[block_key] = top_level_key
+            stack.extend(
+                (BlockKey(*child), top_level_key) for child in blocks[block_key].fields.get('children', [])
+            )
+        return reachable
+
+    @staticmethod
+    def _block_changed(old_block, new_block):
+        """ Whether the content, settings or children of a block differ between two structures """
+        return (
+            old_block.definition != new_block.definition or
+            old_block.fields != new_block.fields or
+            old_block.defaults != new_block.defaults
+        )
+
+    @classmethod
+    def _get_changes_since_indexed(cls, split_store, structure_key, current_version):
+        """
+        Compares the structure version that was last indexed with the current one
+
+        Returns a tuple of the keys of the root's children whose subtrees hold
+        added or changed blocks, and the keys of the blocks that were removed;
+        or None if the changes can't be worked out, or the root itself changed
+        in a way that may affect every item, and the whole structure has to be
+        indexed again.
+
+        The whole subtree of a changed child of the root is indexed again,
+        because the index of an item is derived from its ancestors (inherited
+        start date, location path) and descendants (content groups) as well.
+        """
+        indexed_version = cache.get(cls._indexed_version_cache_key(structure_key))
+        if indexed_version is None:
+            return None
+        if indexed_version == unicode(current_version):
+            return set(), set()
+
+        old_structure = split_store.get_structure(structure_key, indexed_version)
+        new_structure = split_store.get_structure(structure_key, current_version)
+        if old_structure is None or new_structure is None or old_structure['root'] != new_structure['root']:
+            return None
+        root = new_structure['root']
+        if cls._block_changed(old_structure['blocks'][root], new_structure['blocks'][root]):
+            return None
+
+        old_reachable = cls._get_reachable_blocks(old_structure)
+        new_reachable = cls._get_reachable_blocks(new_structure)
+        changed_top_level = set()
+        for block_key, top_level_key in new_reachable.iteritems():
+            if block_key not in old_reachable or cls._block_changed(
+                    old_structure['blocks'][block_key], new_structure['blocks'][block_key]
+            ):
+                changed_top_level.add(top_level_key)
+        removed = set(old_reachable) - set(new_reachable)
+        return changed_top_level, removed
+
+    @classmethod
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, incremental=False,
+              batch_size=INDEX_BATCH_SIZE):
         """
         Process course for indexing
 
@@ -130,6 +233,16 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        incremental (bool) - if the structure is held in the split modulestore
+            and the version that was last indexed is known, only index again
+            the parts of the structure that changed since then, and remove the
+            items that were removed since then; otherwise it is indexed as if
+            this were False
+
+        batch_size (int) - number of items whose index is submitted to the
+            search engine at once, as the items are walked through; if None,
+            all of them are submitted at the end
+
         Returns:
         Number of items that have been added to the index
         """
@@ -141,6 +254,21 @@ class SearchIndexerBase(object):
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
 
+        # The version is read before the structure is loaded, so that if it is
+        # published again meanwhile, the changes are indexed again next time.
+        split_store = cls._get_split_store(modulestore, structure_key)
+        current_version = None
+        if split_store is not None:
+            index_entry = split_store.get_course_index(structure_key)
+            if index_entry is not None:
+                current_version = index_entry['versions'].get(cls.INDEXED_BRANCH)
+        changes = None
+        if incremental and current_version is not None:
+            changes = cls._get_changes_since_indexed(split_store, structure_key, current_version)
+        if changes is not None:
+            # Every item in the changed parts is indexed, however long ago it changed.
+            triggered_at = None
+
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
             "count": 0
@@ -152,11 +280,20 @@ class SearchIndexerBase(object):
         # list - those are ready to be destroyed
         indexed_items = set()
 
-        # items_index is a list of all the items index dictionaries.
-        # it is used to collect all indexes and index them using bulk API,
-        # instead of per item index API call.
+        # items_index is a list of the items index dictionaries that haven't
+        # been submitted yet. it is used to collect indexes and index them in
+        # batches using bulk API, instead of per item index API call.
         items_index = []
 
+        def submit_items_index():
+            """
+            Submits the collected items index dictionaries to the search engine
+            """
+            if items_index:
+                batch = list(items_index)
+                del items_index[:]
+                searcher.index(cls.DOCUMENT_TYPE, batch)
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -240,11 +377,15 @@ class SearchIndexerBase(object):
                 item_index.update(cls.supplemental_fields(item))
                 items_index.append(item_index)
                 indexed_count["count"] += 1
-                return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
                 log.warning('Could not index item: %s - %r', item.location, err)
                 error_list.append(_('Could not index item: {}').format(item.location))
+                return
+
+            if batch_size and len(items_index) >= batch_size:
+                submit_items_index()
+            return item_content_groups
 
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
@@ -255,10 +396,23 @@ class SearchIndexerBase(object):
                 cls.supplemental_index_information(modulestore, structure)
 
                 # Now index the content
-                for item in structure.get_children():
-                    prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if changes is None:
+                    for item in structure.get_children():
+                        prepare_item_index(item, groups_usage_info=groups_usage_info)
+                    submit_items_index()
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                else:
+                    changed_top_level, removed = changes
+                    for item in structure.get_children():
+                        if BlockKey.from_usage_key(item.location) in changed_top_level:
+                            prepare_item_index(item, groups_usage_info=groups_usage_info)
+                    submit_items_index()
+                    removed_ids = [
+                        unicode(cls._id_modifier(structure_key.make_usage_key(block_key.type, block_key.id)))
+                        for block_key in removed
+                    ]
+                    if removed_ids:
+                        searcher.remove(cls.DOCUMENT_TYPE, removed_ids)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -271,6 +425,9 @@ class SearchIndexerBase(object):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
+        if current_version is not None:
+            cache.set(cls._indexed_version_cache_key(structure_key), unicode(current_version), None)
+
         return indexed_count["count"]
 
     @classmethod
@@ -344,6 +501,7 @@ class CoursewareSearchIndexer(SearchIndexerBase):
     INDEX_NAME = "courseware_index"
     DOCUMENT_TYPE = "courseware_content"
     ENABLE_INDEXING_KEY = 'ENABLE_COURSEWARE_INDEX'
+    INDEXED_BRANCH = ModuleStoreEnum.BranchName.published
 
     INDEX_EVENT = {
         'name': 'edx.course.index.reindexed',
@@ -0,0 +1,88 @@
+"""
+Command to benchmark indexing a course's content against an in-memory search engine.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+from timeit import default_timer
+
+from django.core.management import BaseCommand, CommandError
+from django.test.utils import override_settings
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from contentstore.courseware_index import CoursewareSearchIndexer, INDEX_BATCH_SIZE
+from contentstore.memory_search_engine import InMemorySearchEngine
+from xmodule.modulestore.django import modulestore
+
+
+MEMORY_SEARCH_ENGINE = 'contentstore.memory_search_engine.InMemorySearchEngine'
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py cms benchmark_courseware_index course-v1:edX+DemoX+Demo_Course --batch_sizes 0 100 \
+            --settings=devstack
+
+    Indexes the content of the course a number of times with each of the
+    given batch sizes (0 submits all of the items at the end), then once more
+    incrementally with the course unchanged, against a search engine that
+    keeps its documents in memory, so that the timings are those of loading
+    the course and preparing its documents.  Prints the timings as JSON.
+    """
+    help = 'Benchmarks indexing the content of a course against an in-memory search engine.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument('course_id', help='Id of the course to index.')
+        parser.add_argument(
+            '--batch_sizes',
+            help='Numbers of items to submit to the search engine at once (default: INDEX_BATCH_SIZE).',
+            nargs='+',
+            type=int,
+            default=[INDEX_BATCH_SIZE],
+        )
+        parser.add_argument(
+            '--iterations',
+            help='Number of times to index the course with each batch size.',
+            default=3,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u"Invalid course_key: '{}'".format(options['course_id']))
+        store = modulestore()
+        if not store.has_course(course_key):
+            raise CommandError(u"Course not found: '{}'".format(course_key))
+
+        results = {'course_id': unicode(course_key), 'iterations': options['iterations'], 'batch_sizes': {}}
+        with override_settings(SEARCH_ENGINE=MEMORY_SEARCH_ENGINE):
+            for batch_size in options['batch_sizes']:
+                InMemorySearchEngine.reset()
+                durations = []
+                for __ in range(options['iterations']):
+                    start = default_timer()
+                    items = CoursewareSearchIndexer.index(store, course_key, batch_size=batch_size or None)
+                    durations.append(default_timer() - start)
+                results['batch_sizes'][batch_size] = {
+                    'items': items,
+                    'mean_seconds': sum(durations) / len(durations),
+                    'min_seconds': min(durations),
+                    'index_requests': InMemorySearchEngine.stats['index_requests'] // len(durations),
+                }
+
+            # The last full index recorded the version of the course, if it is
+            # held in the split modulestore, so nothing has changed since.
+            start = default_timer()
+            items = CoursewareSearchIndexer.index(store, course_key, incremental=True)
+            results['incremental_unchanged'] = {'items': items, 'seconds': default_timer() - start}
+            InMemorySearchEngine.reset()
+
+        self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
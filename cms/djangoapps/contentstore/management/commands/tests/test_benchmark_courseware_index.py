@@ -0,0 +1,47 @@
+"""
+Tests for the benchmark_courseware_index management command
+"""
+import json
+from StringIO import StringIO
+
+from django.core.management import call_command, CommandError
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from contentstore.memory_search_engine import InMemorySearchEngine
+
+
+class TestBenchmarkCoursewareIndex(SharedModuleStoreTestCase):
+    """
+    Tests for the benchmark_courseware_index management command
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestBenchmarkCoursewareIndex, cls).setUpClass()
+        cls.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        chapter = ItemFactory.create(parent_location=cls.course.location, category='chapter')
+        sequential = ItemFactory.create(parent_location=chapter.location, category='sequential')
+        for __ in range(3):
+            ItemFactory.create(parent_location=sequential.location, category='vertical')
+
+    def test_invalid_course_key(self):
+        with self.assertRaisesRegexp(CommandError, "Invalid course_key"):
+            call_command('benchmark_courseware_index', 'invalid_key')
+
+    def test_benchmark(self):
+        output = StringIO()
+        call_command(
+            'benchmark_courseware_index', unicode(self.course.id), '--batch_sizes', '0', '2', '--iterations', '2',
+            stdout=output
+        )
+        results = json.loads(output.getvalue())
+
+        self.assertEqual(results['batch_sizes']['0']['items'], 5)
+        self.assertEqual(results['batch_sizes']['0']['index_requests'], 1)
+        self.assertEqual(results['batch_sizes']['2']['items'], 5)
+        self.assertEqual(results['batch_sizes']['2']['index_requests'], 3)
+        # Nothing changed since the course was last indexed.
+        self.assertEqual(results['incremental_unchanged']['items'], 0)
+        # The documents don't outlive the command.
+        self.assertEqual(InMemorySearchEngine.stats['indexed'], 0)
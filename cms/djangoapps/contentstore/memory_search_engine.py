@@ -0,0 +1,101 @@
+"""
+Search engine that keeps its documents in the memory of the process.
+
+It stands in for Elasticsearch when benchmarking indexing, so that timings
+don't include the network or the search cluster.  Configure it with:
+
+    SEARCH_ENGINE = "contentstore.memory_search_engine.InMemorySearchEngine"
+
+Searches support the exact field matches, filters and exclusions that
+indexing relies on, and a crude case insensitive substring match of the
+query string.
+"""
+import json
+from collections import Counter, defaultdict
+
+from search.search_engine_base import SearchEngine
+
+
+class InMemorySearchEngine(SearchEngine):
+    """
+    Search engine whose indexes are dicts shared by the instances in the process
+    """
+    # index name -> document type -> document id -> document
+    _indexes = defaultdict(lambda: defaultdict(dict))
+
+    # Numbers of requests made and documents indexed or removed
+    stats = Counter()
+
+    @classmethod
+    def reset(cls):
+        """ Remove every document and clear the stats """
+        cls._indexes.clear()
+        cls.stats.clear()
+
+    def index(self, doc_type, sources, **kwargs):
+        """ Add or replace the documents in `sources` """
+        documents = self._indexes[self.index_name][doc_type]
+        for source in sources:
+            documents[source["id"]] = source
+        self.stats["index_requests"] += 1
+        self.stats["indexed"] += len(sources)
+
+    def remove(self, doc_type, doc_ids, **kwargs):
+        """ Remove the documents with the given ids, if there are any """
+        documents = self._indexes[self.index_name][doc_type]
+        for doc_id in doc_ids:
+            documents.pop(doc_id, None)
+        self.stats["remove_requests"] += 1
+        self.stats["removed"] += len(doc_ids)
+
+    @staticmethod
+    def _matches(value, expected):
+        """ Whether a document's value, or any of its values, equals the expected one """
+        if isinstance(value, list):
+            return expected in value
+        return value == expected
+
+    def search(self, query_string=None, field_dictionary=None, filter_dictionary=None, exclude_dictionary=None,
+               **kwargs):
+        """ Returns the documents that match, in the form ElasticSearchEngine returns them """
+        doc_type = kwargs.get("doc_type")
+        if doc_type:
+            documents_by_type = {doc_type: self._indexes[self.index_name][doc_type]}
+        else:
+            documents_by_type = self._indexes[self.index_name]
+
+        results = []
+        for result_type, documents in documents_by_type.iteritems():
+            for doc_id, document in documents.iteritems():
+                if not all(
+                        self._matches(document.get(field), value)
+                        for field, value in (field_dictionary or {}).iteritems()
+                ):
+                    continue
+                if not all(
+                        field not in document or self._matches(document[field], value)
+                        for field, value in (filter_dictionary or {}).iteritems()
+                ):
+                    continue
+                if any(
+                        any(self._matches(document.get(field), value) for value in values)
+                        for field, values in (exclude_dictionary or {}).iteritems()
+                ):
+                    continue
+                if query_string and query_string.lower() not in json.dumps(document, default=unicode).lower():
+                    continue
+                results.append({
+                    "_index": self.index_name,
+                    "_type": result_type,
+                    "_id": doc_id,
+                    "data": document,
+                    "score": 1.0,
+                })
+
+        self.stats["search_requests"] += 1
+        return {
+            "took": 0,
+            "total": len(results),
+            "max_score": 1.0 if results else None,
+            "results": results,
+        }
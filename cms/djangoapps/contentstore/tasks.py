@@ -128,7 +128,9 @@ def update_search_index(course_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         course_key = CourseKey.from_string(course_id)
-        CoursewareSearchIndexer.index(modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        CoursewareSearchIndexer.index(
+            modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat)), incremental=True
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for complete course %s - %s', course_id, text_type(exc))
@@ -258,6 +258,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
             reindex_age=(trigger_time - since_time)
         )
 
+    def index_incrementally(self, store):
+        """ index the changes to the course since it was last indexed """
+        return CoursewareSearchIndexer.index(store, self.course.id, incremental=True)
+
     def _get_default_search(self):
         return {"course": unicode(self.course.id)}
 
@@ -441,6 +445,62 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes the parts of split courses that changed """
+        is_split = store.get_modulestore_type(self.course.id) == ModuleStoreEnum.Type.split
+        self.publish_item(store, self.vertical.location)
+        chapter2 = ItemFactory.create(
+            parent_location=self.course.location,
+            category='chapter',
+            display_name="Week 2",
+            modulestore=store,
+            publish_item=True,
+        )
+        ItemFactory.create(
+            parent_location=chapter2.location,
+            category='sequential',
+            display_name="Lesson 2",
+            modulestore=store,
+            publish_item=True,
+        )
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 6)
+
+        # nothing has changed since the course was indexed
+        self.assertEqual(self.index_incrementally(store), 0 if is_split else 6)
+
+        # add content to the first chapter, so that only it is indexed again
+        ItemFactory.create(
+            parent_location=self.vertical.location,
+            category="html",
+            display_name="Some other content",
+            publish_item=False,
+            modulestore=store,
+        )
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_incrementally(store), 5 if is_split else 7)
+        self.assertEqual(self.search()["total"], 7)
+
+        # remove content from the first chapter
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_incrementally(store), 4 if is_split else 6)
+        response = self.search()
+        self.assertEqual(response["total"], 6)
+        self.assertNotIn(unicode(self.html_unit.location), [result["data"]["id"] for result in response["results"]])
+
+    def _test_incremental_index_course_changed(self, store):
+        """ Make sure that the whole course is indexed again when the course itself changes """
+        self.publish_item(store, self.vertical.location)
+        self.reindex_course(store)
+
+        self.course.display_name = "Renamed Search Index Test Course"
+        self.update_item(store, self.course)
+        self.assertEqual(self.index_incrementally(store), 4)
+        response = self.search()
+        for result in response["results"]:
+            self.assertEqual(result["data"]["course_name"], "Renamed Search Index Test Course")
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -537,6 +597,18 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         self.assertEqual(result["course_name"], "Search Index Test Course")
         self.assertEqual(result["location"], ["Week 1", CoursewareSearchIndexer.UNNAMED_MODULE_NAME, "Subsection 2"])
 
+    def _test_batched_index(self, store):
+        """ Make sure that items are submitted to the search engine in batches of the given size """
+        self.publish_item(store, self.vertical.location)
+        with patch(settings.SEARCH_ENGINE + '.index') as mock_index:
+            indexed_count = CoursewareSearchIndexer.index(store, self.course.id, batch_size=3)
+        self.assertEqual(indexed_count, 4)
+        self.assertEqual([len(kall[0][1]) for kall in mock_index.call_args_list], [3, 1])
+
+        with patch(settings.SEARCH_ENGINE + '.index') as mock_index:
+            CoursewareSearchIndexer.index(store, self.course.id, batch_size=None)
+        self.assertEqual([len(kall[0][1]) for kall in mock_index.call_args_list], [4])
+
     @patch('django.conf.settings.SEARCH_ENGINE', 'search.tests.utils.ErroringIndexEngine')
     def _test_exception(self, store):
         """ Test that exception within indexing yields a SearchIndexingError """
@@ -572,6 +644,18 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index_course_changed(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index_course_changed)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_batched_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_batched_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
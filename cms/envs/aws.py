@@ -110,6 +110,9 @@ DEFAULT_COURSE_ABOUT_IMAGE_URL = ENV_TOKENS.get('DEFAULT_COURSE_ABOUT_IMAGE_URL'
 # for course data
 GITHUB_REPO_ROOT = ENV_TOKENS.get('GITHUB_REPO_ROOT', GITHUB_REPO_ROOT)
 
+# MAKO_PRECOMPILED_MODULE_DIR holds the templates compiled at build time
+MAKO_PRECOMPILED_MODULE_DIR = ENV_TOKENS.get('MAKO_PRECOMPILED_MODULE_DIR', MAKO_PRECOMPILED_MODULE_DIR)
+
 # STATIC_ROOT specifies the directory where static files are
 # collected
 
@@ -355,6 +358,7 @@ XBLOCK_FIELD_DATA_WRAPPERS = ENV_TOKENS.get(
 )
 
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
+CONTENTSERVER.update(ENV_TOKENS.get('CONTENTSERVER', {}))
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
@@ -259,6 +259,10 @@ GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
 # TODO: Move the Mako templating into a different engine in TEMPLATES below.
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_cms')
+# A directory of templates compiled ahead of time by the precompile_mako_templates
+# command, shared read-only by all the servers.  Templates missing from it are
+# compiled into MAKO_MODULE_DIR.
+MAKO_PRECOMPILED_MODULE_DIR = None
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [
     PROJECT_ROOT / 'templates',
@@ -474,6 +478,26 @@ MODULESTORE = {
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
 
+############################## Course assets ##################################
+
+# Course assets larger than MAX_CACHED_SIZE bytes are streamed from the
+# contentstore rather than cached whole.  If DISK_CACHE_ROOT is set to a local
+# directory, the data of the assets served is cached there instead, up to
+# DISK_CACHE_MAX_SIZE bytes, and only their metadata is cached in memcached.
+# If SENDFILE_HEADER is also set, assets of at least SENDFILE_MIN_SIZE bytes
+# are served by the front-end proxy: the contentserver answers with that
+# header ('X-Accel-Redirect' for nginx) set to the path of the copy under
+# SENDFILE_URL_PREFIX, an internal location the proxy maps to DISK_CACHE_ROOT,
+# or to its absolute path if SENDFILE_URL_PREFIX is None, as X-Sendfile expects.
+CONTENTSERVER = {
+    'MAX_CACHED_SIZE': 1048576,
+    'DISK_CACHE_ROOT': None,
+    'DISK_CACHE_MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    'SENDFILE_HEADER': None,
+    'SENDFILE_MIN_SIZE': 1048576,
+    'SENDFILE_URL_PREFIX': '/protected-course-assets/',
+}
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1,11 +1,12 @@
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth.models import User
 
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils.translation import ugettext_noop
 
 from config_models.models import ConfigurationModel
@@ -20,6 +21,9 @@ FORUM_ROLE_MODERATOR = ugettext_noop('Moderator')
 FORUM_ROLE_COMMUNITY_TA = ugettext_noop('Community TA')
 FORUM_ROLE_STUDENT = ugettext_noop('Student')
 
+ROLE_USER_IDS_CACHE_KEY = u'django_comment_common.role_user_ids.{course_id}'
+ROLE_USER_IDS_CACHE_TIMEOUT = 60 * 60
+
 
 @receiver(post_save, sender=CourseEnrollment)
 def assign_default_role_on_enrollment(sender, instance, **kwargs):
@@ -55,7 +59,9 @@ def assign_role(course_id, user, rolename):
     Assign forum role `rolename` to user
     """
     role, __ = Role.objects.get_or_create(course_id=course_id, name=rolename)
-    user.roles.add(role)
+    # Added from the role's side, so that the cache of the course's role
+    # members needn't look up the role.
+    role.users.add(user)
 
 
 class Role(models.Model):
@@ -104,6 +110,69 @@ class Role(models.Model):
         return self.permissions.filter(name=permission).exists()
 
 
+def get_role_user_ids(course_id):
+    """
+    Returns a dict mapping the name of each forum role of the course, other
+    than Student, to the ids of its users, in ascending order.
+
+    The result is cached across requests, until the course's roles or their
+    members change.
+    """
+    cache_key = ROLE_USER_IDS_CACHE_KEY.format(course_id=course_id)
+    role_user_ids = cache.get(cache_key)
+    if role_user_ids is None:
+        role_user_ids = {}
+        roles = Role.objects.filter(course_id=course_id).exclude(name=FORUM_ROLE_STUDENT)
+        for name, user_id in roles.order_by('users__id').values_list('name', 'users__id'):
+            user_ids = role_user_ids.setdefault(name, [])
+            if user_id is not None:
+                user_ids.append(user_id)
+        cache.set(cache_key, role_user_ids, ROLE_USER_IDS_CACHE_TIMEOUT)
+    return role_user_ids
+
+
+def _invalidate_role_user_ids(course_ids):
+    """
+    Removes the cached role members of the given courses.
+    """
+    cache.delete_many([ROLE_USER_IDS_CACHE_KEY.format(course_id=course_id) for course_id in set(course_ids)])
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_user_ids_on_role_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached role members of the course whose role changed.
+    """
+    _invalidate_role_user_ids([instance.course_id])
+
+
+@receiver(m2m_changed, sender=Role.users.through)
+def invalidate_role_user_ids_on_membership_change(
+        sender, instance, action, reverse, pk_set, **kwargs
+):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached role members of the courses whose role members
+    changed.  Changes to the Student role, which isn't cached, are ignored.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        # The users of a role changed.
+        if instance.name != FORUM_ROLE_STUDENT:
+            _invalidate_role_user_ids([instance.course_id])
+        return
+
+    # The roles of a user changed.
+    if action == 'pre_clear':
+        roles = instance.roles.all()
+    elif pk_set:
+        roles = Role.objects.filter(id__in=pk_set)
+    else:
+        return
+    _invalidate_role_user_ids(roles.exclude(name=FORUM_ROLE_STUDENT).values_list('course_id', flat=True))
+
+
 class Permission(models.Model):
     name = models.CharField(max_length=30, null=False, blank=False, primary_key=True)
     roles = models.ManyToManyField(Role, related_name="permissions")
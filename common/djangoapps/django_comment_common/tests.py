@@ -1,7 +1,14 @@
 from django.test import TestCase
 
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
-from django_comment_common.models import Role
+from django_comment_common.models import (
+    FORUM_ROLE_COMMUNITY_TA,
+    FORUM_ROLE_MODERATOR,
+    FORUM_ROLE_STUDENT,
+    Role,
+    get_role_user_ids,
+)
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 from student.models import CourseEnrollment, User
 
 
@@ -55,3 +62,55 @@ class RoleAssignmentTest(TestCase):
     #     )
     #     self.assertNotIn(student_role, self.student_user.roles.all())
     #     self.assertIn(student_role, another_student.roles.all())
+
+
+class RoleUserIdsTest(CacheIsolationTestCase):
+    """
+    Tests for the cached members of a course's forum roles.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(RoleUserIdsTest, self).setUp()
+        self.course_key = SlashSeparatedCourseKey("edX", "Fake101", "2012")
+        self.moderator_role = Role.objects.create(course_id=self.course_key, name=FORUM_ROLE_MODERATOR)
+        self.ta_role = Role.objects.create(course_id=self.course_key, name=FORUM_ROLE_COMMUNITY_TA)
+        self.users = [User.objects.create_user("user{}".format(index)) for index in range(3)]
+
+    def test_role_user_ids(self):
+        self.moderator_role.users.add(self.users[0])
+        self.ta_role.users.add(self.users[2], self.users[1])
+        CourseEnrollment.enroll(self.users[1], self.course_key)
+
+        expected = {
+            FORUM_ROLE_MODERATOR: [self.users[0].id],
+            FORUM_ROLE_COMMUNITY_TA: [self.users[1].id, self.users[2].id],
+        }
+        self.assertEqual(get_role_user_ids(self.course_key), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_role_user_ids(self.course_key), expected)
+
+    def test_invalidated_when_role_users_change(self):
+        self.assertEqual(get_role_user_ids(self.course_key), {FORUM_ROLE_MODERATOR: [], FORUM_ROLE_COMMUNITY_TA: []})
+
+        self.moderator_role.users.add(self.users[0])
+        self.assertEqual(get_role_user_ids(self.course_key)[FORUM_ROLE_MODERATOR], [self.users[0].id])
+
+        self.users[1].roles.add(self.ta_role)
+        self.assertEqual(get_role_user_ids(self.course_key)[FORUM_ROLE_COMMUNITY_TA], [self.users[1].id])
+
+        self.users[1].roles.clear()
+        self.assertEqual(get_role_user_ids(self.course_key)[FORUM_ROLE_COMMUNITY_TA], [])
+
+        self.moderator_role.delete()
+        self.assertNotIn(FORUM_ROLE_MODERATOR, get_role_user_ids(self.course_key))
+
+    def test_not_invalidated_by_student_role(self):
+        # Creates the Student role of the course.
+        CourseEnrollment.enroll(self.users[1], self.course_key)
+        get_role_user_ids(self.course_key)
+        CourseEnrollment.enroll(self.users[0], self.course_key)
+
+        self.assertTrue(self.users[0].roles.filter(name=FORUM_ROLE_STUDENT).exists())
+        with self.assertNumQueries(0):
+            get_role_user_ids(self.course_key)
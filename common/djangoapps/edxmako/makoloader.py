@@ -7,6 +7,7 @@ from django.template.loaders.filesystem import Loader as FilesystemLoader
 from django.template.loaders.app_directories import Loader as AppDirectoriesLoader
 from django.template import Engine
 
+from edxmako.precompiled import TEMPLATE_OPTIONS, precompiled_module_path
 from edxmako.template import Template
 
 from openedx.core.lib.tempdir import mkdtemp_clean
@@ -50,11 +51,9 @@ class MakoLoader(object):
             # This is a mako template
             template = Template(filename=file_path,
                                 module_directory=module_directory,
-                                input_encoding='utf-8',
-                                output_encoding='utf-8',
-                                default_filters=['decode.utf8'],
-                                encoding_errors='replace',
-                                uri=template_name)
+                                module_filename=precompiled_module_path(file_path, template_name),
+                                uri=template_name,
+                                **TEMPLATE_OPTIONS)
             return template, None
         else:
             # This is a regular template
@@ -12,6 +12,7 @@ from mako.lookup import TemplateLookup
 from mako.exceptions import TopLevelLookupException
 
 from . import LOOKUP
+from .precompiled import TEMPLATE_OPTIONS, precompiled_module_path
 from openedx.core.djangoapps.theming.helpers import (
     get_template as themed_template,
     get_template_path_with_theme,
@@ -99,10 +100,8 @@ def add_lookup(namespace, directory, package=None, prepend=False):
     if not templates:
         LOOKUP[namespace] = templates = DynamicTemplateLookup(
             module_directory=settings.MAKO_MODULE_DIR,
-            output_encoding='utf-8',
-            input_encoding='utf-8',
-            default_filters=['decode.utf8'],
-            encoding_errors='replace',
+            modulename_callable=precompiled_module_path,
+            **TEMPLATE_OPTIONS
         )
     if package:
         directory = pkg_resources.resource_filename(package, directory)
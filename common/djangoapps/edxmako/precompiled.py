@@ -0,0 +1,134 @@
+"""
+A shared, read-only cache of compiled Mako template modules.
+
+Mako compiles each template into a python module the first time a process
+loads it, and writes the module to the lookup's module directory.  That
+directory is local to the server, so every freshly deployed server compiles
+the templates again while it serves its first requests.
+
+The `precompile_mako_templates` management command compiles the templates of
+every lookup ahead of time, into settings.MAKO_PRECOMPILED_MODULE_DIR, along
+with their python bytecode.  Each module is stored under a key made of the
+template's file path, the uri it is loaded by (which names the theme of
+themed templates), the template's modification time and the Mako code
+generator version.  A template that has changed since the cache was built
+misses it, and is compiled into the usual module directory instead.
+"""
+import hashlib
+import logging
+import os
+import py_compile
+
+from django.conf import settings
+from mako import codegen
+from mako.template import Template as MakoTemplate
+
+log = logging.getLogger(__name__)
+
+# The options every edxmako template is compiled with.
+TEMPLATE_OPTIONS = {
+    'input_encoding': 'utf-8',
+    'output_encoding': 'utf-8',
+    'default_filters': ['decode.utf8'],
+    'encoding_errors': 'replace',
+}
+
+# The extensions of the files in the template directories that are Mako
+# templates.  Underscore templates are rendered client side.
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml', '.js')
+
+
+def _module_key(filename, uri, mtime):
+    """
+    Returns the name the compiled module of a template is cached under.
+    """
+    key_parts = [
+        str(codegen.MAGIC_NUMBER),
+        repr(sorted(TEMPLATE_OPTIONS.items())),
+        os.path.abspath(filename),
+        uri.lstrip('/'),
+        str(mtime),
+    ]
+    key_data = '|'.join(
+        part.encode('utf-8') if isinstance(part, unicode) else part
+        for part in key_parts
+    )
+    return hashlib.sha1(key_data).hexdigest()
+
+
+def _module_path(module_dir, filename, uri):
+    """
+    Returns the path in `module_dir` of the compiled module of a template.
+    """
+    mtime = int(os.stat(filename).st_mtime)
+    return os.path.join(module_dir, _module_key(filename, uri, mtime) + '.py')
+
+
+def precompiled_module_path(filename, uri, module_dir=None):
+    """
+    Returns the path of the precompiled module of a template in `module_dir`,
+    which defaults to settings.MAKO_PRECOMPILED_MODULE_DIR, or None if the
+    template has not been precompiled.
+
+    This has the signature of the `modulename_callable` of Mako lookups; when
+    it returns None the module is compiled into the lookup's module directory.
+    """
+    module_dir = module_dir or getattr(settings, 'MAKO_PRECOMPILED_MODULE_DIR', None)
+    if not module_dir:
+        return None
+
+    try:
+        path = _module_path(module_dir, filename, uri)
+        # Mako recompiles modules older than their template, and the cache
+        # directory may not be writable.
+        if os.stat(path).st_mtime < os.stat(filename).st_mtime:
+            return None
+    except OSError:
+        return None
+    return path
+
+
+def find_templates(directories):
+    """
+    Yields the (filename, uri) of the templates in each of `directories`.
+    """
+    for directory in directories:
+        for dirpath, __, filenames in os.walk(directory):
+            for name in sorted(filenames):
+                if not name.endswith(TEMPLATE_EXTENSIONS):
+                    continue
+                filename = os.path.join(dirpath, name)
+                uri = os.path.relpath(filename, directory).replace(os.path.sep, '/')
+                yield filename, uri
+
+
+def compile_template(module_dir, filename, uri):
+    """
+    Compiles a template and its bytecode into `module_dir`, and returns the
+    path of the compiled module.
+    """
+    path = _module_path(module_dir, filename, uri)
+    if not os.path.exists(path):
+        MakoTemplate(filename=filename, uri=uri, module_filename=path, **TEMPLATE_OPTIONS)
+    py_compile.compile(path, doraise=True)
+    return path
+
+
+def compile_templates(module_dir, directories):
+    """
+    Compiles the templates in `directories` into `module_dir`.
+
+    Files that fail to compile, such as Django templates that share a
+    directory with Mako ones, are logged and skipped.  Returns the lists of
+    the (filename, uri) of the templates that compiled and that failed.
+    """
+    compiled, failed = [], []
+    for filename, uri in find_templates(directories):
+        try:
+            compile_template(module_dir, filename, uri)
+        except Exception:  # pylint: disable=broad-except
+            log.info(u'Skipped precompiling %s', filename, exc_info=True)
+            failed.append((filename, uri))
+        else:
+            compiled.append((filename, uri))
+    return compiled, failed
@@ -1,4 +1,5 @@
 from mock import patch, Mock
+import os
 import unittest
 import ddt
 
@@ -10,13 +11,15 @@ from django.test.utils import override_settings
 from django.test.client import RequestFactory
 from django.core.urlresolvers import reverse
 from edxmako.request_context import get_template_request_context
-from edxmako import add_lookup, LOOKUP
+from edxmako import add_lookup, lookup_template, save_lookups, LOOKUP
+from edxmako.precompiled import compile_templates, precompiled_module_path
 from edxmako.shortcuts import (
     marketing_link,
     is_marketing_link_set,
     is_any_marketing_link_set,
     render_to_string,
 )
+from openedx.core.lib.tempdir import mkdtemp_clean
 from student.tests.factories import UserFactory
 from util.testing import UrlResetMixin
 
@@ -80,6 +83,64 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class PrecompiledTemplatesTests(TestCase):
+    """
+    Test loading templates from the precompiled module directory.
+    """
+    def setUp(self):
+        super(PrecompiledTemplatesTests, self).setUp()
+        self.template_dir = mkdtemp_clean()
+        self.module_dir = mkdtemp_clean()
+        self.template_path = self._write_template('greeting.html', u'<p>${greeting}</p>')
+        self._write_template('client.underscore', u'<p><%= greeting %></p>')
+        self.broken_template_path = self._write_template('broken.html', u'<p><%= greeting %></p>')
+
+    def _write_template(self, name, source):
+        """
+        Writes a template modified in the past, and returns its path.
+        """
+        path = os.path.join(self.template_dir, name)
+        with open(path, 'w') as template_file:
+            template_file.write(source.encode('utf-8'))
+        os.utime(path, (1000000000, 1000000000))
+        return path
+
+    def test_compile_templates(self):
+        compiled, failed = compile_templates(self.module_dir, [self.template_dir])
+        self.assertEqual(compiled, [(self.template_path, 'greeting.html')])
+        self.assertEqual(failed, [(self.broken_template_path, 'broken.html')])
+
+        module_path = precompiled_module_path(self.template_path, 'greeting.html', self.module_dir)
+        self.assertTrue(module_path.startswith(self.module_dir))
+        self.assertTrue(os.path.exists(module_path + 'c'))
+        # Uris are looked up with and without a leading slash.
+        self.assertEqual(precompiled_module_path(self.template_path, '/greeting.html', self.module_dir), module_path)
+
+    def test_lookup_loads_precompiled_module(self):
+        compile_templates(self.module_dir, [self.template_dir])
+        with save_lookups(), override_settings(MAKO_PRECOMPILED_MODULE_DIR=self.module_dir):
+            add_lookup('precompiled', self.template_dir)
+            template = lookup_template('precompiled', 'greeting.html')
+            self.assertTrue(template.module.__file__.startswith(self.module_dir))
+            self.assertEqual(template.render_unicode(greeting=u'hello'), u'<p>hello</p>')
+
+    def test_changed_template_is_compiled(self):
+        compile_templates(self.module_dir, [self.template_dir])
+        os.utime(self.template_path, None)
+        with override_settings(MAKO_PRECOMPILED_MODULE_DIR=self.module_dir):
+            self.assertIsNone(precompiled_module_path(self.template_path, 'greeting.html'))
+
+        with save_lookups(), override_settings(MAKO_PRECOMPILED_MODULE_DIR=self.module_dir):
+            add_lookup('precompiled', self.template_dir)
+            template = lookup_template('precompiled', 'greeting.html')
+            self.assertFalse(template.module.__file__.startswith(self.module_dir))
+
+    def test_not_configured(self):
+        compile_templates(self.module_dir, [self.template_dir])
+        with override_settings(MAKO_PRECOMPILED_MODULE_DIR=None):
+            self.assertIsNone(precompiled_module_path(self.template_path, 'greeting.html'))
+
+
 class MakoRequestContextTest(TestCase):
     """
     Test MakoMiddleware.
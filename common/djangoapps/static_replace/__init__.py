@@ -5,6 +5,7 @@ from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
 
+import request_cache
 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore import ModuleStoreEnum
@@ -15,6 +16,15 @@ from opaque_keys.edx.locator import AssetLocator
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# Compiled url regexes, keyed by prefix pattern.  The prefixes are built from
+# settings.STATIC_URL and the course data directories, so there are only ever a
+# handful of them; the limit is a guard against unexpected growth.
+_COMPILED_URL_REGEXES = {}
+MAX_COMPILED_URL_REGEXES = 1000
+
+# Name of the request cache holding the contentstore urls resolved for each course.
+ASSET_URLS_REQUEST_CACHE = 'static_replace.asset_urls'
+
 
 def _url_replace_regex(prefix):
     """
@@ -32,6 +42,44 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled _url_replace_regex for `prefix`, compiling it only
+    the first time it is needed.
+    """
+    regex = _COMPILED_URL_REGEXES.get(prefix)
+    if regex is None:
+        if len(_COMPILED_URL_REGEXES) >= MAX_COMPILED_URL_REGEXES:
+            _COMPILED_URL_REGEXES.clear()
+        regex = _COMPILED_URL_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the prefix pattern matching static urls that aren't already
+    inside `data_dir`.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+def _is_xblock_resource_url(prefix, rest):
+    """
+    Returns whether the matched static url is an XBlock resource link.
+    """
+    # Probably wasn't a good idea that /static works for actual static assets
+    # and for magical course asset URLs....
+    full_url = prefix + rest
+
+    starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -73,7 +121,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -93,7 +141,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -111,26 +159,13 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        # Don't rewrite XBlock resource links.
+        if _is_xblock_resource_url(prefix, rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -150,18 +185,52 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
+def _static_url_replacer(data_directory=None, course_id=None, static_asset_path='', asset_urls=None):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..)
+    Returns the function replace_static_urls runs on each matched static url.
 
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    The asset base url and excluded extensions are looked up at most once per
+    replacer.  If `asset_urls` is given, the urls resolved for course content
+    are memoized in it, keyed by the matched path.
     """
+    asset_config = []
+
+    def get_asset_config():
+        """
+        Returns the asset base url and excluded extensions.
+        """
+        if not asset_config:
+            asset_config.extend([
+                AssetBaseUrlConfig.get_base_url(),
+                AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            ])
+        return asset_config
+
+    def resolve_course_url(rest):
+        """
+        Returns the url of a static file or course asset when the course content is in the contentstore.
+        """
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            return staticfiles_storage.url(rest)
+
+        # if not, then assume it's courseware specific content and then look in the
+        # Mongo-backed database
+        base_url, excluded_exts = get_asset_config()
+        url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+        if AssetLocator.CANONICAL_NAMESPACE in url:
+            url = url.replace('block@', 'block/', 1)
+        return url
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -176,27 +245,12 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             return original
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
+            if asset_urls is None:
+                url = resolve_course_url(rest)
             else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+                url = asset_urls.get(rest)
+                if url is None:
+                    url = asset_urls[rest] = resolve_course_url(rest)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -215,4 +269,66 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
 
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
+
+
+def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..)
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    """
+    return process_static_urls(
+        text,
+        _static_url_replacer(data_directory, course_id, static_asset_path),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+def replace_urls(text, course_id, jump_to_id_base_url=None, data_directory=None, static_asset_path=''):
+    """
+    Applies replace_static_urls, replace_course_urls and, if `jump_to_id_base_url`
+    is given, replace_jump_to_id_urls to `text` in a single scan.
+
+    The urls resolved for course content are memoized in the request cache, per
+    course, so a page rendering many blocks only looks each asset up once.
+
+    text: The source text to do the substitution in
+    course_id: The course in which this rewrite happens
+    jump_to_id_base_url: The base of the jump_to_id handler, as for replace_jump_to_id_urls
+    data_directory: The directory in which course data is stored
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    """
+    prefixes = [_static_url_prefix(static_asset_path or data_directory), '/course/']
+    if jump_to_id_base_url is not None:
+        prefixes.append('/jump_to_id/')
+    regex = _compiled_url_replace_regex(u'|'.join(prefixes))
+
+    course_url_base = u'/courses/{}/'.format(course_id.to_deprecated_string())
+    asset_urls = request_cache.get_cache(ASSET_URLS_REQUEST_CACHE).setdefault(course_id, {})
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path, asset_urls)
+
+    def replace_url(match):
+        """
+        Replace a single matched url according to its prefix.
+        """
+        original = match.group(0)
+        prefix = match.group('prefix')
+        quote = match.group('quote')
+        rest = match.group('rest')
+
+        if prefix == '/course/':
+            return "".join([quote, course_url_base, rest, quote])
+        elif prefix == '/jump_to_id/':
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+        elif _is_xblock_resource_url(prefix, rest):
+            return original
+        return replace_static_url(original, prefix, quote, rest)
+
+    return regex.sub(replace_url, text)
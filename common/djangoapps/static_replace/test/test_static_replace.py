@@ -10,9 +10,12 @@ from urlparse import urlparse, urlunparse, parse_qsl
 from PIL import Image
 from cStringIO import StringIO
 from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
+from request_cache.middleware import RequestCache
 from static_replace import (
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -228,6 +231,72 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.AssetBaseUrlConfig.get_base_url')
+@patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
+def test_replace_urls_single_pass(mock_get_excluded_extensions, mock_get_base_url, mock_storage, mock_static_content):
+    """
+    Make sure replace_urls gives the same result as running
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls in turn.
+    """
+    RequestCache.clear_request_cache()
+    mock_storage.exists.side_effect = lambda path: path.startswith('js/')
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    mock_static_content.get_canonicalized_asset_path.side_effect = (
+        lambda course_key, path, base_url, excluded_exts: '/c4x/org/course/asset/' + path
+    )
+    mock_get_base_url.return_value = u''
+    mock_get_excluded_extensions.return_value = ['.html']
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+    text = (
+        '<img src="/static/file.png"/><script src=\'/static/js/app.js\'></script>'
+        '<a href="/course/info">info</a><a href="/jump_to_id/intro">intro</a>'
+        '<img src="/static/file.png?raw"/><img src="/static/xblock/resources/a.b/public/c.png"/>'
+        '<img src="/static/file.png"/>'
+    )
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url
+    )
+    assert_equals(expected, replace_urls(text, COURSE_KEY, jump_to_id_base_url, DATA_DIRECTORY))
+    RequestCache.clear_request_cache()
+
+
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.AssetBaseUrlConfig.get_base_url')
+@patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
+def test_replace_urls_memoizes_asset_paths(mock_get_excluded_extensions, mock_get_base_url, mock_storage,
+                                           mock_static_content):
+    """
+    Make sure replace_urls looks up each course asset, and the asset
+    configuration, only once per request.
+    """
+    RequestCache.clear_request_cache()
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = '/c4x/org/course/asset/file.png'
+    mock_get_base_url.return_value = u''
+    mock_get_excluded_extensions.return_value = []
+
+    text = '"/static/file.png" "/static/file.png"'
+    expected = '"/c4x/org/course/asset/file.png" "/c4x/org/course/asset/file.png"'
+    assert_equals(expected, replace_urls(text, COURSE_KEY, data_directory=DATA_DIRECTORY))
+    assert_equals(expected, replace_urls(text, COURSE_KEY, data_directory=DATA_DIRECTORY))
+
+    mock_static_content.get_canonicalized_asset_path.assert_called_once_with(COURSE_KEY, 'file.png', u'', [])
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_get_base_url.assert_called_once_with()
+
+    # A new request looks the asset up again.
+    RequestCache.clear_request_cache()
+    assert_equals(expected, replace_urls(text, COURSE_KEY, data_directory=DATA_DIRECTORY))
+    assert_equals(mock_static_content.get_canonicalized_asset_path.call_count, 2)
+    RequestCache.clear_request_cache()
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -101,6 +101,8 @@ def check_verify_status_by_course(user, course_enrollments):
     course_deadlines = VerificationDeadline.deadlines_for_courses(enrolled_course_keys)
 
     recent_verification_datetime = None
+    # Whether the user is verified is looked up at most once, when first needed.
+    user_is_verified = None
 
     for enrollment in course_enrollments:
 
@@ -149,7 +151,9 @@ def check_verify_status_by_course(user, course_enrollments):
             )
             if status is None and not submitted:
                 if deadline is None or deadline > datetime.now(UTC):
-                    if SoftwareSecurePhotoVerification.user_is_verified(user):
+                    if user_is_verified is None:
+                        user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(user)
+                    if user_is_verified:
                         if verification_expiring_soon:
                             # The user has an active verification, but the verification
                             # is set to expire within "EXPIRING_SOON_WINDOW" days (default is 4 weeks).
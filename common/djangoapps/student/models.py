@@ -1449,16 +1449,16 @@ class CourseEnrollment(models.Model):
         We try to preload all CourseOverviews, which are usually lazily loaded
         as the .course_overview property. This is to avoid making an extra
         query for every enrollment when displaying something like the student
-        dashboard. If some of the CourseOverviews are not found, we make no
-        attempt to initialize them -- we just fall back to existing lazy-load
-        behavior. The goal is to optimize the most common case as simply as
-        possible, without changing any of the existing contracts.
+        dashboard. If some of the CourseOverviews are not found, they are
+        regenerated in the background, and we just fall back to existing
+        lazy-load behavior. The goal is to optimize the most common case as
+        simply as possible, without changing any of the existing contracts.
 
         The name of this method is long, but was the end result of hashing out a
         number of alternatives, so pylint can stuff it (disable=invalid-name)
         """
         enrollments = list(cls.enrollments_for_user(user))
-        overviews = CourseOverview.get_from_ids_if_exists(
+        overviews = CourseOverview.get_from_ids(
             enrollment.course_id for enrollment in enrollments
         )
         for enrollment in enrollments:
@@ -1507,11 +1507,15 @@ class CourseEnrollment(models.Model):
 
         return status_hash
 
-    def is_paid_course(self):
+    def is_paid_course(self, modes=None):
         """
         Returns True, if course is paid
+
+        `modes` optionally gives the course's modes, as returned by
+        CourseMode.modes_for_course, to avoid looking them up.
         """
-        paid_course = CourseMode.is_white_label(self.course_id)
+        modes_dict = CourseMode.modes_for_course_dict(self.course_id, modes=modes)
+        paid_course = CourseMode.is_white_label(self.course_id, modes_dict=modes_dict)
         if paid_course or CourseMode.is_professional_slug(self.mode):
             return True
 
@@ -1531,7 +1535,7 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self, user_already_has_certs_for=None):
+    def refundable(self, user_already_has_certs_for=None, modes=None):
         """
         For paid/verified certificates, students may always receive a refund if
         this CourseEnrollment's `can_refund` attribute is not `None` (that
@@ -1548,6 +1552,9 @@ class CourseEnrollment(models.Model):
             `user_already_has_certs_for` (set of `CourseKey`):
                  An optional param that is a set of `CourseKeys` that the user
                  has already been issued certificates in.
+            `modes` (list of `Mode`):
+                 An optional param that is the course's modes, as returned by
+                 `CourseMode.modes_for_course`.
 
         Returns:
             bool: Whether is CourseEnrollment can be refunded.
@@ -1568,16 +1575,18 @@ class CourseEnrollment(models.Model):
             if GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
                 return False
 
+        # Only verified enrollments can be refunded.  This is checked before
+        # the cutoff date, which needs the order from the E-Commerce service.
+        course_mode = CourseMode.mode_for_course(self.course_id, 'verified', modes=modes)
+        if course_mode is None:
+            return False
+
         # If it is after the refundable cutoff date they should not be refunded.
         refund_cutoff_date = self.refund_cutoff_date()
         if refund_cutoff_date and datetime.now(UTC) > refund_cutoff_date:
             return False
 
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
-        if course_mode is None:
-            return False
-        else:
-            return True
+        return True
 
     def refund_cutoff_date(self):
         """ Calculate and return the refund window end date. """
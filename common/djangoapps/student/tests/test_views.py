@@ -12,14 +12,20 @@ from django.test import TestCase
 from edx_oauth2_provider.constants import AUTHORIZED_CLIENTS_SESSION_KEY
 from edx_oauth2_provider.tests.factories import ClientFactory, TrustedClientFactory
 from mock import patch
+from opaque_keys.edx.locator import CourseLocator
 from pyquery import PyQuery as pq
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.tests.factories import GeneratedCertificateFactory
+from course_modes.models import CourseMode
+from course_modes.tests.factories import CourseModeFactory
 from student.cookies import get_user_info_cookie_data
 from student.helpers import DISABLE_UNENROLL_CERT_STATES
 from student.models import CourseEnrollment, LogoutViewConfiguration
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
+from student.views import DashboardCourseData, complete_course_mode_info, is_course_blocked
 
 PASSWORD = 'test'
 
@@ -45,7 +51,7 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
         self.cert_status = None
         self.client.login(username=self.user.username, password=PASSWORD)
 
-    def mock_cert(self, _user, _course_overview, _course_mode):
+    def mock_cert(self, _user, _course_overview, _course_mode, _dashboard_data=None):
         """ Return a preset certificate status. """
         if self.cert_status is not None:
             return {
@@ -221,3 +227,76 @@ class StudentDashboardTests(TestCase):
         self.client.get(self.path)
         actual = self.client.cookies[settings.EDXMKTG_USER_INFO_COOKIE_NAME].value
         self.assertEqual(actual, expected)
+
+
+@ddt.ddt
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class DashboardCourseDataTests(TestCase):
+    """
+    Tests for loading the per-course data shown on the student dashboard.
+    """
+    def setUp(self):
+        super(DashboardCourseDataTests, self).setUp()
+        self.user = UserFactory()
+
+    def _enroll(self, course_count):
+        """
+        Enrolls the user in `course_count` new courses, half of which they have
+        a certificate in, and returns the enrollments.
+        """
+        enrollments = []
+        for index in range(course_count):
+            course_key = CourseLocator('DashboardX', 'Course{}'.format(index), 'Run')
+            CourseModeFactory(course_id=course_key, mode_slug=CourseMode.AUDIT)
+            CourseModeFactory(course_id=course_key, mode_slug=CourseMode.HONOR)
+            if index % 2 == 0:
+                GeneratedCertificateFactory(
+                    user=self.user,
+                    course_id=course_key,
+                    mode=CourseMode.AUDIT,
+                    status=CertificateStatuses.downloadable,
+                )
+            enrollments.append(CourseEnrollmentFactory(user=self.user, course_id=course_key, mode=CourseMode.AUDIT))
+        return enrollments
+
+    @ddt.data(1, 5, 20)
+    def test_num_queries(self, course_count):
+        enrollments = self._enroll(course_count)
+
+        # One query each for the course modes, certificates, persisted grades
+        # and redeemed registration codes.
+        with self.assertNumQueries(4):
+            dashboard_data = DashboardCourseData(self.user, enrollments)
+
+        with self.assertNumQueries(0):
+            for enrollment in enrollments:
+                course_id = enrollment.course_id
+                course_modes = dashboard_data.selectable_course_modes[course_id]
+                dashboard_data.certificate_status(course_id)
+                complete_course_mode_info(course_id, enrollment, modes=dashboard_data.course_modes_by_course[course_id])
+                enrollment.refundable(
+                    user_already_has_certs_for=dashboard_data.course_ids_with_certs,
+                    modes=course_modes,
+                )
+                enrollment.is_paid_course(modes=course_modes)
+                is_course_blocked(None, dashboard_data.redeemed_registration_codes[course_id], course_id)
+
+    def test_matches_per_course_lookups(self):
+        enrollments = self._enroll(4)
+        dashboard_data = DashboardCourseData(self.user, enrollments)
+
+        for enrollment in enrollments:
+            course_id = enrollment.course_id
+            course_modes = dashboard_data.selectable_course_modes[course_id]
+            self.assertEqual(
+                dashboard_data.certificate_status(course_id),
+                certificate_status_for_student(self.user, course_id)
+            )
+            self.assertEqual(
+                enrollment.refundable(
+                    user_already_has_certs_for=dashboard_data.course_ids_with_certs,
+                    modes=course_modes,
+                ),
+                enrollment.refundable()
+            )
+            self.assertEqual(enrollment.is_paid_course(modes=course_modes), enrollment.is_paid_course())
@@ -62,12 +62,14 @@ from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=im
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
 from bulk_email.models import Optout, BulkEmailFlag  # pylint: disable=import-error
 from certificates.models import (  # pylint: disable=import-error
-    CertificateStatuses, GeneratedCertificate, certificate_status_for_student
+    CertificateStatuses, GeneratedCertificate, certificate_status, certificate_status_for_student
 )
 from certificates.api import (  # pylint: disable=import-error
     get_certificate_url,
     has_html_certificates_enabled,
 )
+from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.new.course_grade import CourseGradeFactory
 
 from xmodule.modulestore.django import modulestore
@@ -236,7 +238,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, dashboard_data=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -245,6 +247,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        dashboard_data (DashboardCourseData): If provided, the certificate and
+            grade are read from it instead of the database.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -259,12 +263,80 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if dashboard_data is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    else:
+        cert_status = dashboard_data.certificate_status(course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode, dashboard_data)
+
+
+class DashboardCourseData(object):
+    """
+    The per-course data the student dashboard shows for a user's enrollments.
+
+    All of it is loaded in a fixed number of queries, however many courses the
+    user is enrolled in.
+    """
+    def __init__(self, user, course_enrollments):
+        course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+        __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(course_ids)
+        self.course_modes_by_course = {
+            course_id: {
+                mode.slug: mode
+                for mode in modes
+            }
+            for course_id, modes in unexpired_course_modes.iteritems()
+        }
+        # The modes CourseMode.modes_for_course would return for each course.
+        self.selectable_course_modes = {
+            course_id: [mode for mode in modes if mode.slug not in CourseMode.CREDIT_MODES] or [CourseMode.DEFAULT_MODE]
+            for course_id, modes in unexpired_course_modes.iteritems()
+        }
+
+        self.certificates = {
+            certificate.course_id: certificate
+            for certificate in GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+                user=user, course_id__in=course_ids
+            )
+        }
+
+        self.persisted_grades = {
+            grade.course_id: grade
+            for grade in PersistentCourseGrade.objects.filter(user_id=user.id, course_id__in=course_ids)
+        }
+
+        self.redeemed_registration_codes = defaultdict(list)
+        registration_codes = CourseRegistrationCode.objects.filter(
+            course_id__in=course_ids,
+            registrationcoderedemption__redeemed_by=user
+        ).select_related('invoice_item__invoice')
+        for registration_code in registration_codes:
+            self.redeemed_registration_codes[registration_code.course_id].append(registration_code)
+
+    @property
+    def course_ids_with_certs(self):
+        """
+        The ids of the enrolled courses the user has a certificate for.
+        """
+        return frozenset(self.certificates)
+
+    def certificate_status(self, course_id):
+        """
+        Returns the user's certificate status in the course, as
+        certificate_status_for_student does.
+        """
+        return certificate_status(self.certificates.get(course_id), self.selectable_course_modes[course_id])
+
+    def persisted_grade_percent(self, course_id):
+        """
+        Returns the percent of the user's persisted grade in the course, or
+        None if there isn't one or persistent grades are not enabled.
+        """
+        grade = self.persisted_grades.get(course_id)
+        if grade is None or not PersistentGradesEnabledFlag.feature_enabled(course_id):
+            return None
+        return grade.percent_grade
 
 
 def reverification_info(statuses):
@@ -329,7 +401,7 @@ def get_course_enrollments(user, orgs_to_include, orgs_to_exclude):
             yield enrollment
 
 
-def _cert_info(user, course_overview, cert_status, course_mode):  # pylint: disable=unused-argument
+def _cert_info(user, course_overview, cert_status, course_mode, dashboard_data=None):  # pylint: disable=unused-argument
     """
     Implements the logic for cert_info -- split out for testing.
 
@@ -337,6 +409,8 @@ def _cert_info(user, course_overview, cert_status, course_mode):  # pylint: disa
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        dashboard_data (DashboardCourseData): If provided, the persisted grade
+            is read from it instead of the database.
     """
     # simplify the status for the template using this lookup table
     template_state = {
@@ -424,9 +498,13 @@ def _cert_info(user, course_overview, cert_status, course_mode):  # pylint: disa
                 )
 
     if status in {'generating', 'ready', 'notpassing', 'restricted', 'auditing', 'unverified'}:
-        persisted_grade = CourseGradeFactory().get_persisted(user, course_overview)
-        if persisted_grade is not None:
-            status_dict['grade'] = unicode(persisted_grade.percent)
+        if dashboard_data is None:
+            persisted_grade = CourseGradeFactory().get_persisted(user, course_overview)
+            persisted_percent = persisted_grade.percent if persisted_grade is not None else None
+        else:
+            persisted_percent = dashboard_data.persisted_grade_percent(course_overview.id)
+        if persisted_percent is not None:
+            status_dict['grade'] = unicode(persisted_percent)
         elif 'grade' in cert_status:
             status_dict['grade'] = cert_status['grade']
         else:
@@ -659,16 +737,10 @@ def dashboard(request):
     # sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
-    # Retrieve the course modes for each course
-    enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
-    course_modes_by_course = {
-        course_id: {
-            mode.slug: mode
-            for mode in modes
-        }
-        for course_id, modes in unexpired_course_modes.iteritems()
-    }
+    # Load the course modes, certificates, grades and registration codes for
+    # all the enrollments at once.
+    dashboard_data = DashboardCourseData(user, course_enrollments)
+    course_modes_by_course = dashboard_data.course_modes_by_course
 
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
@@ -734,7 +806,7 @@ def dashboard(request):
     # there is no verification messaging to display.
     verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode, dashboard_data)
         for enrollment in course_enrollments
     }
 
@@ -753,11 +825,11 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    user_already_has_certs_for = GeneratedCertificate.course_ids_with_certs_for_user(request.user)
     show_refund_option_for = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if enrollment.refundable(
-            user_already_has_certs_for=user_already_has_certs_for
+            user_already_has_certs_for=dashboard_data.course_ids_with_certs,
+            modes=dashboard_data.selectable_course_modes[enrollment.course_id],
         )
     )
 
@@ -765,17 +837,14 @@ def dashboard(request):
         enrollment.course_id for enrollment in course_enrollments
         if is_course_blocked(
             request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
+            dashboard_data.redeemed_registration_codes[enrollment.course_id],
             enrollment.course_id
         )
     )
 
     enrolled_courses_either_paid = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
+        if enrollment.is_paid_course(modes=dashboard_data.selectable_course_modes[enrollment.course_id])
     )
 
     # If there are *any* denied reverifications that have not been toggled off,
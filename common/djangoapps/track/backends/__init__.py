@@ -25,3 +25,14 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_batch(self, events):
+        """
+        Send a list of events to tracker.
+
+        Backends that can store several events at once should override this,
+        and let errors propagate, so that callers such as BufferedBackend can
+        count the events that were lost.
+        """
+        for event in events:
+            self.send(event)
@@ -0,0 +1,215 @@
+"""
+Event tracker backend that buffers events and sends them to other backends
+in batches, from a background thread.
+
+The backends it wraps are configured like TRACKING_BACKENDS::
+
+  TRACKING_BACKENDS = {
+      'buffered': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backends': {
+                  'mongo': {
+                      'ENGINE': 'track.backends.mongodb.MongoBackend',
+                      'OPTIONS': {...}
+                  }
+              },
+              'max_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1.0,
+              'overflow': 'drop_oldest',
+          }
+      }
+  }
+
+Events are sent when a batch is full or `flush_interval` seconds after the
+previous batch, and the remaining ones when the process exits.  Events that
+arrive while the buffer holds `max_size` events are handled according to
+`overflow`:
+
+  - 'drop_oldest': the oldest buffered event is dropped.
+  - 'drop_newest': the new event is dropped.
+  - 'block': the request waits up to `block_timeout` seconds for the
+    buffer to drain, then drops the new event.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+class BufferedBackend(BaseBackend):
+    """Event tracker backend that sends events to other backends in batches"""
+
+    def __init__(self, backends=None, max_size=10000, batch_size=100, flush_interval=1.0,
+                 overflow='drop_oldest', block_timeout=0.1, **kwargs):
+        """
+        Configure the buffer and the backends it sends events to.
+
+        :Parameters:
+
+          - `backends`: the backends to send events to, configured like
+            TRACKING_BACKENDS
+          - `max_size`: how many events the buffer holds
+          - `batch_size`: how many events are sent to the backends at once
+          - `flush_interval`: how many seconds events wait for a batch to
+            fill up before they are sent
+          - `overflow`: what to do with events when the buffer is full
+          - `block_timeout`: how many seconds the 'block' overflow policy
+            waits for room in the buffer
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy {}'.format(overflow))
+
+        # Imported here because track.tracker instantiates this backend
+        # while it is being imported.
+        from track.tracker import _instantiate_backend_from_name  # pylint: disable=protected-access
+
+        self.backends = {
+            name: _instantiate_backend_from_name(values['ENGINE'], values.get('OPTIONS', {}))
+            for name, values in (backends or {}).iteritems()
+            if values
+        }
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self.stats = {'enqueued': 0, 'sent': 0, 'dropped': 0, 'failed': 0}
+        self._reset()
+        atexit.register(self.close)
+
+    def _reset(self):
+        """
+        Start with an empty buffer and no worker thread in this process.
+
+        A forked process gets a copy of its parent's buffer, whose events the
+        parent sends, and of its locks, which may be held by threads that
+        don't exist in the child.
+        """
+        self._pid = os.getpid()
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._worker = None
+        self._closing = False
+
+    def _record(self, stat, count=1):
+        """Count events that were sent, dropped or failed to be sent."""
+        self.stats[stat] += count
+        dog_stats_api.increment('track.buffered.{}'.format(stat), count)
+
+    def _ensure_worker(self):
+        """Start the worker thread if it isn't running. Must hold the condition."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='track.buffered')
+            self._worker.daemon = True
+            self._worker.start()
+
+    def send(self, event):
+        """Add the event to the buffer."""
+        if self._pid != os.getpid():
+            self._reset()
+
+        with self._condition:
+            closing = self._closing
+        if closing:
+            # The process is exiting, so there is no worker to send it.
+            self._send_batch([event])
+            return
+
+        with self._condition:
+            if len(self._buffer) >= self.max_size:
+                if self.overflow == 'block':
+                    self._condition.notify_all()
+                    self._condition.wait(self.block_timeout)
+                if self.overflow == 'drop_oldest':
+                    self._buffer.popleft()
+                    self._record('dropped')
+                elif len(self._buffer) >= self.max_size:
+                    self._record('dropped')
+                    return
+
+            self._buffer.append(event)
+            self.stats['enqueued'] += 1
+            self._ensure_worker()
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _take_batch(self):
+        """Remove and return up to batch_size events from the buffer. Must hold the condition."""
+        batch = []
+        while self._buffer and len(batch) < self.batch_size:
+            batch.append(self._buffer.popleft())
+        return batch
+
+    def _run(self):
+        """Send batches of events from the buffer until the backend is closed."""
+        while True:
+            with self._condition:
+                if len(self._buffer) < self.batch_size and not self._closing:
+                    self._condition.wait(self.flush_interval)
+                batch = self._take_batch()
+                # Wake up requests waiting for room in the buffer.
+                self._condition.notify_all()
+                if not batch and self._closing:
+                    return
+            if batch:
+                self._send_batch(batch)
+
+    def _send_batch(self, batch):
+        """Send a batch of events to every backend."""
+        for name, backend in self.backends.iteritems():
+            try:
+                with dog_stats_api.timer('track.buffered.backend.{0}'.format(name)):
+                    backend.send_batch(batch)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Error sending a batch of %d events to event tracker backend %s', len(batch), name)
+                self._record('failed', len(batch))
+            else:
+                self._record('sent', len(batch))
+
+    def flush(self):
+        """Send all the buffered events now, from the calling thread."""
+        while True:
+            with self._condition:
+                batch = self._take_batch()
+                self._condition.notify_all()
+            if not batch:
+                return
+            self._send_batch(batch)
+
+    def close(self, timeout=5.0):
+        """
+        Stop the worker thread and send the remaining events.
+
+        This runs when the process exits, so that no buffered events are lost
+        when a worker is shut down.
+        """
+        if self._pid != os.getpid():
+            return
+
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        self.flush()
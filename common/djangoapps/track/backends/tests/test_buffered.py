@@ -0,0 +1,138 @@
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+BUFFERED_BACKENDS = {
+    'first': {
+        'ENGINE': 'track.backends.tests.test_buffered.BatchRecordingBackend',
+    },
+    'second': {
+        'ENGINE': 'track.backends.tests.test_buffered.BatchRecordingBackend',
+    },
+    'disabled': None,
+}
+
+
+class BatchRecordingBackend(BaseBackend):
+    """Records the batches of events it is sent."""
+    def __init__(self, **options):
+        super(BatchRecordingBackend, self).__init__(**options)
+        self.batches = []
+        self.received = threading.Event()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.batches.append(list(events))
+        self.received.set()
+
+
+class FailingBackend(BaseBackend):
+    """Fails to send any event."""
+    def send(self, event):
+        raise ValueError('Backend failure')
+
+
+class TestBufferedBackend(TestCase):
+    def _backend(self, **options):
+        backend = BufferedBackend(backends=BUFFERED_BACKENDS, **options)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_backends_instantiated(self):
+        backend = self._backend()
+        self.assertEqual(sorted(backend.backends), ['first', 'second'])
+        self.assertIsInstance(backend.backends['first'], BatchRecordingBackend)
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            BufferedBackend(backends=BUFFERED_BACKENDS, overflow='ignore')
+
+    @patch.object(BufferedBackend, '_ensure_worker')
+    def test_flush_sends_batches(self, _mock_ensure_worker):
+        backend = self._backend(batch_size=2, flush_interval=60)
+        events = [{'test': index} for index in range(5)]
+        for event in events:
+            backend.send(event)
+        backend.flush()
+
+        for name in ('first', 'second'):
+            batches = backend.backends[name].batches
+            self.assertTrue(all(len(batch) <= 2 for batch in batches))
+            self.assertEqual(sum(batches, []), events)
+        self.assertEqual(backend.stats['enqueued'], 5)
+        self.assertEqual(backend.stats['sent'], 10)
+
+    def test_worker_sends_full_batch(self):
+        backend = self._backend(batch_size=3, flush_interval=60)
+        events = [{'test': index} for index in range(3)]
+        for event in events:
+            backend.send(event)
+
+        recording_backend = backend.backends['first']
+        self.assertTrue(recording_backend.received.wait(5))
+        self.assertEqual(recording_backend.batches, [events])
+
+    def test_worker_sends_after_flush_interval(self):
+        backend = self._backend(batch_size=100, flush_interval=0.01)
+        backend.send({'test': 1})
+
+        recording_backend = backend.backends['first']
+        self.assertTrue(recording_backend.received.wait(5))
+        self.assertEqual(recording_backend.batches, [[{'test': 1}]])
+
+    def test_drop_oldest(self):
+        backend = self._backend(max_size=2, batch_size=100, flush_interval=60)
+        for index in range(4):
+            backend.send({'test': index})
+        backend.flush()
+
+        self.assertEqual(sum(backend.backends['first'].batches, []), [{'test': 2}, {'test': 3}])
+        self.assertEqual(backend.stats['dropped'], 2)
+
+    def test_drop_newest(self):
+        backend = self._backend(max_size=2, batch_size=100, flush_interval=60, overflow='drop_newest')
+        for index in range(4):
+            backend.send({'test': index})
+        backend.flush()
+
+        self.assertEqual(sum(backend.backends['first'].batches, []), [{'test': 0}, {'test': 1}])
+        self.assertEqual(backend.stats['dropped'], 2)
+
+    @patch.object(BufferedBackend, '_ensure_worker')
+    def test_block_then_drop(self, _mock_ensure_worker):
+        backend = self._backend(max_size=2, batch_size=100, flush_interval=60, overflow='block', block_timeout=0)
+        for index in range(3):
+            backend.send({'test': index})
+        backend.flush()
+
+        self.assertEqual(sum(backend.backends['first'].batches, []), [{'test': 0}, {'test': 1}])
+        self.assertEqual(backend.stats['dropped'], 1)
+
+    def test_close_sends_remaining_events(self):
+        backend = self._backend(batch_size=100, flush_interval=60)
+        backend.send({'test': 1})
+        backend.close()
+
+        self.assertEqual(backend.backends['first'].batches, [[{'test': 1}]])
+
+        # Events sent while the process exits are sent right away.
+        backend.send({'test': 2})
+        self.assertEqual(backend.backends['first'].batches[-1], [{'test': 2}])
+
+    def test_failing_backend(self):
+        backend = self._backend(flush_interval=60)
+        backend.backends['failing'] = FailingBackend()
+        backend.send({'test': 1})
+        backend.flush()
+
+        self.assertEqual(backend.backends['first'].batches, [[{'test': 1}]])
+        self.assertEqual(backend.stats['failed'], 1)
@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 from mock import patch
+from pymongo.errors import PyMongoError
 
 from django.test import TestCase
 
@@ -37,3 +38,19 @@ class TestMongoBackend(TestCase):
 
         self.assertEqual(events[0], first_argument(calls[0]))
         self.assertEqual(events[1], first_argument(calls[1]))
+
+    def test_mongo_backend_batch(self):
+        events = [{'test': 1}, {'test': 2}]
+
+        self.backend.send_batch(events)
+
+        # The events are inserted in a single operation, and left unchanged.
+        self.backend.collection.insert_many.assert_called_once_with(events, ordered=False)
+        inserted_events = self.backend.collection.insert_many.call_args[0][0]
+        self.assertIsNot(inserted_events[0], events[0])
+
+    def test_mongo_backend_batch_error(self):
+        self.backend.collection.insert_many.side_effect = PyMongoError
+
+        with self.assertRaises(PyMongoError):
+            self.backend.send_batch([{'test': 1}])
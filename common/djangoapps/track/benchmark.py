@@ -0,0 +1,204 @@
+"""
+Benchmarks for the event processors in track.shim.
+
+Feeds streams of recorded events through the processors that the
+'tracking_logs' event tracking backend applies to every event
+(LegacyFieldMappingProcessor followed by PrefixedEventProcessor), and
+measures how long each processor takes per event, overall and by event name.
+
+Streams are files holding one event per line, as JSON, in the form the event
+tracker hands them to its backends (with `name`, `context`, `data` and
+`timestamp` fields).  Without any, a built in stream of typical LMS, mobile
+video and sequence navigation events is used.  No Django server or settings
+are needed.  Run it from common/djangoapps, for example::
+
+    python -m track.benchmark --iterations 1000 events.log --output track-benchmark.json
+
+The results are written as JSON so that runs against different versions of
+the platform can be compared.
+"""
+import argparse
+import copy
+import json
+import platform
+import sys
+from collections import defaultdict
+from datetime import datetime
+from timeit import default_timer
+
+from track.shim import LegacyFieldMappingProcessor, PrefixedEventProcessor
+
+_MOBILE_CONTEXT = {
+    u'course_id': u'course-v1:edX+DemoX+Demo_Course',
+    u'user_id': 10,
+    u'username': u'student',
+    u'ip': u'127.0.0.1',
+    u'agent': u'edX/org.edx.mobile (1.0.02; OS Version 8.4 (Build 12H143))',
+    u'open_in_browser_url': u'https://courses.example.com/courses/course-v1:edX+DemoX+Demo_Course/jump_to/video',
+    u'application': {u'name': u'edx.mobileapp.iOS', u'version': u'1.0.02'},
+    u'timestamp': u'2016-01-01T00:00:00.000000+00:00',
+}
+
+_BROWSER_CONTEXT = {
+    u'course_id': u'course-v1:edX+DemoX+Demo_Course',
+    u'user_id': 10,
+    u'username': u'student',
+    u'session': u'0123456789abcdef0123456789abcdef',
+    u'ip': u'127.0.0.1',
+    u'agent': u'Mozilla/5.0 (X11; Linux x86_64)',
+    u'host': u'courses.example.com',
+    u'referer': u'https://courses.example.com/courses/course-v1:edX+DemoX+Demo_Course/courseware/',
+    u'accept_language': u'en-US,en;q=0.8',
+    u'event_source': u'browser',
+    u'page': u'https://courses.example.com/courses/course-v1:edX+DemoX+Demo_Course/courseware/',
+    u'path': u'/event',
+    u'org_id': u'edX',
+}
+
+_SERVER_CONTEXT = dict(
+    _BROWSER_CONTEXT, event_source=u'server', path=u'/courses/course-v1:edX+DemoX+Demo_Course/xblock'
+)
+
+_VIDEO_DATA = {
+    u'module_id': u'block-v1:edX+DemoX+Demo_Course+type@video+block@0b9e39477cf34507a7a48f74be381fdd',
+    u'code': u'mobile',
+}
+
+# A stream in the proportions the LMS emits events in: mostly events that no
+# transformer handles, then video and sequence navigation events.
+SAMPLE_EVENTS = [
+    {u'name': u'problem_check', u'context': _SERVER_CONTEXT, u'data': {u'answers': {u'1_2_1': u'choice_1'}}},
+    {u'name': u'edx.course.enrollment.activated', u'context': _SERVER_CONTEXT, u'data': {u'mode': u'honor'}},
+    {u'name': u'page_close', u'context': _BROWSER_CONTEXT, u'data': {}},
+    {u'name': u'edx.grades.problem.submitted', u'context': _SERVER_CONTEXT, u'data': {u'weight': 1}},
+    {u'name': u'edx.video.loaded', u'context': _MOBILE_CONTEXT, u'data': _VIDEO_DATA},
+    {
+        u'name': u'edx.video.played', u'context': _MOBILE_CONTEXT,
+        u'data': dict(_VIDEO_DATA, current_time=132.134456),
+    },
+    {
+        u'name': u'edx.video.seeked', u'context': _MOBILE_CONTEXT,
+        u'data': dict(_VIDEO_DATA, seek_type=u'skip', requested_skip_interval=30, current_time=150.0),
+    },
+    {u'name': u'edx.video.bumper.loaded', u'context': _BROWSER_CONTEXT, u'data': {u'host_component_id': u'video'}},
+    {
+        u'name': u'edx.ui.lms.sequence.next_selected', u'context': _BROWSER_CONTEXT,
+        u'data': {u'current_tab': 2, u'tab_count': 5, u'id': u'block-v1:edX+DemoX+Demo_Course+type@sequential'},
+    },
+    {
+        u'name': u'edx.ui.lms.sequence.tab_selected', u'context': _BROWSER_CONTEXT,
+        u'data': {u'current_tab': 2, u'target_tab': 4, u'tab_count': 5, u'id': u'block-v1:edX+DemoX+Demo_Course'},
+    },
+]
+
+# The processors of the 'tracking_logs' backend in EVENT_TRACKING_BACKENDS.
+PROCESSORS = [
+    ('LegacyFieldMappingProcessor', LegacyFieldMappingProcessor()),
+    ('PrefixedEventProcessor', PrefixedEventProcessor()),
+]
+
+
+def load_events(path):
+    """
+    Returns the events recorded in the file at `path`, one JSON event per line.
+    """
+    with open(path) as events_file:
+        return [json.loads(line) for line in events_file if line.strip()]
+
+
+def _stats(durations):
+    """
+    Returns a dict of timing statistics, in microseconds per event, of the
+    given durations in seconds.
+    """
+    total = sum(durations)
+    return {
+        'events': len(durations),
+        'mean_us': total * 1000000.0 / len(durations),
+        'min_us': min(durations) * 1000000.0,
+        'max_us': max(durations) * 1000000.0,
+        'events_per_sec': len(durations) / total if total else None,
+    }
+
+
+def benchmark_stream(events, iterations):
+    """
+    Feeds `events` through the processors `iterations` times, returning a
+    dict of results.
+
+    Each processor is timed on each event.  As in eventtracking's
+    RoutingBackend, a processor that returns None leaves the event as it was
+    for the next one.
+    """
+    durations = defaultdict(list)
+    durations_by_name = defaultdict(list)
+    transformed = 0
+    for __ in range(iterations):
+        # The processors modify the events, so each pass gets fresh copies.
+        # Copying them isn't timed.
+        for event in copy.deepcopy(events):
+            name = event.get(u'name')
+            event_duration = 0
+            for processor_name, processor in PROCESSORS:
+                start = default_timer()
+                result = processor(event)
+                duration = default_timer() - start
+                durations[processor_name].append(duration)
+                event_duration += duration
+                if result is not None:
+                    event = result
+                    transformed += 1
+            durations['total'].append(event_duration)
+            durations_by_name[name].append(event_duration)
+
+    return {
+        'events': len(events),
+        'transformed_per_pass': float(transformed) / iterations,
+        'processors': {name: _stats(processor_durations) for name, processor_durations in durations.items()},
+        'by_name': {name: _stats(name_durations) for name, name_durations in durations_by_name.items()},
+    }
+
+
+def run_benchmarks(paths=None, iterations=100):
+    """
+    Benchmarks the event streams recorded in the files at `paths`, or the
+    sample stream if there are none.
+
+    Returns a JSON-serializable dict of the results.
+    """
+    if paths:
+        streams = [(path, load_events(path)) for path in paths]
+    else:
+        streams = [('sample', SAMPLE_EVENTS)]
+
+    return {
+        'metadata': {
+            'created': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': iterations,
+        },
+        'results': {name: benchmark_stream(events, iterations) for name, events in streams},
+    }
+
+
+def main(argv=None):
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=100, help='number of passes over each event stream')
+    parser.add_argument('--output', help='file to write the JSON results to (default: stdout)')
+    parser.add_argument('streams', nargs='*', help='files of recorded events, one JSON event per line')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.streams, args.iterations)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output)
+    else:
+        sys.stdout.write(output + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -102,9 +102,9 @@ class PrefixedEventProcessor(object):
         If the event is registered with the EventTransformerRegistry, transform
         it.  Otherwise do nothing to it, and continue processing.
         """
-        try:
-            event = EventTransformerRegistry.create_transformer(event)
-        except KeyError:
+        transformer_class = EventTransformerRegistry.get_transformer_class(event.get(u'name'))
+        if transformer_class is None:
             return
+        event = transformer_class(event)
         event.transform()
         return event
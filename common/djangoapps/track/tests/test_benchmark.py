@@ -0,0 +1,39 @@
+"""
+Tests for the event processor benchmarks.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from track.benchmark import SAMPLE_EVENTS, run_benchmarks
+
+
+class BenchmarkTest(unittest.TestCase):
+    """
+    Runs the benchmarks once, to make sure that the sample events still go
+    through the processors.
+    """
+    def test_sample_stream(self):
+        results = run_benchmarks(iterations=1)
+        result = results['results']['sample']
+        self.assertEqual(result['events'], len(SAMPLE_EVENTS))
+        self.assertEqual(result['processors']['total']['events'], len(SAMPLE_EVENTS))
+        # The video events with a legacy counterpart and the sequence
+        # navigation events are transformed.
+        self.assertEqual(result['transformed_per_pass'], 5)
+        self.assertIn(u'edx.video.played', result['by_name'])
+        # The results must be machine-readable.
+        json.dumps(results)
+
+    def test_recorded_stream(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'events.log')
+        with open(path, 'w') as events_file:
+            for event in SAMPLE_EVENTS[:3]:
+                events_file.write(json.dumps(event) + '\n')
+
+        results = run_benchmarks([path], iterations=2)
+        self.assertEqual(results['results'][path]['processors']['total']['events'], 6)
@@ -259,6 +259,36 @@ class EventTransformerRegistryTestCase(EventTrackingTestCase):
         with self.assertRaises(KeyError):
             self.registry.create_transformer(event)
 
+    @ddt.data(
+        ('edx.ui.lms.sequence.next_selected', transformers.NextSelectedEventTransformer),
+        ('edx.video.played', transformers.VideoEventTransformer),
+        ('edx.video.foo.bar', None),
+        ('edx.ui.lms.sequence.next_selected.what', None),
+        ('unregistered_event', None),
+        (None, None),
+    )
+    @ddt.unpack
+    def test_get_transformer_class(self, event_name, expected_transformer):
+        # The second lookup is answered from the names already resolved.
+        for __ in range(2):
+            self.assertEqual(self.registry.get_transformer_class(event_name), expected_transformer)
+
+    def test_register_after_resolving(self):
+        event_name = u'edx.ui.lms.new_event'
+        self.assertIsNone(self.registry.get_transformer_class(event_name))
+
+        self.addCleanup(self.registry._transformers_by_name.clear)  # pylint: disable=protected-access
+        self.addCleanup(self.registry.mapping.__delitem__, u'edx.ui.lms.')
+
+        @self.registry.register
+        class NewEventTransformer(transformers.EventTransformer):  # pylint: disable=unused-variable
+            """
+            Transformer registered after events of its name were resolved.
+            """
+            match_key = u'edx.ui.lms.'
+
+        self.assertIs(self.registry.get_transformer_class(event_name), NewEventTransformer)
+
 
 @ddt.ddt
 class PrefixedEventProcessorTestCase(EventTrackingTestCase):
@@ -319,3 +349,12 @@ class PrefixedEventProcessorTestCase(EventTrackingTestCase):
         self.assertEqual(result[u'event_type'], u'seq_goto')
         self.assertEqual(result[u'event'][u'old'], 2)
         self.assertEqual(result[u'event'][u'new'], 5)
+
+    def test_unhandled_event_unchanged(self):
+        event = {
+            u'name': u'edx.video.bumper.loaded',
+            u'event': u'{"host_component_id": "video"}',
+        }
+
+        process_event_shim = PrefixedEventProcessor()
+        self.assertIsNone(process_event_shim(event))
@@ -13,6 +13,9 @@ from opaque_keys.edx.keys import UsageKey
 
 log = logging.getLogger(__name__)
 
+# The most event names EventTransformerRegistry remembers the transformer of.
+MAX_RESOLVED_EVENT_NAMES = 10000
+
 
 class DottedPathMapping(object):
     """
@@ -34,6 +37,9 @@ class DottedPathMapping(object):
     def __init__(self, registry=None):
         self._match_registry = {}
         self._prefix_registry = {}
+        # The prefixes, longest first, so that the first match found is the
+        # most specific one.
+        self._sorted_prefixes = []
         self.update(registry or {})
 
     def __contains__(self, key):
@@ -47,8 +53,7 @@ class DottedPathMapping(object):
         if key in self._match_registry:
             return self._match_registry[key]
         if isinstance(key, basestring):
-            # Reverse-sort the keys to find the longest matching prefix.
-            for prefix in sorted(self._prefix_registry, reverse=True):
+            for prefix in self._sorted_prefixes:
                 if key.startswith(prefix):
                     return self._prefix_registry[prefix]
         raise KeyError('Key {} not found in {}'.format(key, type(self)))
@@ -56,12 +61,14 @@ class DottedPathMapping(object):
     def __setitem__(self, key, value):
         if key.endswith('.'):
             self._prefix_registry[key] = value
+            self._sorted_prefixes = sorted(self._prefix_registry, reverse=True)
         else:
             self._match_registry[key] = value
 
     def __delitem__(self, key):
         if key.endswith('.'):
             del self._prefix_registry[key]
+            self._sorted_prefixes = sorted(self._prefix_registry, reverse=True)
         else:
             del self._match_registry[key]
 
@@ -71,7 +78,7 @@ class DottedPathMapping(object):
         if it is specified.
         """
         try:
-            self[key]
+            return self[key]
         except KeyError:
             return default
 
@@ -100,6 +107,11 @@ class EventTransformerRegistry(object):
     """
     mapping = DottedPathMapping()
 
+    # The transformer that processes events of each name seen so far, or None
+    # if no transformer does, so that the mapping is only searched once per
+    # event name.
+    _transformers_by_name = {}
+
     @classmethod
     def register(cls, transformer):
         """
@@ -107,6 +119,33 @@ class EventTransformerRegistry(object):
         class attribute defined.
         """
         cls.mapping[transformer.match_key] = transformer
+        cls._transformers_by_name.clear()
+        return transformer
+
+    @classmethod
+    def get_transformer_class(cls, name):
+        """
+        Return the EventTransformer that transforms events called `name`, or
+        None if those events are left as they are.
+
+        This is resolved once per event name.  Names that a registered
+        transformer matches but does not handle (see
+        `EventTransformer.handles_event_name()`) resolve to None, so that
+        those events are not copied or parsed for nothing.
+        """
+        try:
+            return cls._transformers_by_name[name]
+        except KeyError:
+            pass
+
+        transformer = cls.mapping.get(name)
+        if transformer is not None and not transformer.handles_event_name(name):
+            transformer = None
+        if len(cls._transformers_by_name) >= MAX_RESOLVED_EVENT_NAMES:
+            # Event names come from clients, so don't let them grow the cache
+            # without bound.
+            cls._transformers_by_name.clear()
+        cls._transformers_by_name[name] = transformer
         return transformer
 
     @classmethod
@@ -197,6 +236,14 @@ class EventTransformer(dict):
         """
         raise NotImplementedError
 
+    @classmethod
+    def handles_event_name(cls, name):  # pylint: disable=unused-argument
+        """
+        Override this to return False for the names of events that match
+        `match_key` but are never modified by `transform()`.
+        """
+        return True
+
     # Convenience properties
 
     @property
@@ -380,6 +427,13 @@ class VideoEventTransformer(EventTransformer):
 
     is_legacy_event = True
 
+    @classmethod
+    def handles_event_name(cls, name):
+        """
+        Only the events with a legacy counterpart are transformed.
+        """
+        return name in cls.name_to_event_type_map
+
     @property
     def legacy_event_type(self):
         """
@@ -392,7 +446,7 @@ class VideoEventTransformer(EventTransformer):
         Transform the event with necessary modifications if it is one of the
         expected types of events.
         """
-        if self.name in self.name_to_event_type_map:
+        if self.handles_event_name(self.name):
             super(VideoEventTransformer, self).transform()
 
     def process_event(self):
@@ -346,6 +346,28 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
     if user_id is None:
         return milestones_api.get_course_content_milestones(course_id, content_id, relationship)
 
+    milestones = _get_user_course_content_milestones(course_id, relationship, user_id)
+    return [m for m in milestones if m['content_id'] == unicode(content_id)]
+
+
+def get_course_content_ids_with_milestones(course_id, relationship, user_id):
+    """
+    Client API operation adapter/wrapper
+    Returns the set of ids of the course content that has `relationship`
+    milestones for the user, using the same request cache as
+    get_course_content_milestones
+    """
+    if not settings.FEATURES.get('MILESTONES_APP'):
+        return set()
+
+    return {m['content_id'] for m in _get_user_course_content_milestones(course_id, relationship, user_id)}
+
+
+def _get_user_course_content_milestones(course_id, relationship, user_id):
+    """
+    Returns all the course content milestones with `relationship` for the
+    user, cached for the rest of the request.
+    """
     request_cache_dict = request_cache.get_cache(REQUEST_CACHE_NAME)
     if user_id not in request_cache_dict:
         request_cache_dict[user_id] = {}
@@ -357,7 +379,7 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
             user={"id": user_id}
         )
 
-    return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == unicode(content_id)]
+    return request_cache_dict[user_id][relationship]
 
 
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
@@ -0,0 +1,259 @@
+"""
+Grading benchmarks for capa response types.
+
+Loads the representative problems in common/test/data/capa and measures, for
+each of them, how long it takes to parse the problem (construct a
+LoncapaProblem), render it (`get_html`), grade a set of answers
+(`grade_answers`) and rescore the stored answers (`rescore_existing_answers`).
+The time each LoncapaResponse spends in `evaluate_answers` is also reported
+per response type.
+
+No Django server or settings are needed.  Run it from the repository root
+with the capa library on the path, for example::
+
+    python -m capa.benchmark --iterations 100 --output capa-benchmark.json
+
+The results are written as JSON so that runs against different versions of
+the platform or its dependencies can be compared.
+"""
+import argparse
+import gettext
+import json
+import os
+import platform
+import sys
+from collections import defaultdict
+from datetime import datetime
+from timeit import default_timer
+
+import fs.osfs
+from mako.lookup import TemplateLookup
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+
+CAPA_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.normpath(os.path.join(CAPA_DIR, '..', '..', '..', 'test', 'data', 'capa'))
+
+# The answers submitted to each benchmark problem, keyed by input id.  All of
+# them are correct, so that a benchmark run also catches grading regressions.
+SAMPLE_ANSWERS = {
+    'choiceresponse.xml': {
+        '1_2_1': ['choice_0', 'choice_2', 'choice_4'],
+        '1_3_1': ['choice_0', 'choice_2'],
+    },
+    'customresponse.xml': {
+        '1_2_1': '7.5',
+        '1_3_1': '4',
+        '1_3_2': '6',
+    },
+    'formularesponse.xml': {
+        '1_2_1': 'x^n+3*x',
+        '1_3_1': '0.5*m*v^2 + 9.81*m*h',
+    },
+    'imageresponse.xml': {
+        '1_2_1': '[50,50]',
+        '1_3_1': '[80,40]',
+    },
+    'multiplechoiceresponse.xml': {
+        '1_2_1': 'choice_1',
+        '1_3_1': 'choice_1',
+    },
+    'numericalresponse.xml': {
+        '1_2_1': '24.525',
+        '1_3_1': '6',
+        '1_4_1': '-1.414',
+    },
+    'optionresponse.xml': {
+        '1_2_1': 'True',
+        '1_3_1': 'Iron',
+    },
+    'stringresponse.xml': {
+        '1_2_1': 'paris',
+        '1_3_1': 'Colours',
+        '1_4_1': 'H2O',
+    },
+    'symbolicresponse.xml': {
+        '1_2_1': 'm*g*h',
+        '1_3_1': '(n*R*T)/V',
+        '1_4_1': '[[cos(theta),i*sin(theta)],[i*sin(theta),cos(theta)]]',
+    },
+}
+
+
+class _BenchmarkRuntime(object):
+    """The parts of an XModule runtime that response types use."""
+    def track_function(self, event_type, event):
+        """Discards events published while grading."""
+        pass
+
+
+class _BenchmarkLocation(object):
+    """The parts of a usage key that response types use."""
+    def to_deprecated_string(self):
+        """Returns a fixed location for the benchmark problem."""
+        return u'i4x://edX/benchmark/problem/capa'
+
+
+class _BenchmarkModule(object):
+    """Stands in for the CapaModule that owns a LoncapaProblem."""
+    def __init__(self):
+        self.location = _BenchmarkLocation()
+        self.runtime = _BenchmarkRuntime()
+
+
+def benchmark_capa_system(data_dir, symbolic_check_timeout=None):
+    """
+    Returns a LoncapaSystem that renders with the real capa templates and
+    runs problem scripts in-process.
+
+    If `symbolic_check_timeout` is set, symbolic math answers are checked in a
+    separate process, as they are when SYMBOLIC_CHECK_TIMEOUT is configured.
+    """
+    lookup = TemplateLookup(directories=[os.path.join(CAPA_DIR, 'templates')], default_filters=['decode.utf8'])
+
+    def render_template(template_name, context):
+        """Renders a capa input type template."""
+        return lookup.get_template(template_name).render_unicode(**context)
+
+    return LoncapaSystem(
+        ajax_url='/benchmark-ajax-url',
+        anonymous_student_id='benchmark-student',
+        cache=None,
+        can_execute_unsafe_code=lambda: True,
+        get_python_lib_zip=lambda: None,
+        DEBUG=False,
+        filestore=fs.osfs.OSFS(data_dir),
+        i18n=gettext.NullTranslations(),
+        node_path=os.environ.get('NODE_PATH', '/usr/local/lib/node_modules'),
+        render_template=render_template,
+        seed=1,
+        STATIC_URL='/static/',
+        xqueue=None,
+        matlab_api_key=None,
+        symbolic_check_timeout=symbolic_check_timeout,
+    )
+
+
+def _timed(func, iterations):
+    """
+    Calls `func` `iterations` times and returns a dict of timing statistics,
+    in milliseconds per call, along with the last value `func` returned.
+    """
+    durations = []
+    result = None
+    for __ in range(iterations):
+        start = default_timer()
+        result = func()
+        durations.append(default_timer() - start)
+    total = sum(durations)
+    stats = {
+        'iterations': iterations,
+        'mean_ms': total * 1000.0 / iterations,
+        'min_ms': min(durations) * 1000.0,
+        'max_ms': max(durations) * 1000.0,
+        'ops_per_sec': iterations / total if total else None,
+    }
+    return stats, result
+
+
+def benchmark_problem(problem_text, answers, capa_system, iterations):
+    """
+    Benchmarks a single problem, returning a dict of results.
+
+    `answers` is the dict of answers submitted to the problem, keyed by input id.
+    """
+    capa_module = _BenchmarkModule()
+
+    def parse():
+        """Builds the problem from its XML."""
+        return LoncapaProblem(problem_text, id='1', capa_system=capa_system, capa_module=capa_module, seed=1)
+
+    parse_stats, problem = _timed(parse, iterations)
+    render_stats, __ = _timed(problem.get_html, iterations)
+    grade_stats, correct_map = _timed(lambda: problem.grade_answers(dict(answers)), iterations)
+    rescore_stats, __ = _timed(problem.rescore_existing_answers, iterations)
+
+    # Time each responder on its own, so that problems mixing response types
+    # can be broken down by type.
+    evaluate_stats = defaultdict(list)
+    for responder in problem.responders.values():
+        stats, __ = _timed(
+            lambda responder=responder: responder.evaluate_answers(problem.student_answers, correct_map),
+            iterations,
+        )
+        evaluate_stats[type(responder).__name__].append(stats)
+
+    return {
+        'response_types': sorted(evaluate_stats),
+        'all_correct': all(correct_map.is_correct(answer_id) for answer_id in answers),
+        'parse': parse_stats,
+        'render': render_stats,
+        'grade_answers': grade_stats,
+        'rescore_existing_answers': rescore_stats,
+        'evaluate_answers': {
+            name: {
+                'responses': len(stats_list),
+                'mean_ms': sum(stats['mean_ms'] for stats in stats_list) / len(stats_list),
+                'min_ms': min(stats['min_ms'] for stats in stats_list),
+            }
+            for name, stats_list in evaluate_stats.items()
+        },
+    }
+
+
+def run_benchmarks(data_dir=DEFAULT_DATA_DIR, iterations=50, problems=None, symbolic_check_timeout=None):
+    """
+    Benchmarks the problems in `data_dir` that have sample answers.
+
+    `problems` optionally restricts the run to the given problem file names.
+    Returns a JSON-serializable dict of the results.
+    """
+    capa_system = benchmark_capa_system(data_dir, symbolic_check_timeout)
+    results = {}
+    for filename in sorted(problems or SAMPLE_ANSWERS):
+        with open(os.path.join(data_dir, filename)) as problem_file:
+            problem_text = problem_file.read()
+        results[filename] = benchmark_problem(problem_text, SAMPLE_ANSWERS[filename], capa_system, iterations)
+
+    return {
+        'metadata': {
+            'created': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': iterations,
+            'symbolic_check_timeout': symbolic_check_timeout,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=50, help='number of timed calls per operation')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='directory holding the problem XML files')
+    parser.add_argument(
+        '--symbolic-check-timeout', type=float,
+        help='check symbolic math answers in a separate process, with this time limit in seconds'
+    )
+    parser.add_argument('--output', help='file to write the JSON results to (default: stdout)')
+    parser.add_argument('problems', nargs='*', help='problem files to benchmark (default: all)')
+    args = parser.parse_args(argv)
+    unknown = set(args.problems) - set(SAMPLE_ANSWERS)
+    if unknown:
+        parser.error('no sample answers for: {}'.format(', '.join(sorted(unknown))))
+
+    results = run_benchmarks(args.data_dir, args.iterations, args.problems, args.symbolic_check_timeout)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output)
+    else:
+        sys.stdout.write(output + '\n')
+
+    incorrect = [name for name, result in results['results'].items() if not result['all_correct']]
+    return 1 if incorrect else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
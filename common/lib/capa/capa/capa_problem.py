@@ -87,6 +87,8 @@ class LoncapaSystem(object):
     Attributes:
         i18n: an object implementing the `gettext.Translations` interface so
             that we can use `.ugettext` to localize strings.
+        symbolic_check_timeout: if set, symbolic math checks run in a separate
+            process and are abandoned after this many seconds.
 
     See :class:`ModuleSystem` for documentation of other attributes.
 
@@ -106,7 +108,8 @@ class LoncapaSystem(object):
         seed,      # Why do we do this if we have self.seed?
         STATIC_URL,                                     # pylint: disable=invalid-name
         xqueue,
-        matlab_api_key=None
+        matlab_api_key=None,
+        symbolic_check_timeout=None,
     ):
         self.ajax_url = ajax_url
         self.anonymous_student_id = anonymous_student_id
@@ -122,6 +125,7 @@ class LoncapaSystem(object):
         self.STATIC_URL = STATIC_URL                    # pylint: disable=invalid-name
         self.xqueue = xqueue
         self.matlab_api_key = matlab_api_key
+        self.symbolic_check_timeout = symbolic_check_timeout
 
 
 class LoncapaProblem(object):
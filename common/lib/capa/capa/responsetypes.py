@@ -44,7 +44,8 @@ from datetime import datetime
 from pytz import UTC
 from .util import (
     compare_with_tolerance, contextualize_text, convert_files_to_filenames,
-    is_list_of_files, find_with_default, default_tolerance, get_inner_html_from_xpath
+    is_list_of_files, find_with_default, default_tolerance, get_inner_html_from_xpath,
+    evaluate_constant_expression, get_answer_artifact
 )
 from lxml import etree
 from lxml.html.soupparser import fromstring as fromstring_bs     # uses Beautiful Soup!!! FIXME?
@@ -1559,7 +1560,7 @@ class NumericalResponse(LoncapaResponse):
             # `ValueError`. Then test if instead it is a math expression.
             # `complex` seems to only generate `ValueErrors`, only catch these.
             try:
-                correct_ans = evaluator({}, {}, answer)
+                correct_ans = evaluate_constant_expression(answer)
             except Exception:
                 log.debug("Content error--answer '%s' is not a valid number", answer)
                 _ = self.capa_system.i18n.ugettext
@@ -1569,6 +1570,53 @@ class NumericalResponse(LoncapaResponse):
 
         return correct_ans
 
+    def get_partial_credit_params(self):
+        """
+        Returns a tuple of (partial_range, partial_answers, expanded_tolerance)
+        for this response, derived from the problem definition.
+
+        `partial_range` is the multiple of the tolerance that is worth partial
+        credit, `partial_answers` a tuple of the evaluated alternative answers
+        that are worth partial credit (or False if there are none), and
+        `expanded_tolerance` the tolerance multiplied by `partial_range`.
+
+        They are cached by the settings they are derived from, so that grading
+        the same problem again doesn't evaluate them again.
+        """
+        tree = self.xml
+        has_partial_range = tree.xpath('responseparam[@partial_range]')
+        partial_range_setting = has_partial_range[0].get('partial_range', default='2') if has_partial_range else None
+        has_partial_answers = tree.xpath('responseparam[@partial_answers]')
+        partial_answers_setting = has_partial_answers[0].get('partial_answers') if has_partial_answers else None
+
+        def compute_partial_credit_params():
+            """
+            Evaluates the partial credit settings.
+            """
+            partial_range = 2 if partial_range_setting is None else float(partial_range_setting)
+
+            if partial_answers_setting is None:
+                partial_answers = False
+            else:
+                partial_answers = tuple(
+                    self.get_staff_ans(word.strip()) for word in partial_answers_setting.split(',')
+                )
+
+            if self.range_tolerance:
+                expanded_tolerance = None
+            elif str(self.tolerance).endswith('%'):
+                expanded_tolerance = str(partial_range * float(str(self.tolerance)[:-1])) + '%'
+            else:
+                expanded_tolerance = partial_range * float(self.tolerance)
+
+            return partial_range, partial_answers, expanded_tolerance
+
+        key = (
+            'numerical_partial_credit', partial_range_setting, partial_answers_setting,
+            self.range_tolerance, self.tolerance,
+        )
+        return get_answer_artifact(key, compute_partial_credit_params)
+
     def get_score(self, student_answers):
         """
         Grade a numeric response.
@@ -1621,25 +1669,9 @@ class NumericalResponse(LoncapaResponse):
             raise general_exception
         # End `evaluator` block -- we figured out the student's answer!
 
-        tree = self.xml
-
-        # What multiple of the tolerance is worth partial credit?
-        has_partial_range = tree.xpath('responseparam[@partial_range]')
-        if has_partial_range:
-            partial_range = float(has_partial_range[0].get('partial_range', default='2'))
-        else:
-            partial_range = 2
-
-        # Take in alternative answers that are worth partial credit.
-        has_partial_answers = tree.xpath('responseparam[@partial_answers]')
-        if has_partial_answers:
-            partial_answers = has_partial_answers[0].get('partial_answers').split(',')
-            for index, word in enumerate(partial_answers):
-                partial_answers[index] = word.strip()
-                partial_answers[index] = self.get_staff_ans(partial_answers[index])
-
-        else:
-            partial_answers = False
+        # What multiple of the tolerance is worth partial credit, and which
+        # alternative answers are worth partial credit?
+        partial_range, partial_answers, expanded_tolerance = self.get_partial_credit_params()
 
         partial_score = 0.5
         is_correct = 'incorrect'
@@ -1704,11 +1736,6 @@ class NumericalResponse(LoncapaResponse):
             #  the student gets 25%. (We take the 50% and square it, at the moment.)
             #  Set via partial_credit="list,close" or "close, list" or the like.
 
-            if str(self.tolerance).endswith('%'):
-                expanded_tolerance = str(partial_range * float(str(self.tolerance)[:-1])) + '%'
-            else:
-                expanded_tolerance = partial_range * float(self.tolerance)
-
             if compare_with_tolerance(student_float, correct_float, self.tolerance):
                 is_correct = 'correct'
             elif self.has_partial_credit is False:
@@ -1900,9 +1927,36 @@ class StringResponse(LoncapaResponse):
 
     def check_string_backward(self, expected, given):
         if self.case_insensitive:
-            return given.lower() in [i.lower() for i in expected]
+            return given.lower() in self.get_lowercase_answers(expected)
         return given in expected
 
+    def get_lowercase_answers(self, expected):
+        """
+        Returns the set of the answers in `expected`, lowercased for case
+        insensitive comparison.  Cached by the answers.
+        """
+        return get_answer_artifact(
+            ('string_lowercase', tuple(expected)),
+            lambda: frozenset(i.lower() for i in expected)
+        )
+
+    def get_answer_regexp(self, expected, ci_mode):
+        """
+        Returns the compiled regular expression that matches a whole answer
+        against any of the patterns in `expected`.
+
+        Raises the error from `re.compile` if the patterns are not valid.
+
+        Cached by the patterns and mode, as `re` only keeps the last hundred
+        patterns it compiled, which a server grading many problems cycles
+        through quickly.
+        """
+        flags = re.IGNORECASE if ci_mode else 0
+        return get_answer_artifact(
+            ('string_regexp', tuple(expected), ci_mode),
+            lambda: re.compile('^' + '|'.join(expected) + '$', flags=flags | re.UNICODE)
+        )
+
     def get_extended_hints(self, student_answers, new_cmap):
         """
         Find and install extended hints in new_cmap depending on the student answers.
@@ -1983,13 +2037,10 @@ class StringResponse(LoncapaResponse):
             return False
 
         if regex_mode:
-            flags = 0
-            if ci_mode:
-                flags = re.IGNORECASE
             try:
                 # We follow the check_string convention/exception, adding ^ and $
-                regex = re.compile('^' + answer + '$', flags=flags | re.UNICODE)
-                return re.search(regex, given)
+                regex = self.get_answer_regexp([answer], ci_mode)
+                return regex.search(given)
             except Exception:  # pylint: disable=broad-except
                 return False
 
@@ -2028,10 +2079,9 @@ class StringResponse(LoncapaResponse):
         # end of backward compatibility
 
         if self.regexp:  # regexp match
-            flags = re.IGNORECASE if self.case_insensitive else 0
             try:
-                regexp = re.compile('^' + '|'.join(expected) + '$', flags=flags | re.UNICODE)
-                result = re.search(regexp, given)
+                regexp = self.get_answer_regexp(expected, self.case_insensitive)
+                result = regexp.search(given)
             except Exception as err:
                 msg = u'[courseware.capa.responsetypes.stringresponse] {error}: {message}'.format(
                     error=_('error'),
@@ -2042,7 +2092,7 @@ class StringResponse(LoncapaResponse):
             return bool(result)
         else:  # string match
             if self.case_insensitive:
-                return given.lower() in [i.lower() for i in expected]
+                return given.lower() in self.get_lowercase_answers(expected)
             else:
                 return given in expected
 
@@ -2534,22 +2584,30 @@ class SymbolicResponse(CustomResponse):
         super(SymbolicResponse, self).setup_response()
 
     def execute_check_function(self, idset, submission):
-        from symmath import symmath_check
+        from symmath import symmath_check, symmath_check_with_timeout, SymmathTimeoutError
+        _ = self.capa_system.i18n.ugettext
+        timeout = self.capa_system.symbolic_check_timeout
         try:
             # Since we have limited max_inputfields to 1,
             # we can assume that there is only one submission
             answer_given = submission[0]
+            kwargs = {
+                'dynamath': self.context.get('dynamath'),
+                'options': self.context.get('options'),
+                'debug': self.context.get('debug'),
+            }
 
-            ret = symmath_check(
-                self.expect, answer_given,
-                dynamath=self.context.get('dynamath'),
-                options=self.context.get('options'),
-                debug=self.context.get('debug'),
+            if timeout:
+                ret = symmath_check_with_timeout(self.expect, answer_given, timeout, **kwargs)
+            else:
+                ret = symmath_check(self.expect, answer_given, **kwargs)
+        except SymmathTimeoutError:
+            raise StudentInputError(
+                _(u"Your answer could not be checked in time. Try entering it in a simpler form.")
             )
         except Exception as err:
             log.error("oops in SymbolicResponse (cfn) error %s", err)
             log.error(traceback.format_exc())
-            _ = self.capa_system.i18n.ugettext
             # Translators: 'SymbolicResponse' is a problem type and should not be translated.
             msg = _(u"An error occurred with SymbolicResponse. The error was: {error_msg}").format(
                 error_msg=err,
@@ -76,6 +76,7 @@ def test_capa_system(render_template=None):
             'default_queuename': 'testqueue',
             'waittime': 10
         },
+        symbolic_check_timeout=None,
     )
     return the_system
 
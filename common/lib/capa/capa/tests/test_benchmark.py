@@ -0,0 +1,41 @@
+"""
+Tests for the capa grading benchmarks.
+"""
+import json
+import sys
+import unittest
+
+from symmath import symmath_check
+
+from capa.benchmark import SAMPLE_ANSWERS, main, run_benchmarks
+
+
+class BenchmarkTest(unittest.TestCase):
+    """
+    Runs the benchmarks once, to make sure that the benchmark problems still
+    load and that their sample answers are still graded as correct.
+    """
+    def test_run_benchmarks(self):
+        results = run_benchmarks(iterations=1)
+        self.assertEqual(set(results['results']), set(SAMPLE_ANSWERS))
+        for name, result in results['results'].items():
+            self.assertTrue(result['all_correct'], name)
+            for operation in ('parse', 'render', 'grade_answers', 'rescore_existing_answers'):
+                self.assertEqual(result[operation]['iterations'], 1)
+        # The results must be machine-readable.
+        json.dumps(results)
+
+    def test_response_types(self):
+        results = run_benchmarks(iterations=1, problems=['numericalresponse.xml', 'stringresponse.xml'])
+        self.assertEqual(results['results']['numericalresponse.xml']['response_types'], ['NumericalResponse'])
+        self.assertEqual(results['results']['stringresponse.xml']['response_types'], ['StringResponse'])
+
+    def test_symbolic_check_timeout(self):
+        self.addCleanup(sys.modules[symmath_check.__module__]._reset_check_pool)  # pylint: disable=protected-access
+        results = run_benchmarks(iterations=1, problems=['symbolicresponse.xml'], symbolic_check_timeout=30)
+        self.assertEqual(results['metadata']['symbolic_check_timeout'], 30)
+        self.assertTrue(results['results']['symbolicresponse.xml']['all_correct'])
+
+    def test_unknown_problem(self):
+        with self.assertRaises(SystemExit):
+            main(['--iterations', '1', 'nonexistent.xml'])
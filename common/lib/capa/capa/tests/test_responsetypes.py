@@ -9,6 +9,7 @@ import json
 import os
 import pyparsing
 import random
+import re
 import textwrap
 import unittest
 import zipfile
@@ -16,6 +17,7 @@ import zipfile
 import mock
 from pytz import UTC
 import requests
+from symmath import SymmathTimeoutError
 
 from capa.tests.helpers import new_loncapa_problem, test_capa_system, load_fixture
 import calc
@@ -388,6 +390,25 @@ class SymbolicResponseTest(ResponseTest):  # pylint: disable=missing-docstring
             snuggletex_resp=wrong_snuggletex,
         )
 
+    def test_check_with_timeout(self):
+        problem = self.build_problem(math_display=True, expect="2*x+3*y")
+        problem.capa_system.symbolic_check_timeout = 5
+
+        with mock.patch('symmath.symmath_check_with_timeout') as mock_check:
+            mock_check.return_value = {'ok': True, 'msg': ''}
+            correct_map = problem.grade_answers({'1_2_1': '2*x+3*y', '1_2_1_dynamath': ''})
+
+        self.assertEqual(correct_map.get_correctness('1_2_1'), 'correct')
+        self.assertEqual(mock_check.call_args[0], ('2*x+3*y', '2*x+3*y', 5))
+
+    def test_check_timed_out(self):
+        problem = self.build_problem(math_display=True, expect="2*x+3*y")
+        problem.capa_system.symbolic_check_timeout = 5
+
+        with mock.patch('symmath.symmath_check_with_timeout', side_effect=SymmathTimeoutError):
+            with self.assertRaises(StudentInputError):
+                problem.grade_answers({'1_2_1': '2*x+3*y', '1_2_1_dynamath': ''})
+
     def test_multiple_inputs_exception(self):
 
         # Should not allow multiple inputs, since we specify
@@ -644,6 +665,21 @@ class StringResponseTest(ResponseTest):  # pylint: disable=missing-docstring
             self.assert_grade(problem, answer.lower(), "correct")
         self.assert_grade(problem, "Other String", "incorrect")
 
+    @mock.patch.dict('capa.util._answer_artifact_cache', clear=True)
+    def test_regexp_compiled_once(self):
+        def build_problem():
+            """Builds the problem anew, as each request does."""
+            return self.build_problem(
+                answer="sec.*", case_sensitive=False, regexp=True, additional_answers=["third"]
+            )
+
+        with mock.patch('capa.responsetypes.re.compile', wraps=re.compile) as mock_compile:
+            self.assert_multiple_grade(build_problem(), ["Second", "THIRD"], ["first"])
+            compiled = mock_compile.call_count
+            self.assert_multiple_grade(build_problem(), ["section", "third"], ["thirds", "fourth"])
+        # Grading the same problem again reuses the regular expressions that are already compiled.
+        self.assertEqual(mock_compile.call_count, compiled)
+
     def test_regexp(self):
         problem = self.build_problem(answer="Second", case_sensitive=False, regexp=True)
         self.assert_grade(problem, "Second", "correct")
@@ -1702,6 +1738,45 @@ class NumericalResponseTest(ResponseTest):  # pylint: disable=missing-docstring
         self.assertTrue(responder.validate_answer('23.5'))
         self.assertFalse(responder.validate_answer('fish'))
 
+    @mock.patch.dict('capa.util._constant_expression_cache', clear=True)
+    def test_staff_answer_evaluated_once(self):
+        """The staff answer and tolerance are evaluated once, not on every submission."""
+        problem = self.build_problem(answer="sqrt(16)", tolerance="2%")
+        with mock.patch('capa.util.evaluator', wraps=calc.evaluator) as mock_eval:
+            self.assert_multiple_grade(problem, ["4", "4.05"], ["4.1", "3"])
+        evaluated = [args[2] for args, __ in mock_eval.call_args_list]
+        self.assertEqual(evaluated.count("sqrt(16)"), 1)
+        self.assertEqual(evaluated.count("2"), 1)
+
+    @mock.patch.dict('capa.util._answer_artifact_cache', clear=True)
+    def test_partial_credit_params_cached(self):
+        """Partial credit settings are evaluated once for all the gradings of a problem."""
+        def build_problem():
+            """Builds the problem anew, as each request does."""
+            return self.build_problem(
+                answer=4,
+                tolerance=0.2,
+                partial_range=3,
+                credit_type='close,list',
+                partial_answers='2,8,-4'
+            )
+
+        params = build_problem().responders.values()[0].get_partial_credit_params()
+        self.assertEqual(params, (3.0, (2, 8, -4), 0.6000000000000001))
+        problem = build_problem()
+        self.assert_multiple_partial(problem, ["4"], ["1"], ["2", "4.5"])
+        self.assertIs(problem.responders.values()[0].get_partial_credit_params(), params)
+
+        # Problems with other settings get their own.
+        other_problem = self.build_problem(
+            answer=4,
+            tolerance=0.2,
+            partial_range=2,
+            credit_type='close,list',
+            partial_answers='2,8,-4'
+        )
+        self.assertEqual(other_problem.responders.values()[0].get_partial_credit_params()[0], 2.0)
+
 
 class CustomResponseTest(ResponseTest):  # pylint: disable=missing-docstring
     xml_factory_class = CustomResponseXMLFactory
@@ -3,9 +3,12 @@ Tests capa util
 """
 import unittest
 from lxml import etree
+from mock import Mock, patch
 
 from capa.tests.helpers import test_capa_system
-from capa.util import compare_with_tolerance, sanitize_html, get_inner_html_from_xpath, remove_markup
+from capa.util import (
+    compare_with_tolerance, sanitize_html, get_inner_html_from_xpath, remove_markup, get_answer_artifact
+)
 
 
 class UtilTest(unittest.TestCase):
@@ -135,3 +138,26 @@ class UtilTest(unittest.TestCase):
             remove_markup("The <mark>Truth</mark> is <em>Out There</em> & you need to <strong>find</strong> it"),
             "The Truth is Out There &amp; you need to find it"
         )
+
+    @patch('capa.util.MAX_ANSWER_ARTIFACT_CACHE_SIZE', 2)
+    @patch.dict('capa.util._answer_artifact_cache', clear=True)
+    def test_get_answer_artifact(self):
+        """
+        Test that answer artifacts are computed once, unless computing them
+        fails, and that the cache is bounded.
+        """
+        compute = Mock(return_value='value')
+        self.assertEqual(get_answer_artifact(('a',), compute), 'value')
+        self.assertEqual(get_answer_artifact(('a',), compute), 'value')
+        self.assertEqual(compute.call_count, 1)
+
+        failing_compute = Mock(side_effect=ValueError)
+        for __ in range(2):
+            with self.assertRaises(ValueError):
+                get_answer_artifact(('b',), failing_compute)
+        self.assertEqual(failing_compute.call_count, 2)
+
+        get_answer_artifact(('b',), compute)
+        get_answer_artifact(('c',), compute)
+        self.assertEqual(get_answer_artifact(('a',), compute), 'value')
+        self.assertEqual(compute.call_count, 4)
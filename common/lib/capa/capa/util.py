@@ -14,6 +14,60 @@ from openedx.core.djangolib.markup import HTML
 # Utility functions used in CAPA responsetypes
 default_tolerance = '0.001%'
 
+# Values of constant math expressions (staff answers, tolerances), keyed by
+# the expression.  Cleared when full, so that a long-running process cannot
+# accumulate the expressions of every problem it has ever graded.
+_constant_expression_cache = {}
+MAX_CONSTANT_EXPRESSION_CACHE_SIZE = 10000
+
+
+def evaluate_constant_expression(expression):
+    """
+    Return the value of `expression`, a math expression without variables, as
+    computed by `evaluator`.
+
+    Problem definitions repeat the same expressions for every submission, so
+    values are cached.  Expressions that `evaluator` fails on are not cached,
+    and raise every time.
+    """
+    try:
+        return _constant_expression_cache[expression]
+    except KeyError:
+        pass
+    value = evaluator(dict(), dict(), expression)
+    if len(_constant_expression_cache) >= MAX_CONSTANT_EXPRESSION_CACHE_SIZE:
+        _constant_expression_cache.clear()
+    _constant_expression_cache[expression] = value
+    return value
+
+
+# Values derived from the answers in problem definitions, such as compiled
+# regular expressions, keyed by the answers and the settings they are used
+# with.  Problems are rebuilt for every request, so keeping these per process
+# is what lets grading the same problem again reuse them.  Cleared when full,
+# like the constant expression cache.
+_answer_artifact_cache = {}
+MAX_ANSWER_ARTIFACT_CACHE_SIZE = 10000
+
+
+def get_answer_artifact(key, compute):
+    """
+    Return the value cached under `key`, a hashable description of the
+    answers it is derived from, calling `compute` to create it if needed.
+
+    Values must not be modified, as they are shared by every problem with the
+    same answers.  Errors raised by `compute` are not cached.
+    """
+    try:
+        return _answer_artifact_cache[key]
+    except KeyError:
+        pass
+    value = compute()
+    if len(_answer_artifact_cache) >= MAX_ANSWER_ARTIFACT_CACHE_SIZE:
+        _answer_artifact_cache.clear()
+    _answer_artifact_cache[key] = value
+    return value
+
 
 def compare_with_tolerance(student_complex, instructor_complex, tolerance=default_tolerance, relative_tolerance=False):
     """
@@ -54,11 +108,11 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         if tolerance == default_tolerance:
             relative_tolerance = True
         if tolerance.endswith('%'):
-            tolerance = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+            tolerance = evaluate_constant_expression(tolerance[:-1]) * 0.01
             if not relative_tolerance:
                 tolerance = tolerance * abs(instructor_complex)
         else:
-            tolerance = evaluator(dict(), dict(), tolerance)
+            tolerance = evaluate_constant_expression(tolerance)
 
     if relative_tolerance:
         tolerance = tolerance * max(abs(student_complex), abs(instructor_complex))
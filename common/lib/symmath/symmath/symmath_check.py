@@ -8,12 +8,83 @@
 #
 # Takes in math expressions given as Presentation MathML (from ASCIIMathML), converts to Content MathML using SnuggleTeX
 
+import multiprocessing
+import os
+import threading
 import traceback
+from copy import deepcopy
 from .formula import *
 import logging
 
 log = logging.getLogger(__name__)
 
+# Parsed and simplified instructor expressions, so that checking many answers
+# to the same problem only parses its expected answer once per process.
+_expect_cache = {}
+_simplify_cache = {}
+MAX_EXPRESSION_CACHE_SIZE = 1000
+
+# Worker process used by symmath_check_with_timeout; created on first use,
+# and again in each process forked after that.  The lock guards creating and
+# resetting it, and the set of checks submitted to it and not finished yet.
+_check_pool = None
+_check_pool_pid = None
+_check_pool_lock = threading.Lock()
+_pending_checks = set()
+# Replace the worker process after this many checks, to bound its memory use.
+MAX_CHECKS_PER_PROCESS = 1000
+
+
+class SymmathTimeoutError(Exception):
+    """
+    Raised when a symbolic check takes longer than its time limit.
+    """
+    pass
+
+
+def _cache_set(cache, key, value):
+    """
+    Store value in one of the expression caches, emptying it first if it is full.
+    """
+    if len(cache) >= MAX_EXPRESSION_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+
+
+def sympify_expect(expect, normphase=False, matrix=False, abcsym=False, do_qubit=False, symtab=None):
+    """
+    Version of my_sympify for instructor expressions, which are cached.
+
+    Matrices and lists are mutable, so a copy of those is returned.  Expressions
+    parsed with a custom symbol table are not cached.
+    """
+    if symtab:
+        return my_sympify(expect, normphase, matrix, abcsym=abcsym, do_qubit=do_qubit, symtab=symtab)
+
+    key = (expect, normphase, matrix, abcsym, do_qubit)
+    try:
+        sexpr = _expect_cache[key]
+    except KeyError:
+        sexpr = my_sympify(expect, normphase, matrix, abcsym=abcsym, do_qubit=do_qubit)
+        _cache_set(_expect_cache, key, sexpr)
+    if isinstance(sexpr, sympy.Basic):
+        return sexpr
+    return deepcopy(sexpr)
+
+
+def simplify_expect(xexpect):
+    """
+    sympy.simplify an instructor expression, caching the result for immutable expressions.
+    """
+    if not isinstance(xexpect, sympy.Basic):
+        return sympy.simplify(xexpect)
+    try:
+        return _simplify_cache[xexpect]
+    except KeyError:
+        simplified = sympy.simplify(xexpect)
+        _cache_set(_simplify_cache, xexpect, simplified)
+        return simplified
+
 #-----------------------------------------------------------------------------
 # check function interface
 #
@@ -95,7 +166,7 @@ def check(expect, given, numerical=False, matrix=False, normphase=False, abcsym=
         return {'ok': False, 'msg': 'Error %s<br/> in evaluating your expression "%s"' % (err, given)}
 
     try:
-        xexpect = my_sympify(expect, normphase, matrix, do_qubit=do_qubit, abcsym=abcsym, symtab=symtab)
+        xexpect = sympify_expect(expect, normphase, matrix, do_qubit=do_qubit, abcsym=abcsym, symtab=symtab)
     except Exception, err:
         return {'ok': False, 'msg': 'Error %s<br/> in evaluating OUR expression "%s"' % (err, expect)}
 
@@ -125,7 +196,7 @@ def check(expect, given, numerical=False, matrix=False, normphase=False, abcsym=
             #msg += "dm = " + to_latex(dm) + " diff = " + str(abs(dm.vec().norm().evalf()))
             #msg += "expect = " + to_latex(xexpect)
     elif dosimplify:
-        if sympy.simplify(xexpect) == sympy.simplify(xgiven):
+        if simplify_expect(xexpect) == sympy.simplify(xgiven):
             return {'ok': True, 'msg': msg}
     elif numerical:
         if abs((xexpect - xgiven).evalf(chop=True)) < threshold:
@@ -206,7 +277,7 @@ def symmath_check(expect, ans, dynamath=None, options=None, debug=None, xml=None
 
     # parse expected answer
     try:
-        fexpect = my_sympify(str(expect), matrix=do_matrix, do_qubit=do_qubit)
+        fexpect = sympify_expect(str(expect), matrix=do_matrix, do_qubit=do_qubit)
     except Exception, err:
         msg += '<p>Error %s in parsing OUR expected answer "%s"</p>' % (err, expect)
         return {'ok': False, 'msg': make_error_message(msg)}
@@ -324,3 +395,119 @@ def symmath_check(expect, ans, dynamath=None, options=None, debug=None, xml=None
 
     # Used to return more keys: 'ex': fexpect, 'got': fsym
     return {'ok': False, 'msg': msg}
+
+#-----------------------------------------------------------------------------
+# Time-limited checking in a separate process
+
+
+class _PendingCheck(object):
+    """
+    A check submitted to the worker process, which its caller waits for.
+    """
+    def __init__(self, pool):
+        self.pool = pool
+        self.done = threading.Event()
+        # (True, result) or (False, error) once finished; None if the worker
+        # process was killed before the check finished.
+        self.outcome = None
+
+    def finish(self, outcome):
+        """
+        Record the outcome of the check and wake its caller.
+        """
+        if not self.done.is_set():
+            self.outcome = outcome
+            self.done.set()
+
+
+def _run_check(expect, ans, kwargs):
+    """
+    Run symmath_check in the worker process.  Returns (True, result), or
+    (False, error) if it raised, so that the pool always reports back.
+    """
+    try:
+        return True, symmath_check(expect, ans, **kwargs)
+    except Exception as error:  # pylint: disable=broad-except
+        return False, error
+
+
+def _get_check_pool():
+    """
+    Return the pool holding the worker process that runs time-limited checks.
+    Callers must hold _check_pool_lock.
+    """
+    global _check_pool, _check_pool_pid  # pylint: disable=global-statement
+    if _check_pool is None or _check_pool_pid != os.getpid():
+        # A pool inherited from the parent of a forked process has no workers
+        # in this one, so it is left alone for the parent to use.
+        _check_pool = multiprocessing.Pool(processes=1, maxtasksperchild=MAX_CHECKS_PER_PROCESS)
+        _check_pool_pid = os.getpid()
+    return _check_pool
+
+
+def _reset_check_pool(pool=None):
+    """
+    Kill the worker process, e.g. because it is stuck on a slow check, and
+    fail the other checks it was running or had queued, so that their callers
+    stop waiting for them right away.
+
+    If `pool` is given, only reset it if it is still the current pool, as
+    another caller may already have replaced it.
+    """
+    global _check_pool, _check_pool_pid  # pylint: disable=global-statement
+    with _check_pool_lock:
+        if pool is not None and pool is not _check_pool:
+            return
+        if _check_pool is not None and _check_pool_pid == os.getpid():
+            _check_pool.terminate()
+            for pending in [pending for pending in _pending_checks if pending.pool is _check_pool]:
+                pending.finish(None)
+        _check_pool = None
+        _check_pool_pid = None
+
+
+def symmath_check_with_timeout(expect, ans, timeout, dynamath=None, options=None, debug=None):
+    """
+    Run symmath_check in a worker process, giving up after timeout seconds.
+
+    A slow simplification can take minutes; running it in another process means
+    it can be abandoned without tying up the caller.  The worker process is kept
+    between checks, so it keeps its cache of parsed instructor expressions.
+
+    Raises SymmathTimeoutError if the check does not finish in time, after
+    killing the worker process, or if another check timed out and killed the
+    worker process before this one finished.  Checks run one at a time, so
+    the time spent waiting for other checks counts towards the timeout.
+
+    Daemonic processes, such as the workers of a prefork celery pool, can't
+    have child processes, so they run the check themselves, without a time
+    limit.
+    """
+    if multiprocessing.current_process().daemon:
+        return symmath_check(expect, ans, dynamath=dynamath, options=options, debug=debug)
+
+    with _check_pool_lock:
+        pool = _get_check_pool()
+        pending = _PendingCheck(pool)
+        _pending_checks.add(pending)
+        pool.apply_async(
+            _run_check, (expect, ans, {'dynamath': dynamath, 'options': options, 'debug': debug}),
+            callback=pending.finish
+        )
+    try:
+        finished = pending.done.wait(timeout)
+    finally:
+        with _check_pool_lock:
+            _pending_checks.discard(pending)
+
+    if not finished:
+        log.warning("symmath_check(%r, %r) took longer than %s seconds", expect, ans, timeout)
+        _reset_check_pool(pool)
+        raise SymmathTimeoutError("Checking the expression took longer than {} seconds".format(timeout))
+    if pending.outcome is None:
+        raise SymmathTimeoutError("Checking the expression was interrupted by another check that took too long")
+
+    succeeded, value = pending.outcome
+    if not succeeded:
+        raise value
+    return value
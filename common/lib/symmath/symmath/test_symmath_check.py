@@ -1,5 +1,14 @@
+import sys
 from unittest import TestCase
-from .symmath_check import symmath_check
+
+from mock import patch
+
+from .symmath_check import (
+    SymmathTimeoutError, check, symmath_check, symmath_check_with_timeout, sympify_expect
+)
+
+# The package re-exports the symmath_check function under the module's name.
+symmath_check_module = sys.modules[symmath_check.__module__]
 
 
 class SymmathCheckTest(TestCase):
@@ -85,3 +94,62 @@ class SymmathCheckTest(TestCase):
             result = symmath_check(str(expect), str(ans))
             self.assertTrue('ok' in result and not result['ok'],
                             "%f should != %f" % (expect, ans))
+
+    @patch.dict(symmath_check_module._expect_cache, clear=True)  # pylint: disable=protected-access
+    def test_expected_answer_parsed_once(self):
+        with patch.object(symmath_check_module, 'my_sympify', wraps=symmath_check_module.my_sympify) as mock_sympify:
+            for ans in ('x+x', 'x*2', 'x'):
+                check('2*x', ans)
+        expected_calls = [call for call in mock_sympify.call_args_list if call[0][0] == '2*x']
+        self.assertEqual(len(expected_calls), 1)
+
+    @patch.dict(symmath_check_module._expect_cache, clear=True)  # pylint: disable=protected-access
+    def test_cached_matrix_is_copied(self):
+        matrix = sympify_expect('[[1,2],[3,4]]', matrix=True)
+        matrix[0, 0] = 5
+        self.assertEqual(sympify_expect('[[1,2],[3,4]]', matrix=True)[0, 0], 1)
+
+    def test_symmath_check_with_timeout(self):
+        self.addCleanup(symmath_check_module._reset_check_pool)  # pylint: disable=protected-access
+        result = symmath_check_with_timeout('x+2*y', 'x+2*y', timeout=30)
+        self.assertTrue(result['ok'])
+
+    def test_symmath_check_timed_out(self):
+        self.addCleanup(symmath_check_module._reset_check_pool)  # pylint: disable=protected-access
+        with self.assertRaises(SymmathTimeoutError):
+            symmath_check_with_timeout('x+2*y', 'x+2*y', timeout=0.000001)
+        self.assertIsNone(symmath_check_module._check_pool)  # pylint: disable=protected-access
+
+    @patch('multiprocessing.current_process')
+    def test_symmath_check_in_daemon_process(self, mock_current_process):
+        mock_current_process.return_value.daemon = True
+        result = symmath_check_with_timeout('x+2*y', 'x+2*y', timeout=30)
+        self.assertTrue(result['ok'])
+        self.assertIsNone(symmath_check_module._check_pool)  # pylint: disable=protected-access
+
+    def test_check_pool_replaced_after_fork(self):
+        self.addCleanup(symmath_check_module._reset_check_pool)  # pylint: disable=protected-access
+        pool = symmath_check_module._get_check_pool()  # pylint: disable=protected-access
+        self.addCleanup(pool.terminate)
+        with patch('os.getpid', return_value=-1):
+            forked_pool = symmath_check_module._get_check_pool()  # pylint: disable=protected-access
+        self.addCleanup(forked_pool.terminate)
+        self.assertIsNot(forked_pool, pool)
+
+    def test_reset_fails_pending_checks(self):
+        self.addCleanup(symmath_check_module._reset_check_pool)  # pylint: disable=protected-access
+        with symmath_check_module._check_pool_lock:  # pylint: disable=protected-access
+            pool = symmath_check_module._get_check_pool()  # pylint: disable=protected-access
+        # Another caller's check, still running when the pool is reset.
+        pending = symmath_check_module._PendingCheck(pool)  # pylint: disable=protected-access
+        symmath_check_module._pending_checks.add(pending)  # pylint: disable=protected-access
+        self.addCleanup(symmath_check_module._pending_checks.discard, pending)  # pylint: disable=protected-access
+
+        # Resetting a pool that was already replaced leaves the current one alone.
+        symmath_check_module._reset_check_pool(object())  # pylint: disable=protected-access
+        self.assertFalse(pending.done.is_set())
+
+        symmath_check_module._reset_check_pool(pool)  # pylint: disable=protected-access
+        self.assertTrue(pending.done.is_set())
+        self.assertIsNone(pending.outcome)
+        self.assertIsNone(symmath_check_module._check_pool)  # pylint: disable=protected-access
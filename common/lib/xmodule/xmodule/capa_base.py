@@ -44,6 +44,13 @@ MAX_RANDOMIZATION_BINS = 1000
 
 FEATURES = getattr(settings, 'FEATURES', {})
 
+# How long rendered problem html is kept in the cache, in seconds.
+PROBLEM_HTML_CACHE_TIMEOUT = getattr(settings, 'PROBLEM_HTML_CACHE_TIMEOUT', 60 * 60)
+
+# If set, symbolic math answers are checked in a separate process and abandoned
+# after this many seconds.
+SYMBOLIC_CHECK_TIMEOUT = getattr(settings, 'SYMBOLIC_CHECK_TIMEOUT', None)
+
 
 def randomization_bin(seed, problem_id):
     """
@@ -317,7 +324,8 @@ class CapaMixin(CapaFields):
             seed=self.runtime.seed,      # Why do we do this if we have self.seed?
             STATIC_URL=self.runtime.STATIC_URL,
             xqueue=self.runtime.xqueue,
-            matlab_api_key=self.matlab_api_key
+            matlab_api_key=self.matlab_api_key,
+            symbolic_check_timeout=SYMBOLIC_CHECK_TIMEOUT,
         )
 
         return LoncapaProblem(
@@ -346,6 +354,9 @@ class CapaMixin(CapaFields):
         """
         Set the module's state from the settings in `self.lcp`
         """
+        # The fragment rendered for the state being replaced will not be shown again.
+        self.invalidate_problem_html_cache()
+
         lcp_state = self.lcp.get_state()
         self.done = lcp_state['done']
         self.correct_map = lcp_state['correct_map']
@@ -654,15 +665,7 @@ class CapaMixin(CapaFields):
         encapsulate (bool): if True (the default) embed the html in a problem <div>
         submit_notification (bool): True if the submit notification should be added
         """
-        try:
-            html = self.lcp.get_html()
-
-        # If we cannot construct the problem HTML,
-        # then generate an error message instead.
-        except Exception as err:  # pylint: disable=broad-except
-            html = self.handle_problem_html_error(err)
-
-        html = self.remove_tags_from_html(html)
+        html = self.get_problem_content_html()
 
         # Enable/Disable Submit button if should_enable_submit_button returns True/False.
         submit_button = self.submit_button_name()
@@ -726,6 +729,78 @@ class CapaMixin(CapaFields):
 
         return html
 
+    def get_problem_content_html(self):
+        """
+        Return the html of the problem body, as rendered by the LoncapaProblem.
+
+        When FEATURES['ENABLE_PROBLEM_HTML_CACHE'] is set, the html is cached in the
+        runtime cache, keyed on everything that goes into rendering it, so that page
+        views of an unchanged problem don't re-render every input type.
+        """
+        cache_key = self._problem_html_cache_key()
+        if cache_key is not None:
+            html = self.runtime.cache.get(cache_key)
+            if dog_stats_api:
+                dog_stats_api.increment(
+                    'capa.problem_html_cache',
+                    tags=[u'result:{}'.format('miss' if html is None else 'hit')]
+                )
+            if html is not None:
+                return html
+
+        try:
+            html = self.lcp.get_html()
+
+        # If we cannot construct the problem HTML,
+        # then generate an error message instead.
+        # Don't cache it, the error may be transient.
+        except Exception as err:  # pylint: disable=broad-except
+            return self.remove_tags_from_html(self.handle_problem_html_error(err))
+
+        html = self.remove_tags_from_html(html)
+        if cache_key is not None:
+            self.runtime.cache.set(cache_key, html, PROBLEM_HTML_CACHE_TIMEOUT)
+        return html
+
+    def invalidate_problem_html_cache(self):
+        """
+        Remove the cached problem html for the current state of the module.
+        """
+        cache_key = self._problem_html_cache_key()
+        if cache_key is not None:
+            self.runtime.cache.delete(cache_key)
+
+    def _problem_html_cache_key(self):
+        """
+        Return the cache key of the problem html for the current state of the module,
+        or None if problem html caching is disabled.
+
+        The key covers the problem definition, the student state (which includes the seed),
+        the student and language the problem is rendered for, and the showanswer and due
+        date settings.
+        """
+        if not FEATURES.get('ENABLE_PROBLEM_HTML_CACHE') or getattr(self.runtime, 'cache', None) is None:
+            return None
+
+        get_language = getattr(self.runtime.service(self, "i18n"), 'get_language', None)
+        key_parts = [
+            unicode(self.location),
+            self.lcp.problem_text,
+            json.dumps(self.get_state_for_lcp(), sort_keys=True, cls=ComplexEncoder),
+            self.runtime.anonymous_student_id,
+            get_language() if get_language else None,
+            self.runtime.STATIC_URL,
+            self.runtime.ajax_url,
+            self.showanswer,
+            self.answer_available(),
+            self.closed(),
+        ]
+        key_hash = hashlib.sha1()
+        for part in key_parts:
+            key_hash.update(unicode(part).encode('utf-8'))
+            key_hash.update('\0')
+        return u'capa.problem_html.{}'.format(key_hash.hexdigest())
+
     def _get_answer_notification(self, render_notifications):
         """
         Generate the answer notification type and message from the current problem status.
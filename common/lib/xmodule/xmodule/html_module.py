@@ -110,6 +110,14 @@ class HtmlModule(HtmlModuleMixin):
     """
     Module for putting raw html in a course
     """
+    @property
+    def student_view_cache_vary_on(self):
+        """
+        The html only depends on the learner through %%USER_ID%% substitution.
+        """
+        if "%%USER_ID%%" in self.data:
+            return ('anonymous_student_id',)
+        return ()
 
 
 class HtmlDescriptor(HtmlBlock, XmlDescriptor, EditingDescriptor):  # pylint: disable=abstract-method
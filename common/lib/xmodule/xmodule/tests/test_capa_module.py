@@ -36,6 +36,26 @@ from capa.correctmap import CorrectMap
 from ..capa_base_constants import RANDOMIZATION
 
 
+class DictCache(object):
+    """
+    A minimal in-memory stand-in for the Django cache held by the runtime.
+    """
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        """Return the value cached for `key`."""
+        return self.data.get(key, default)
+
+    def set(self, key, value, timeout=None):  # pylint: disable=unused-argument
+        """Cache `value` under `key`."""
+        self.data[key] = value
+
+    def delete(self, key):
+        """Remove `key` from the cache."""
+        self.data.pop(key, None)
+
+
 class CapaFactory(object):
     """
     A helper class to create problem modules with various parameters for testing.
@@ -1382,6 +1402,62 @@ class CapaModuleTest(unittest.TestCase):
         context = render_args[1]
         self.assertIn(error_msg, context['problem']['html'])
 
+    @patch.dict('xmodule.capa_base.FEATURES', {'ENABLE_PROBLEM_HTML_CACHE': True})
+    def test_get_problem_html_cached(self):
+        module = CapaFactory.create()
+        module.system.cache = DictCache()
+
+        with patch('capa.capa_problem.LoncapaProblem.get_html') as mock_html:
+            mock_html.return_value = "<div>Test Problem HTML</div>"
+            module.get_problem_html()
+            module.get_problem_html(encapsulate=False)
+            self.assertEqual(mock_html.call_count, 1)
+            self.assertEqual(len(module.system.cache.data), 1)
+
+            # Changing the learner's state drops the fragment rendered for the old state
+            module.lcp.student_answers = {CapaFactory.answer_key(): '3.14'}
+            module.set_state_from_lcp()
+            self.assertEqual(module.system.cache.data, {})
+
+            module.get_problem_html()
+            self.assertEqual(mock_html.call_count, 2)
+
+    @patch.dict('xmodule.capa_base.FEATURES', {'ENABLE_PROBLEM_HTML_CACHE': True})
+    def test_get_problem_html_cache_key(self):
+        module = CapaFactory.create(showanswer='always')
+        module.system.cache = DictCache()
+        key = module._problem_html_cache_key()  # pylint: disable=protected-access
+        self.assertEqual(key, module._problem_html_cache_key())  # pylint: disable=protected-access
+
+        module.seed += 1
+        seed_key = module._problem_html_cache_key()  # pylint: disable=protected-access
+        self.assertNotEqual(key, seed_key)
+
+        module.showanswer = 'never'
+        self.assertNotEqual(seed_key, module._problem_html_cache_key())  # pylint: disable=protected-access
+
+    @patch.dict('xmodule.capa_base.FEATURES', {'ENABLE_PROBLEM_HTML_CACHE': True})
+    def test_get_problem_html_error_not_cached(self):
+        module = CapaFactory.create()
+        module.system.cache = DictCache()
+        module.lcp.get_html = Mock(side_effect=Exception("Test"))
+        module.system.DEBUG = True
+
+        module.get_problem_html()
+        self.assertEqual(module.system.cache.data, {})
+
+    def test_get_problem_html_cache_disabled(self):
+        module = CapaFactory.create()
+        module.system.cache = DictCache()
+
+        with patch('capa.capa_problem.LoncapaProblem.get_html') as mock_html:
+            mock_html.return_value = "<div>Test Problem HTML</div>"
+            module.get_problem_html()
+            module.get_problem_html()
+
+        self.assertEqual(mock_html.call_count, 2)
+        self.assertEqual(module.system.cache.data, {})
+
     @ddt.data(
         'false',
         'true',
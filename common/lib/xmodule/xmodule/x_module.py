@@ -287,6 +287,12 @@ class XModuleMixin(XModuleFields, XBlock):
     # all user state is handled through the FieldData API.
     show_in_read_only_mode = False
 
+    # The learner properties, besides the block's content and settings and the
+    # request language, that the output of student_view depends on.  Setting
+    # this to a tuple lets the LMS cache that output (see
+    # lms.djangoapps.lms_xblock.fragment_cache); None means it is never cached.
+    student_view_cache_vary_on = None
+
     # Class level variable
 
     # True if this descriptor always requires recalculation of grades, for
@@ -483,6 +489,9 @@ class XModuleMixin(XModuleFields, XBlock):
         if usage_id_filter is None and usage_key_filter is not None:
             usage_id_filter = usage_key_filter
 
+        if usage_id_filter is None:
+            self._load_children()
+
         return [
             child
             for child
@@ -490,6 +499,22 @@ class XModuleMixin(XModuleFields, XBlock):
             if child is not None
         ]
 
+    def _load_children(self):
+        """
+        Loads all the children that are not in the children cache yet in one
+        batch, if the runtime supports it (see ModuleSystem.get_blocks).
+        """
+        if not self.has_children or getattr(self.runtime, 'get_modules', None) is None:
+            return
+
+        usage_ids = [usage_id for usage_id in self.children if usage_id not in self._child_cache]
+        if len(usage_ids) < 2:
+            return
+
+        # XModules load their children through their descriptor.
+        parent = getattr(self, 'descriptor', self)
+        self._child_cache.update(self.runtime.get_blocks(usage_ids, for_parent=parent))
+
     def get_child(self, usage_id):
         """
         Return the child XBlock identified by ``usage_id``, or ``None`` if there
@@ -1678,7 +1703,7 @@ class ModuleSystem(MetricsMixin, ConfigurableFragmentWrapper, Runtime):
             cache=None, can_execute_unsafe_code=None, replace_course_urls=None,
             replace_jump_to_id_urls=None, error_descriptor_class=None, get_real_user=None,
             field_data=None, get_user_role=None, rebind_noauth_module_to_user=None,
-            user_location=None, get_python_lib_zip=None, **kwargs):
+            user_location=None, get_python_lib_zip=None, get_modules=None, **kwargs):
         """
         Create a closure around the system environment.
 
@@ -1693,6 +1718,11 @@ class ModuleSystem(MetricsMixin, ConfigurableFragmentWrapper, Runtime):
                          module instance object.  If the current user does not have
                          access to that location, returns None.
 
+        get_modules - optional function that takes a list of descriptors and returns
+                         the list of their module instance objects, checking the
+                         current user's access to all of them at once.  Descriptors
+                         the user does not have access to are returned as None.
+
         render_template - a function that takes (template_file, context), and
                          returns rendered html.
 
@@ -1756,6 +1786,7 @@ class ModuleSystem(MetricsMixin, ConfigurableFragmentWrapper, Runtime):
         self.track_function = track_function
         self.filestore = filestore
         self.get_module = get_module
+        self.get_modules = get_modules
         self.render_template = render_template
         self.DEBUG = self.debug = debug
         self.HOSTNAME = self.hostname = hostname
@@ -1814,6 +1845,27 @@ class ModuleSystem(MetricsMixin, ConfigurableFragmentWrapper, Runtime):
     def get_block(self, block_id, for_parent=None):
         return self.get_module(self.descriptor_runtime.get_block(block_id, for_parent=for_parent))
 
+    def get_blocks(self, block_ids, for_parent=None):
+        """
+        Returns a dict mapping each of `block_ids` to its block, as get_block
+        would return it.  Blocks that can't be found are left out.
+
+        If the runtime was given `get_modules`, all the blocks are loaded
+        together, so that the user's access to them is checked in one batch.
+        """
+        descriptors = []
+        for block_id in block_ids:
+            try:
+                descriptors.append((block_id, self.descriptor_runtime.get_block(block_id, for_parent=for_parent)))
+            except ItemNotFoundError:
+                log.warning(u'Unable to load item %s, skipping', block_id)
+
+        if self.get_modules is not None:
+            modules = self.get_modules([descriptor for __, descriptor in descriptors])
+        else:
+            modules = [self.get_module(descriptor) for __, descriptor in descriptors]
+        return {block_id: module for (block_id, __), module in zip(descriptors, modules)}
+
     def resource_url(self, resource):
         raise NotImplementedError("edX Platform doesn't currently implement XBlock resource urls")
 
@@ -0,0 +1,177 @@
+"""
+Command to benchmark rendering and sending bulk email against a local SMTP stand-in.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import asyncore
+import json
+import smtpd
+import threading
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.management.base import BaseCommand
+
+from bulk_email.models import CourseEmailTemplate
+
+
+SAMPLE_CONTEXT = {
+    'course_title': u'Demonstration Course',
+    'course_root': u'/courses/course-v1:edX+DemoX+Demo_Course/',
+    'course_url': u'https://courses.example.com/courses/course-v1:edX+DemoX+Demo_Course/',
+    'course_image_url': u'https://courses.example.com/asset-v1:edX+DemoX+Demo_Course+type@asset+block@course.jpg',
+    'course_end_date': u'Dec 31, 2030',
+    'account_settings_url': u'https://courses.example.com/account/settings',
+    'email_settings_url': u'https://courses.example.com/dashboard',
+    'platform_name': u'edX',
+    'course_id': u'course-v1:edX+DemoX+Demo_Course',
+}
+
+SAMPLE_SUBJECT = u'Welcome to %%COURSE_DISPLAY_NAME%%'
+
+SAMPLE_HTML_MESSAGE = u'<p>Dear %%USER_FULLNAME%%,</p>\n' + u'<p>{}</p>\n'.format(
+    u' '.join([u'Welcome to %%COURSE_DISPLAY_NAME%%, which ends on %%COURSE_END_DATE%%.'] * 40)
+) * 5
+
+SAMPLE_TEXT_MESSAGE = u'Dear %%USER_FULLNAME%%,\n' + u'{}\n'.format(
+    u' '.join([u'Welcome to %%COURSE_DISPLAY_NAME%%, which ends on %%COURSE_END_DATE%%.'] * 40)
+) * 5
+
+
+class CountingSMTPServer(smtpd.SMTPServer):
+    """
+    An SMTP stand-in that accepts every message and counts them.
+    """
+    def __init__(self, *args, **kwargs):
+        smtpd.SMTPServer.__init__(self, *args, **kwargs)
+        self.received = 0
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        self.received += 1
+
+
+def _recipients(count):
+    """
+    Returns `count` recipients in the form that bulk email tasks are given them.
+    """
+    return [
+        {'pk': index, 'profile__name': u'Learner {}'.format(index), 'email': u'learner{}@example.com'.format(index)}
+        for index in range(1, count + 1)
+    ]
+
+
+def _recipient_context(recipient):
+    """
+    Returns the email context of the given recipient.
+    """
+    return dict(SAMPLE_CONTEXT, name=recipient['profile__name'], email=recipient['email'], user_id=recipient['pk'])
+
+
+def _timed(function, count):
+    """
+    Calls `function`, and returns its timing for `count` messages.
+    """
+    start = default_timer()
+    function()
+    duration = default_timer() - start
+    return {
+        'seconds': duration,
+        'ms_per_message': duration * 1000 / count,
+        'messages_per_second': count / duration if duration else None,
+    }
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_bulk_email --recipients 2000 --settings=devstack
+
+    Renders a sample email for each of a number of generated recipients, both
+    one recipient at a time with the whole template and with the template
+    compiled once, then sends the messages to an SMTP server that this command
+    runs locally, both with a new connection for each batch of
+    BULK_EMAIL_EMAILS_PER_TASK recipients and with one connection for all of
+    them.  Prints the timings as JSON.
+    """
+    help = 'Benchmarks rendering and sending bulk email against a local SMTP stand-in.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--recipients',
+            help='Number of recipients to render and send the email for.',
+            default=1000,
+            type=int,
+        )
+        parser.add_argument(
+            '--batch_size',
+            help='Number of recipients to send to over each connection, when not reusing connections '
+                 '(default: BULK_EMAIL_EMAILS_PER_TASK).',
+            type=int,
+        )
+        parser.add_argument(
+            '--template',
+            dest='template_name',
+            help='Name of the CourseEmailTemplate to render (default: the default template).',
+        )
+
+    def handle(self, *args, **options):
+        template = CourseEmailTemplate.get_template(name=options['template_name'])
+        recipients = _recipients(options['recipients'])
+        count = len(recipients)
+        batch_size = options['batch_size'] or settings.BULK_EMAIL_EMAILS_PER_TASK
+
+        server = CountingSMTPServer(('127.0.0.1', 0), None)
+        server_thread = threading.Thread(target=asyncore.loop, kwargs={'timeout': 0.1}, name='smtp-stand-in')
+        server_thread.daemon = True
+        server_thread.start()
+        port = server.socket.getsockname()[1]
+
+        rendered = []
+
+        def render_per_recipient():
+            """Renders the whole templates for each recipient."""
+            for recipient in recipients:
+                context = _recipient_context(recipient)
+                plaintext = template.render_plaintext(SAMPLE_TEXT_MESSAGE, context)
+                html = template.render_htmltext(SAMPLE_HTML_MESSAGE, dict(context))
+                rendered.append((recipient['email'], plaintext, html))
+
+        def render_compiled():
+            """Renders the templates once, then fills in each recipient's values."""
+            plaintext_template = template.compile_plaintext(SAMPLE_TEXT_MESSAGE, SAMPLE_CONTEXT)
+            html_template = template.compile_htmltext(SAMPLE_HTML_MESSAGE, SAMPLE_CONTEXT)
+            for recipient in recipients:
+                context = _recipient_context(recipient)
+                plaintext_template.render(context)
+                html_template.render(context)
+
+        def send(batch_size):
+            """Sends the rendered messages, connecting again for each batch of batch_size."""
+            for start in range(0, count, batch_size):
+                connection = EmailBackend(host='127.0.0.1', port=port, username='', password='', use_tls=False)
+                connection.open()
+                for email, plaintext, html in rendered[start:start + batch_size]:
+                    message = EmailMultiAlternatives(
+                        SAMPLE_SUBJECT, plaintext, 'benchmark@example.com', [email], connection=connection
+                    )
+                    message.attach_alternative(html, 'text/html')
+                    connection.send_messages([message])
+                connection.close()
+
+        results = {
+            'recipients': count,
+            'render_per_recipient': _timed(render_per_recipient, count),
+            'render_compiled': _timed(render_compiled, count),
+            'send_connection_per_batch': _timed(lambda: send(batch_size), count),
+            'send_reused_connection': _timed(lambda: send(count), count),
+        }
+        server.close()
+        results['messages_received'] = server.received
+
+        self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
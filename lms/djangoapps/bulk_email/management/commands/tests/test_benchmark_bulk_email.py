@@ -0,0 +1,32 @@
+"""
+Tests for the benchmark_bulk_email management command.
+"""
+import json
+from StringIO import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from nose.plugins.attrib import attr
+
+
+@attr(shard=1)
+class BenchmarkBulkEmailTest(TestCase):
+    """
+    Test the benchmark_bulk_email management command.
+    """
+    def setUp(self):
+        super(BenchmarkBulkEmailTest, self).setUp()
+        # load initial content (since we don't run migrations as part of tests):
+        call_command("loaddata", "course_email_template.json")
+
+    def test_benchmark(self):
+        output = StringIO()
+        call_command('benchmark_bulk_email', '--recipients', '5', '--batch_size', '2', stdout=output)
+        results = json.loads(output.getvalue())
+
+        self.assertEqual(results['recipients'], 5)
+        timings = ('render_per_recipient', 'render_compiled', 'send_connection_per_batch', 'send_reused_connection')
+        for timing in timings:
+            self.assertIn('ms_per_message', results[timing])
+        # Both ways of sending deliver every message.
+        self.assertEqual(results['messages_received'], 10)
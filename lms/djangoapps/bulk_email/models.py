@@ -298,6 +298,24 @@ class CourseEmail(Email):
         """
         return CourseEmailTemplate.get_template(name=self.template_name)
 
+    def get_recipient_ids(self, user_id=None):
+        """
+        Returns the ids of the users this email is sent to, in ascending order.
+
+        The ids of the users of each target are combined without duplicates,
+        and the users who opted out of email from the course are left out.
+        `user_id` is the id of the user who sent the email, for the
+        SEND_TO_MYSELF target.
+        """
+        recipient_ids = set()
+        for target in self.targets.all():
+            recipient_ids.update(target.get_users(self.course_id, user_id).values_list('id', flat=True))
+        optout_ids = use_read_replica_if_available(
+            Optout.objects.filter(course_id=self.course_id)
+        ).values_list('user_id', flat=True)
+        recipient_ids.difference_update(optout_ids)
+        return sorted(recipient_ids)
+
 
 class Optout(models.Model):
     """
@@ -318,6 +336,9 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# The keys of the email context whose values differ for each recipient.
+RECIPIENT_CONTEXT_KEYS = ('name', 'email', 'user_id')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -403,6 +424,100 @@ class CourseEmailTemplate(models.Model):
                 context[key] = markupsafe.escape(value)
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Create a plain text message to render for each recipient of an email.
+
+        Returns a CompiledEmailMessage of the plain text body (`plaintext`)
+        in the stored plain template, filled in with the values of the
+        provided `context` dict that are the same for every recipient.
+        """
+        return CompiledEmailMessage(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Create an HTML message to render for each recipient of an email.
+
+        Returns a CompiledEmailMessage of the HTML body (`htmltext`) in the
+        stored HTML template, filled in with the values of the provided
+        `context` dict that are the same for every recipient.
+        """
+        return CompiledEmailMessage(self.html_template, htmltext, context, escape=True)
+
+
+class CompiledEmailMessage(object):
+    """
+    A course email message whose template is rendered once for all of its
+    recipients.
+
+    The template is formatted when the message is created, with the values
+    of the context that are the same for every recipient and with markers
+    in place of the RECIPIENT_CONTEXT_KEYS.  Rendering the message for a
+    recipient only replaces the markers and the keywords of the message body
+    (see CourseEmailTemplate._render), and produces the same output as
+    rendering the whole template with the recipient's context.
+    """
+    def __init__(self, format_string, message_body, context, escape=False):
+        """
+        Format the template `format_string` with `context`, which must hold
+        every value the template uses other than the RECIPIENT_CONTEXT_KEYS.
+        If `escape` is True, string values of the context are HTML-escaped.
+        """
+        self.escape = escape
+        self.context = {
+            key: value for key, value in context.iteritems()
+            if key not in RECIPIENT_CONTEXT_KEYS
+        }
+        if escape:
+            self.context = self._escape(self.context)
+        self.markers = {key: u'\x00{}\x00'.format(key) for key in RECIPIENT_CONTEXT_KEYS}
+
+        result = format_string.format(**dict(self.context, **self.markers))
+        self.head, self.body_tag, self.tail = result.partition(COURSE_EMAIL_MESSAGE_BODY_TAG.format())
+        self.message_body = message_body
+        # The long lines of the message, which are the same for most
+        # recipients, wrapped.
+        self.wrapped_lines = {}
+
+    @staticmethod
+    def _escape(context):
+        """
+        Returns a copy of `context` with its string values HTML-escaped.
+        """
+        return {
+            key: markupsafe.escape(value) if isinstance(value, basestring) else value
+            for key, value in context.iteritems()
+        }
+
+    def _fill_in(self, text, recipient_context):
+        """
+        Replace the markers in `text` with the values of the recipient.
+        """
+        for key, marker in self.markers.iteritems():
+            if marker in text:
+                text = text.replace(marker, u'{}'.format(recipient_context.get(key)))
+        return text
+
+    def render(self, recipient_context):
+        """
+        Returns the message for the recipient whose values of the
+        RECIPIENT_CONTEXT_KEYS are in the `recipient_context` dict.
+        """
+        recipient_context = {key: recipient_context.get(key) for key in RECIPIENT_CONTEXT_KEYS}
+        if self.escape:
+            recipient_context = self._escape(recipient_context)
+        context = dict(self.context, **recipient_context)
+
+        result = self._fill_in(self.head, recipient_context)
+        if self.body_tag:
+            message_body = self.message_body
+            # Substitute all %%-encoded keywords in the message body
+            if context.get('user_id') is not None and 'course_id' in context:
+                message_body = substitute_keywords_with_data(message_body, context)
+            result += message_body + self._fill_in(self.tail, recipient_context)
+
+        return wrap_message(result, cache=self.wrapped_lines)
+
 
 class CourseAuthorization(models.Model):
     """
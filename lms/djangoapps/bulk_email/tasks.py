@@ -6,8 +6,10 @@ to a course.
 from collections import Counter
 import json
 import logging
+import os
 import random
 import re
+import socket
 from time import sleep
 
 import dogstats_wrapper as dog_stats_api
@@ -47,10 +49,14 @@ from lms.djangoapps.instructor_task.subtasks import (
     update_subtask_status,
 )
 from util.date_utils import get_default_time_display
+from util.query import use_read_replica_if_available
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 
 log = logging.getLogger('edx.celery.task')
 
+# Number of recipient ids to fetch the names and email addresses of in each
+# query, when queueing the subtasks of an email.
+RECIPIENT_QUERY_CHUNK_SIZE = 1000
 
 # Errors that an individual email is failing to be sent, and should just
 # be treated as a fail.
@@ -169,23 +175,25 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     course = get_course(course_id)
 
     # Get arguments that will be passed to every subtask.
-    targets = email_obj.targets.all()
     global_email_context = _get_course_email_context(course)
 
+    # Compute the recipients once for the whole email, rather than combining
+    # the querysets of the targets into one query.  Each subtask is handed a
+    # contiguous range of the sorted ids, so the same recipients always end up
+    # in the same subtask.
+    recipient_ids = email_obj.get_recipient_ids(user_id)
     recipient_qsets = [
-        target.get_users(course_id, user_id)
-        for target in targets
+        use_read_replica_if_available(
+            User.objects.filter(id__in=recipient_ids[start:start + RECIPIENT_QUERY_CHUNK_SIZE]).order_by('id')
+        )
+        for start in range(0, len(recipient_ids), RECIPIENT_QUERY_CHUNK_SIZE)
     ]
-    combined_set = User.objects.none()
-    for qset in recipient_qsets:
-        combined_set |= qset
-    combined_set = combined_set.distinct()
     recipient_fields = ['profile__name', 'email']
 
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s",
              task_id, course_id, email_id)
 
-    total_recipients = combined_set.count()
+    total_recipients = len(recipient_ids)
 
     routing_key = settings.BULK_EMAIL_ROUTING_KEY
     # if there are few enough emails, send them through a different queue
@@ -220,7 +228,7 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         entry,
         action_name,
         _create_send_email_subtask,
-        [combined_set],
+        recipient_qsets,
         recipient_fields,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
         total_recipients,
@@ -408,6 +416,112 @@ def _get_source_address(course_id, course_title, truncate=True):
     return from_addr
 
 
+class SendRateLimiter(object):
+    """
+    Adapts the delay between the emails that a worker sends to the rate at
+    which the email service accepts them.
+
+    Each time sending is throttled, the delay doubles, starting from
+    settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS, up to
+    settings.BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS.  Each email that is sent
+    successfully shrinks it by SEND_DELAY_DECAY, until it is small enough to
+    be dropped.
+    """
+    SEND_DELAY_DECAY = 0.9
+
+    def __init__(self):
+        self.delay = 0
+
+    def throttled(self):
+        """
+        Increase the delay after sending was throttled.
+        """
+        self.delay = min(
+            max(self.delay * 2, settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS),
+            settings.BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS
+        )
+
+    def retrying(self):
+        """
+        Use at least the initial delay for a task that was retried because
+        sending was throttled, possibly on another worker.
+        """
+        self.delay = max(self.delay, settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+
+    def sent(self):
+        """
+        Decrease the delay after an email was sent.
+        """
+        self.delay *= self.SEND_DELAY_DECAY
+        if self.delay < settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS / 10:
+            self.delay = 0
+
+    def wait(self):
+        """
+        Sleep for the current delay before sending an email.
+        """
+        if self.delay:
+            sleep(self.delay)
+
+
+# The send rate of this worker, shared by the tasks that it runs.
+_SEND_RATE_LIMITER = SendRateLimiter()
+
+# The connection to the email backend that this worker's last task left
+# open, keyed by process id, when settings.BULK_EMAIL_REUSE_CONNECTION is set.
+_OPEN_CONNECTIONS = {}
+
+
+def _is_usable_connection(connection):
+    """
+    Returns whether the server still accepts commands over the connection.
+    """
+    if not hasattr(connection, 'connection'):
+        # Backends that don't hold a connection to a server are always usable.
+        return True
+    if connection.connection is None:
+        return False
+    noop = getattr(connection.connection, 'noop', None)
+    if noop is None:
+        return True
+    try:
+        return noop()[0] == 250
+    except (SMTPException, socket.error):
+        return False
+
+
+def _open_connection():
+    """
+    Returns an open connection to the email backend.
+
+    When settings.BULK_EMAIL_REUSE_CONNECTION is set, the connection left
+    open by the last task of this worker is reused, as long as the server
+    still accepts commands over it, rather than connecting again.
+    """
+    connection = _OPEN_CONNECTIONS.pop(os.getpid(), None)
+    if connection is not None:
+        if _is_usable_connection(connection):
+            return connection
+        connection.close()
+
+    connection = get_connection()
+    connection.open()
+    return connection
+
+
+def _release_connection(connection, reusable):
+    """
+    Keeps the connection open for the next task of this worker if it is
+    `reusable` and settings.BULK_EMAIL_REUSE_CONNECTION is set, or closes it.
+    """
+    if connection is None:
+        return
+    if reusable and settings.BULK_EMAIL_REUSE_CONNECTION:
+        _OPEN_CONNECTIONS[os.getpid()] = connection
+    else:
+        connection.close()
+
+
 def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
     """
     Performs the email sending task.
@@ -465,6 +579,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         raise
 
     # Exclude optouts (if not a retry):
+    # The users who had opted out when the email was queued are not in the
+    # to_list, so this only skips those who have opted out since then.
     # Note that we don't have to do the optout logic at all if this is a retry,
     # because we have presumably already performed the optout logic on the first
     # attempt.  Anyone on the to_list on a retry has already passed the filter
@@ -482,13 +598,25 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+
+    # If this task was retried because sending was throttled, throttle sending
+    # from the start.
+    if subtask_status.retried_nomax > 0:
+        _SEND_RATE_LIMITER.retrying()
+
+    connection = None
     try:
-        connection = get_connection()
-        connection.open()
+        connection = _open_connection()
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        email_context['course_id'] = course_email.course_id
+
+        # Render the templates once, so that only the values that differ for
+        # each recipient are filled in for each message.
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
@@ -502,11 +630,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             email_context['email'] = email
             email_context['name'] = current_recipient['profile__name']
             email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
 
             # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+            plaintext_msg = plaintext_template.render(email_context)
+            html_msg = html_template.render(email_context)
 
             # Create email:
             email_msg = EmailMultiAlternatives(
@@ -518,13 +645,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             )
             email_msg.attach_alternative(html_msg, 'text/html')
 
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+            # Throttle if we have gotten the rate limiter.  The delay between emails
+            # grows each time sending is throttled and shrinks as emails are sent,
+            # so that it settles near the rate that the email service accepts.
+            _SEND_RATE_LIMITER.wait()
 
             try:
                 log.info(
@@ -591,6 +715,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                 subtask_status.increment(failed=1)
 
             else:
+                _SEND_RATE_LIMITER.sent()
                 total_recipients_successful += 1
                 log.info(
                     "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
@@ -640,6 +765,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     except INFINITE_RETRY_ERRORS as exc:
         dog_stats_api.increment('course_email.infinite_retry', tags=[_statsd_tag(course_title)])
+        _SEND_RATE_LIMITER.throttled()
         # Increment the "retried_nomax" counter, update other counters with progress to date,
         # and set the state to RETRY:
         subtask_status.increment(retried_nomax=1, state=RETRY)
@@ -693,8 +819,9 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         # Successful completion is marked by an exception value of None.
         return subtask_status, None
     finally:
-        # Clean up at the end.
-        connection.close()
+        # Clean up at the end.  Unless sending failed, the connection can be
+        # reused by the next task.
+        _release_connection(connection, reusable=subtask_status.state == SUCCESS)
 
 
 def _get_current_task():
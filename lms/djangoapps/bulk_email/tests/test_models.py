@@ -4,14 +4,18 @@ Unit tests for bulk-email-related models.
 from django.test import TestCase
 from django.core.management import call_command
 
-from student.tests.factories import UserFactory
+from student.roles import CourseStaffRole
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
 
 from mock import patch, Mock
 from nose.plugins.attrib import attr
 
 from bulk_email.models import (
     CourseEmail,
+    Optout,
     SEND_TO_COHORT,
+    SEND_TO_LEARNERS,
+    SEND_TO_MYSELF,
     SEND_TO_TRACK,
     SEND_TO_STAFF,
     CourseEmailTemplate,
@@ -99,6 +103,22 @@ class CourseEmailTest(TestCase):
         self.assertEqual(target.short_display(), 'cohort-test cohort')
         self.assertEqual(target.long_display(), 'Cohort: test cohort')
 
+    def test_get_recipient_ids(self):
+        course_id = CourseKey.from_string('abc/123/doremi')
+        sender = UserFactory.create()
+        staff = UserFactory.create()
+        CourseStaffRole(course_id).add_users(sender, staff)
+        learners = [CourseEnrollmentFactory.create(course_id=course_id).user for _ in range(3)]
+        Optout.objects.create(user=learners[1], course_id=course_id)
+        email = CourseEmail.create(
+            course_id, sender, [SEND_TO_MYSELF, SEND_TO_STAFF, SEND_TO_LEARNERS], "dummy subject", "dummy message"
+        )
+        # The sender is both themselves and staff, but is only sent the email once.
+        self.assertEqual(
+            email.get_recipient_ids(sender.id),
+            sorted([sender.id, staff.id, learners[0].id, learners[2].id])
+        )
+
 
 @attr(shard=1)
 class NoCourseEmailTemplateTest(TestCase):
@@ -207,6 +227,24 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_compiled_render_matches_render(self):
+        text = "Dear %%USER_FULLNAME%% (%%USER_ID%%), thanks for enrolling in %%COURSE_DISPLAY_NAME%%. " * 20
+        for template_name in (None, "branded.template"):
+            template = CourseEmailTemplate.get_template(name=template_name)
+            context = self._add_xss_fields(self._get_sample_html_context())
+            plaintext_template = template.compile_plaintext(text, context)
+            html_template = template.compile_htmltext(text, context)
+            for user_id, name in ((1, u"Jos\xe9 <b>"), (2, "A & B")):
+                recipient_context = dict(context, user_id=user_id, name=name, email="user{}@test.com".format(user_id))
+                self.assertEqual(
+                    plaintext_template.render(recipient_context),
+                    template.render_plaintext(text, dict(recipient_context))
+                )
+                self.assertEqual(
+                    html_template.render(recipient_context),
+                    template.render_htmltext(text, dict(recipient_context))
+                )
+
 
 @attr(shard=1)
 class CourseAuthorizationTest(TestCase):
@@ -29,11 +29,13 @@ from celery.states import SUCCESS, FAILURE  # pylint: disable=no-name-in-module,
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
 from bulk_email.models import CourseEmail, Optout, SEND_TO_MYSELF, SEND_TO_STAFF, SEND_TO_LEARNERS
-from bulk_email.tasks import _get_course_email_context
+from bulk_email.tasks import _get_course_email_context, SendRateLimiter
 
 from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
 from lms.djangoapps.instructor_task.subtasks import update_subtask_status, SubtaskStatus
@@ -217,6 +219,34 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertEquals(parent_status.get('succeeded'), num_emails)
         self.assertEquals(parent_status.get('failed'), 0)
 
+    @override_settings(BULK_EMAIL_REUSE_CONNECTION=True)
+    @patch.dict('bulk_email.tasks._OPEN_CONNECTIONS', clear=True)
+    def test_connection_reused(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            get_conn.return_value.connection.noop.return_value = (250, 'OK')
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        # The second task sends its emails over the connection the first one opened.
+        self.assertEquals(get_conn.call_count, 1)
+        self.assertEquals(get_conn.return_value.open.call_count, 1)
+        self.assertFalse(get_conn.return_value.close.called)
+
+    @override_settings(BULK_EMAIL_REUSE_CONNECTION=True)
+    @patch.dict('bulk_email.tasks._OPEN_CONNECTIONS', clear=True)
+    def test_closed_connection_not_reused(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            get_conn.return_value.connection.noop.side_effect = SMTPServerDisconnected()
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        self.assertEquals(get_conn.call_count, 2)
+        self.assertEquals(get_conn.return_value.close.call_count, 1)
+
     def test_unactivated_user(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -230,22 +260,44 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails - 1, num_emails - 1)
 
-    def test_skipped(self):
+    def test_optouts_not_recipients(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
         # We also send email to the instructor:
         students = self._create_students(num_emails - 1)
         # have every fourth student optout:
-        expected_skipped = int((num_emails + 3) / 4.0)
-        expected_succeeds = num_emails - expected_skipped
+        num_optouts = int((num_emails + 3) / 4.0)
+        expected_succeeds = num_emails - num_optouts
         for index in range(0, num_emails, 4):
             Optout.objects.create(user=students[index], course_id=self.course.id)
-        # mark some students as opting out
+        # students who opted out are left out of the recipients altogether
         with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
             get_conn.return_value.send_messages.side_effect = cycle([None])
-            self._test_run_with_task(
-                send_bulk_course_email, 'emailed', num_emails, expected_succeeds, skipped=expected_skipped
-            )
+            self._test_run_with_task(send_bulk_course_email, 'emailed', expected_succeeds, expected_succeeds)
+
+    def test_skipped(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        # have every fourth student optout, after the recipients were computed:
+        expected_skipped = int((num_emails + 3) / 4.0)
+        expected_succeeds = num_emails - expected_skipped
+        get_recipient_ids = CourseEmail.get_recipient_ids
+
+        def get_recipient_ids_then_optout(course_email, user_id=None):
+            """Computes the recipients of the email, then has some of them opt out."""
+            recipient_ids = get_recipient_ids(course_email, user_id)
+            for index in range(0, num_emails, 4):
+                Optout.objects.create(user=students[index], course_id=self.course.id)
+            return recipient_ids
+
+        with patch.object(CourseEmail, 'get_recipient_ids', get_recipient_ids_then_optout):
+            with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+                get_conn.return_value.send_messages.side_effect = cycle([None])
+                self._test_run_with_task(
+                    send_bulk_course_email, 'emailed', num_emails, expected_succeeds, skipped=expected_skipped
+                )
 
     def _test_email_address_failures(self, exception):
         """Test that celery handles bad address errors by failing and not retrying."""
@@ -446,3 +498,46 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertIn('account_settings_url', result)
         self.assertIn('email_settings_url', result)
         self.assertIn('platform_name', result)
+
+
+@attr(shard=3)
+@override_settings(BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS=0.02, BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS=0.1)
+class TestSendRateLimiter(TestCase):
+    """Tests the adaptive delay between the emails that a worker sends."""
+
+    def test_throttled(self):
+        limiter = SendRateLimiter()
+        self.assertEquals(limiter.delay, 0)
+        limiter.throttled()
+        self.assertEquals(limiter.delay, 0.02)
+        limiter.throttled()
+        self.assertEquals(limiter.delay, 0.04)
+        for _ in range(5):
+            limiter.throttled()
+        self.assertEquals(limiter.delay, 0.1)
+
+    def test_retrying(self):
+        limiter = SendRateLimiter()
+        limiter.retrying()
+        self.assertEquals(limiter.delay, 0.02)
+        limiter.delay = 0.08
+        limiter.retrying()
+        self.assertEquals(limiter.delay, 0.08)
+
+    def test_sent(self):
+        limiter = SendRateLimiter()
+        limiter.throttled()
+        limiter.sent()
+        self.assertAlmostEqual(limiter.delay, 0.02 * SendRateLimiter.SEND_DELAY_DECAY)
+        for _ in range(30):
+            limiter.sent()
+        self.assertEquals(limiter.delay, 0)
+
+    @patch('bulk_email.tasks.sleep')
+    def test_wait(self, mock_sleep):
+        limiter = SendRateLimiter()
+        limiter.wait()
+        self.assertFalse(mock_sleep.called)
+        limiter.throttled()
+        limiter.wait()
+        mock_sleep.assert_called_once_with(0.02)
@@ -4,13 +4,18 @@ from django.conf import settings
 from django.conf.urls import patterns, url, include
 
 from lms.djangoapps.ccx.api.v0 import views
+from lms.djangoapps.ccx.overrides import invalidate_overrides_after_commit
 
 CCX_COURSE_ID_PATTERN = settings.COURSE_ID_PATTERN.replace('course_id', 'ccx_course_id')
 
 CCX_URLS = patterns(
     '',
-    url(r'^$', views.CCXListView.as_view(), name='list'),
-    url(r'^{}/?$'.format(CCX_COURSE_ID_PATTERN), views.CCXDetailView.as_view(), name='detail'),
+    url(r'^$', invalidate_overrides_after_commit(views.CCXListView.as_view()), name='list'),
+    url(
+        r'^{}/?$'.format(CCX_COURSE_ID_PATTERN),
+        invalidate_overrides_after_commit(views.CCXDetailView.as_view()),
+        name='detail'
+    ),
 )
 
 urlpatterns = patterns(
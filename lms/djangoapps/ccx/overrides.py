@@ -2,14 +2,19 @@
 API related to providing field overrides for individual students.  This is used
 by the individual custom courses feature.
 """
+import copy
 import json
 import logging
+import time
+from functools import wraps
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 import request_cache
 
-from courseware.field_overrides import FieldOverrideProvider
+from courseware.field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from ccx_keys.locator import CCXLocator, CCXBlockUsageLocator
 
@@ -18,6 +23,15 @@ from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+CCX_OVERRIDES_CACHE_KEY = u'ccx.overrides.{ccx_id}.{version}'
+CCX_OVERRIDES_VERSION_KEY = u'ccx.overrides.version.{ccx_id}'
+
+# Override maps recently loaded by this process, keyed by CCX id, as
+# (expiry time, overrides) pairs.  The maps hold plain values only, and are
+# never changed once cached: each request gets its own copy.
+_LOCAL_OVERRIDES_CACHE = {}
+MAX_LOCAL_OVERRIDES_CACHE_SIZE = 1000
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -122,37 +136,165 @@ def _get_overrides_for_ccx(ccx):
     """
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
+
+    The dictionary belongs to the current request, which may change it.
     """
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
+        overrides_cache[ccx] = _get_cached_overrides_for_ccx(ccx)
 
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+    return overrides_cache[ccx]
 
-        overrides_cache[ccx] = overrides
 
-    return overrides_cache[ccx]
+def _get_cached_overrides_for_ccx(ccx):
+    """
+    Returns the overrides of the CCX from the process-local cache, or the
+    Django cache, or failing both, from the database.
+
+    The overrides are cached under the current version of the CCX's
+    overrides, which is bumped whenever they change.
+    """
+    now = time.time()
+    expires, overrides = _LOCAL_OVERRIDES_CACHE.get(ccx.id, (0, None))
+    if overrides is not None and expires > now:
+        return copy.deepcopy(overrides)
+
+    version = _get_overrides_version(ccx.id)
+    cache_key = CCX_OVERRIDES_CACHE_KEY.format(ccx_id=ccx.id, version=version)
+    overrides = cache.get(cache_key)
+    if overrides is None:
+        overrides = _load_overrides_for_ccx(ccx)
+        # If the overrides changed while they were loaded, the old ones may
+        # have been loaded, so they aren't cached under the new version.
+        if _get_overrides_version(ccx.id) != version:
+            return overrides
+        cache.set(cache_key, overrides, settings.CCX_OVERRIDES_CACHE_TIMEOUT)
+
+    if settings.CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT:
+        # The cache is replaced rather than changed, as other threads may be
+        # reading it.
+        if len(_LOCAL_OVERRIDES_CACHE) >= MAX_LOCAL_OVERRIDES_CACHE_SIZE:
+            local_cache = {}
+        else:
+            local_cache = dict(_LOCAL_OVERRIDES_CACHE)
+        local_cache[ccx.id] = (now + settings.CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT, copy.deepcopy(overrides))
+        _set_local_overrides_cache(local_cache)
+    return overrides
+
+
+def _set_local_overrides_cache(local_cache):
+    """
+    Replaces the process-local cache of override maps.
+    """
+    global _LOCAL_OVERRIDES_CACHE  # pylint: disable=global-statement
+    _LOCAL_OVERRIDES_CACHE = local_cache
+
+
+def _load_overrides_for_ccx(ccx):
+    """
+    Loads the overrides of the CCX from the database, as a map of plain
+    values that can be cached.  The override instances are only kept by
+    the request that saves them.
+    """
+    overrides = {}
+    query = CcxFieldOverride.objects.filter(
+        ccx=ccx,
+    )
+
+    for override in query:
+        block_overrides = overrides.setdefault(override.location, {})
+        block_overrides[override.field] = json.loads(override.value)
+        block_overrides[override.field + "_id"] = override.id
+
+    return overrides
+
+
+def _get_overrides_version(ccx_id):
+    """
+    Returns the current version of the overrides of the CCX.
+    """
+    version_key = CCX_OVERRIDES_VERSION_KEY.format(ccx_id=ccx_id)
+    version = cache.get(version_key)
+    if version is None:
+        # Start from the current time rather than 0, so that override maps
+        # cached before the version was evicted can't be mistaken for current.
+        version = int(time.time() * 1000)
+        cache.add(version_key, version, None)
+        version = cache.get(version_key, version)
+    return version
+
+
+def _bump_overrides_version(ccx_id):
+    """
+    Invalidates the cached overrides of the CCX, in this process and in the
+    Django cache.
+
+    Until a change is committed, other processes can still load the old
+    overrides, and cache them under the new version.  So when this is called
+    inside a transaction, the CCX is remembered for the request, and
+    views that change overrides are decorated with
+    `invalidate_overrides_after_commit`, which invalidates them again once
+    the view's transaction has committed.
+    """
+    if ccx_id in _LOCAL_OVERRIDES_CACHE:
+        local_cache = dict(_LOCAL_OVERRIDES_CACHE)
+        local_cache.pop(ccx_id, None)
+        _set_local_overrides_cache(local_cache)
+    version_key = CCX_OVERRIDES_VERSION_KEY.format(ccx_id=ccx_id)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, int(time.time() * 1000), None)
+    if transaction.get_connection().in_atomic_block:
+        request_cache.get_cache('ccx-overrides-uncommitted')[ccx_id] = True
+
+
+def invalidate_overrides_after_commit(view):
+    """
+    View decorator that runs the view in its own transaction, instead of
+    the request's, and invalidates the cached overrides of the CCXs it
+    changed once the transaction has committed.
+    """
+    @transaction.non_atomic_requests
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        """
+        Runs the view, then invalidates the overrides it changed.
+        """
+        uncommitted = request_cache.get_cache('ccx-overrides-uncommitted')
+        try:
+            with transaction.atomic():
+                return view(*args, **kwargs)
+        finally:
+            # Run whether the view succeeded or not: a rolled back change
+            # may have been cached as well.
+            for ccx_id in uncommitted.keys():
+                _bump_overrides_version(ccx_id)
+            uncommitted.clear()
+    return wrapper
 
 
-@transaction.atomic
 def override_field_for_ccx(ccx, block, name, value):
     """
     Overrides a field for the `ccx`.  `block` and `name` specify the block
     and the name of the field on that block to override.  `value` is the
     value to set for the given field.
     """
+    if _override_field_for_ccx(ccx, block, name, value):
+        _bump_overrides_version(ccx.id)
+
+
+@transaction.atomic
+def _override_field_for_ccx(ccx, block, name, value):
+    """
+    Saves the override for override_field_for_ccx.  Returns True if the
+    override was created or changed.
+    """
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
-    override_has_changes = False
+    override_has_changes = created = False
     clean_ccx_key = _clean_ccx_key(block.location)
 
     override = get_override_for_ccx(ccx, block, name + "_instance")
@@ -177,6 +319,8 @@ def override_field_for_ccx(ccx, block, name, value):
 
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+    clear_resolved_overrides()
+    return created or override_has_changes
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -193,6 +337,8 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        clear_resolved_overrides()
+        _bump_overrides_version(ccx.id)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -220,3 +366,5 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        clear_resolved_overrides()
+        _bump_overrides_version(ccx.id)
@@ -21,7 +21,13 @@ from xmodule.modulestore.tests.django_utils import (
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx import overrides
+from lms.djangoapps.ccx.overrides import (
+    bulk_delete_ccx_override_fields,
+    clear_override_for_ccx,
+    get_override_for_ccx,
+    override_field_for_ccx,
+)
 
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
 
@@ -173,3 +179,138 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+    def test_override_lookups_per_request(self):
+        """
+        Test that the CCX overrides of each block are looked up once per
+        request, however many of its descendants inherit them.
+        """
+        ccx_due = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx_course.get_children()
+        for chapter in chapters:
+            override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
+        blocks = flatten([list(iter_blocks(chapter)) for chapter in chapters])
+
+        with mock.patch('ccx.overrides.get_override_for_ccx', wraps=get_override_for_ccx) as mock_get:
+            for block in blocks:
+                self.assertEqual(block.due, ccx_due)
+        self.assertLessEqual(mock_get.call_count, len(blocks))
+
+        # Loading the course again in the same request reuses the resolved overrides.
+        course = get_course_by_id(self.ccx_key, depth=None)
+        blocks = flatten([list(iter_blocks(chapter)) for chapter in course.get_children()])
+        with mock.patch('ccx.overrides.get_override_for_ccx', wraps=get_override_for_ccx) as mock_get:
+            for block in blocks:
+                self.assertEqual(block.due, ccx_due)
+        self.assertEqual(mock_get.call_count, 0)
+
+
+@attr(shard=1)
+class TestCachedOverrides(SharedModuleStoreTestCase):
+    """
+    Make sure CCX overrides are cached between requests, and that changing
+    them invalidates the cache.
+    """
+    ENABLED_CACHES = ['default']
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCachedOverrides, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        cls.chapter = ItemFactory.create(parent=cls.course)
+
+    def setUp(self):
+        super(TestCachedOverrides, self).setUp()
+        self.ccx = CustomCourseForEdX(
+            course_id=self.course.id,
+            display_name='Test CCX',
+            coach=AdminFactory.create())
+        self.ccx.save()
+        self.due = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, self.chapter, 'due', self.due)
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.addCleanup(overrides._set_local_overrides_cache, {})  # pylint: disable=protected-access
+
+    def get_due(self):
+        """
+        Returns the overridden due date of the chapter, as seen by a new request.
+        """
+        RequestCache.clear_request_cache()
+        return get_override_for_ccx(self.ccx, self.chapter, 'due')
+
+    def test_cached_between_requests(self):
+        self.assertEqual(self.get_due(), self.due)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_due(), self.due)
+
+    def test_override_invalidates_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        new_due = datetime.datetime(2016, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, self.chapter, 'due', new_due)
+        self.assertEqual(self.get_due(), new_due)
+
+    def test_clear_override_invalidates_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        clear_override_for_ccx(self.ccx, self.chapter, 'due')
+        self.assertIsNone(self.get_due())
+
+    def test_bulk_delete_invalidates_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        override_id = get_override_for_ccx(self.ccx, self.chapter, 'due_id')
+        bulk_delete_ccx_override_fields(self.ccx, [override_id])
+        self.assertIsNone(self.get_due())
+
+    @override_settings(CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT=60)
+    def test_local_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        with mock.patch.object(overrides, 'cache') as mock_cache:
+            self.assertEqual(self.get_due(), self.due)
+        self.assertFalse(mock_cache.get.called)
+
+        # Changes made by this process are seen straight away.
+        clear_override_for_ccx(self.ccx, self.chapter, 'due')
+        self.assertIsNone(self.get_due())
+
+    @override_settings(CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT=60)
+    def test_local_cache_not_shared_with_requests(self):
+        self.assertEqual(self.get_due(), self.due)
+        with mock.patch.object(overrides, 'cache') as mock_cache:
+            # Changing the overrides of a request doesn't change the cached ones.
+            RequestCache.clear_request_cache()
+            overrides._get_overrides_for_ccx(self.ccx).clear()  # pylint: disable=protected-access
+            self.assertEqual(self.get_due(), self.due)
+        self.assertFalse(mock_cache.get.called)
+
+        # Only plain values are cached.
+        __, cached_overrides = overrides._LOCAL_OVERRIDES_CACHE[self.ccx.id]  # pylint: disable=protected-access
+        self.assertFalse(any(
+            name.endswith('_instance') for block_overrides in cached_overrides.values() for name in block_overrides
+        ))
+
+    def test_changed_while_loading_not_cached(self):
+        def load_during_change(ccx):
+            """Loads the overrides while they are being changed."""
+            loaded = load_overrides(ccx)
+            overrides._bump_overrides_version(ccx.id)  # pylint: disable=protected-access
+            return dict(loaded, stale=True)
+
+        load_overrides = overrides._load_overrides_for_ccx  # pylint: disable=protected-access
+        with mock.patch.object(overrides, '_load_overrides_for_ccx', side_effect=load_during_change):
+            self.get_due()
+        RequestCache.clear_request_cache()
+        self.assertNotIn('stale', overrides._get_overrides_for_ccx(self.ccx))  # pylint: disable=protected-access
+
+    def test_invalidate_overrides_after_commit(self):
+        new_due = datetime.datetime(2016, 1, 1, 00, 00, tzinfo=pytz.UTC)
+
+        @overrides.invalidate_overrides_after_commit
+        def view():
+            """Changes an override."""
+            override_field_for_ccx(self.ccx, self.chapter, 'due', new_due)
+
+        bump_version = overrides._bump_overrides_version  # pylint: disable=protected-access
+        with mock.patch.object(overrides, '_bump_overrides_version', wraps=bump_version) as mock_bump:
+            view()
+        # Once when the override changed, and again once it was committed.
+        self.assertEqual(mock_bump.call_args_list, [mock.call(self.ccx.id), mock.call(self.ccx.id)])
+        self.assertEqual(self.get_due(), new_due)
@@ -53,6 +53,7 @@ from lms.djangoapps.ccx.overrides import (
     override_field_for_ccx,
     clear_ccx_field_info_from_ccx_map,
     bulk_delete_ccx_override_fields,
+    invalidate_overrides_after_commit,
 )
 from lms.djangoapps.ccx.utils import (
     add_master_course_staff_to_ccx,
@@ -173,6 +174,7 @@ def dashboard(request, course, ccx=None):
     return render_to_response('ccx/coach_dashboard.html', context)
 
 
+@invalidate_overrides_after_commit
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
@@ -254,6 +256,7 @@ def create_ccx(request, course, ccx=None):
     return redirect(url)
 
 
+@invalidate_overrides_after_commit
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
@@ -358,6 +361,7 @@ def save_ccx(request, course, ccx=None):
     )
 
 
+@invalidate_overrides_after_commit
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
@@ -174,8 +174,51 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+def has_access_many(user, action, blocks, course_key):
+    """
+    Check whether a user has the access to do action on each of `blocks`,
+    all of which belong to the course run `course_key`.
+
+    This gives the same answers as calling has_access on each block in turn,
+    but the user's course roles, partition groups and content milestones are
+    looked up once for the whole list rather than once per block.
+
+    Returns a list of AccessResponse objects, in the same order as `blocks`.
+    """
+    if not user:
+        user = AnonymousUser()
+
+    if in_preview_mode():
+        if not bool(has_staff_access_to_preview_mode(user=user, obj=None, course_key=course_key)):
+            return [ACCESS_DENIED] * len(blocks)
+
+    access_cache = {}
+    responses = []
+    for block in blocks:
+        descriptor = block.descriptor if isinstance(block, XModule) else block
+        if isinstance(descriptor, (CourseDescriptor, ErrorDescriptor)) or not isinstance(descriptor, XBlock):
+            responses.append(has_access(user, action, block, course_key))
+        else:
+            responses.append(_has_access_descriptor(user, action, descriptor, course_key, access_cache))
+    return responses
+
+
 # ================ Implementation helpers ================================
 
+def _cached_access(access_cache, key, compute):
+    """
+    Returns `compute()`, memoized in `access_cache` under `key` if a cache is given.
+
+    The cache is shared by the blocks checked in one has_access_many call,
+    so it must only hold values that don't depend on the block.
+    """
+    if access_cache is None:
+        return compute()
+    if key not in access_cache:
+        access_cache[key] = compute()
+    return access_cache[key]
+
+
 def has_staff_access_to_preview_mode(user, obj, course_key=None):
     """
     Returns whether user has staff access to specified modules or not.
@@ -461,10 +504,12 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_group_access(descriptor, user, course_key):
+def _has_group_access(descriptor, user, course_key, access_cache=None):
     """
     This function returns a boolean indicating whether or not `user` has
     sufficient group memberships to "load" a block (the `descriptor`)
+
+    `access_cache` optionally memoizes the user's role and groups across blocks.
     """
     if len(descriptor.user_partitions) == len(get_split_user_partitions(descriptor.user_partitions)):
         # Short-circuit the process, since there are no defined user partitions that are not
@@ -473,7 +518,7 @@ def _has_group_access(descriptor, user, course_key):
         return ACCESS_GRANTED
 
     # Allow staff and instructors roles group access, as they are not masquerading as a student.
-    if get_user_role(user, course_key) in ['staff', 'instructor']:
+    if _cached_access(access_cache, 'user_role', lambda: get_user_role(user, course_key)) in ['staff', 'instructor']:
         return ACCESS_GRANTED
 
     # use merged_group_access which takes group access on the block's
@@ -523,10 +568,14 @@ def _has_group_access(descriptor, user, course_key):
     # look up the user's group for each partition
     user_groups = {}
     for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
+        user_groups[partition.id] = _cached_access(
+            access_cache,
+            ('partition_group', partition.id),
+            lambda partition=partition: partition.scheme.get_group_for_user(
+                course_key,
+                user,
+                partition,
+            )
         )
 
     # finally: check that the user has a satisfactory group assignment
@@ -538,7 +587,7 @@ def _has_group_access(descriptor, user, course_key):
     return ACCESS_GRANTED
 
 
-def _has_access_descriptor(user, action, descriptor, course_key=None):
+def _has_access_descriptor(user, action, descriptor, course_key=None, access_cache=None):
     """
     Check if user has access to this descriptor.
 
@@ -546,10 +595,23 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     'load' -- load this descriptor, showing it to the user.
     'staff' -- staff access to descriptor.
 
+    `access_cache` is only passed by has_access_many, along with a course_key,
+    to share the user's roles, groups and milestones between descriptors.
+
     NOTE: This is the fallback logic for descriptors that don't have custom policy
     (e.g. courses).  If you call this method directly instead of going through
     has_access(), it will not do the right thing.
     """
+    def has_staff_access():
+        return _cached_access(
+            access_cache, 'staff', lambda: _has_staff_access_to_descriptor(user, descriptor, course_key)
+        )
+
+    def has_instructor_access():
+        return _cached_access(
+            access_cache, 'instructor', lambda: _has_instructor_access_to_descriptor(user, descriptor, course_key)
+        )
+
     def can_load():
         """
         NOTE: This does not check that the student is enrolled in the course
@@ -561,16 +623,16 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
         # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
         # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
         # for staff users in preview mode.
-        if not _has_group_access(descriptor, user, course_key):
+        if not _has_group_access(descriptor, user, course_key, access_cache):
             return ACCESS_DENIED
 
         # If the user has staff access, they can load the module and checks below are not needed.
-        if _has_staff_access_to_descriptor(user, descriptor, course_key):
+        if has_staff_access():
             return ACCESS_GRANTED
 
         return (
             _visible_to_nonstaff_users(descriptor) and
-            _can_access_descriptor_with_milestones(user, descriptor, course_key) and
+            _can_access_descriptor_with_milestones(user, descriptor, course_key, access_cache) and
             (
                 _has_detached_class_tag(descriptor) or
                 _can_access_descriptor_with_start_date(user, descriptor, course_key)
@@ -579,8 +641,8 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
 
     checkers = {
         'load': can_load,
-        'staff': lambda: _has_staff_access_to_descriptor(user, descriptor, course_key),
-        'instructor': lambda: _has_instructor_access_to_descriptor(user, descriptor, course_key)
+        'staff': has_staff_access,
+        'instructor': has_instructor_access,
     }
 
     return _dispatch(checkers, action, user, descriptor)
@@ -801,7 +863,7 @@ def _visible_to_nonstaff_users(descriptor):
     return VisibilityError() if descriptor.visible_to_staff_only else ACCESS_GRANTED
 
 
-def _can_access_descriptor_with_milestones(user, descriptor, course_key):
+def _can_access_descriptor_with_milestones(user, descriptor, course_key, access_cache=None):
     """
     Returns if the object is blocked by an unfulfilled milestone.
 
@@ -809,8 +871,21 @@ def _can_access_descriptor_with_milestones(user, descriptor, course_key):
         user: the user trying to access this content
         descriptor: the object being accessed
         course_key: key for the course for this descriptor
+        access_cache: optionally memoizes the user's milestones across descriptors
     """
-    if milestones_helpers.get_course_content_milestones(course_key, unicode(descriptor.location), 'requires', user.id):
+    if access_cache is not None and user.id is not None:
+        blocked_content_ids = _cached_access(
+            access_cache,
+            'blocked_content_ids',
+            lambda: milestones_helpers.get_course_content_ids_with_milestones(course_key, 'requires', user.id)
+        )
+        is_blocked = unicode(descriptor.location) in blocked_content_ids
+    else:
+        is_blocked = bool(milestones_helpers.get_course_content_milestones(
+            course_key, unicode(descriptor.location), 'requires', user.id
+        ))
+
+    if is_blocked:
         debug("Deny: user has not completed all milestones for content")
         return ACCESS_DENIED
     else:
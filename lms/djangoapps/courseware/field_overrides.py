@@ -28,6 +28,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+RESOLVED_OVERRIDES_CACHE = u'courseware.field_overrides.resolved'
 
 
 def resolve_dotted(name):
@@ -90,6 +91,16 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def clear_resolved_overrides():
+    """
+    Forgets the field overrides looked up so far in the current request.
+
+    Code that changes overrides must call this, so that later lookups in the
+    same request see the new values.
+    """
+    RequestCache.get_request_cache(RESOLVED_OVERRIDES_CACHE).clear()
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -143,6 +154,13 @@ class OverrideFieldData(FieldData):
     is important for this setting.  Override providers will tried in the order
     configured in the setting.  The first provider to find an override 'wins'
     for a particular field lookup.
+
+    The overrides found for each block and field, and the overrides each block
+    inherits from its ancestors, are kept in a table in the request cache which
+    is shared by all instances for the same user and providers.  That way each
+    provider is asked about a given field of a given block only once per
+    request, and each block's lineage is walked only once per inheritable
+    field.  See `clear_resolved_overrides`.
     """
     provider_classes = None
 
@@ -198,18 +216,78 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        self.resolved_overrides_key = (type(self), getattr(user, 'id', None), tuple(providers))
+
+    def _resolved_overrides(self):
+        """
+        Returns the tables of overrides resolved so far in this request for this
+        user and these providers: a dict mapping (location, field name) to the
+        override set on that block, and one mapping it to the override the
+        block inherits from its ancestors.  Either may be `NOTSET`.
+        """
+        cache = RequestCache.get_request_cache(RESOLVED_OVERRIDES_CACHE)
+        tables = cache.get(self.resolved_overrides_key)
+        if tables is None:
+            tables = cache[self.resolved_overrides_key] = ({}, {})
+        return tables
+
+    def _get_provider_override(self, block, name):
+        """
+        Asks each provider in turn for an override of the field `name` in `block`.
+        Returns the first override found, or `NOTSET`.
+        """
+        for provider in self.providers:
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
+        return NOTSET
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
+        if overrides_disabled():
+            return NOTSET
+
+        location = getattr(block, 'location', None)
+        if location is None:
+            return self._get_provider_override(block, name)
+
+        overrides = self._resolved_overrides()[0]
+        key = (location, name)
+        if key not in overrides:
+            overrides[key] = self._get_provider_override(block, name)
+        return overrides[key]
+
+    def get_inherited_override(self, block, name):
+        """
+        Returns the override for the field `name` set on the closest ancestor
+        of `block` that has one, or `NOTSET` if no ancestor has one.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        location = getattr(block, 'location', None)
+        if location is None:
+            for ancestor in _lineage(block):
+                value = self.get_override(ancestor, name)
                 if value is not NOTSET:
                     return value
-        return NOTSET
+            return NOTSET
+
+        inherited = self._resolved_overrides()[1]
+        key = (location, name)
+        if key not in inherited:
+            parent = block.get_parent()
+            if parent is None:
+                value = NOTSET
+            else:
+                value = self.get_override(parent, name)
+                if value is NOTSET:
+                    value = self.get_inherited_override(parent, name)
+            inherited[key] = value
+        return inherited[key]
 
     def get(self, block, name):
         value = self.get_override(block, name)
@@ -232,11 +310,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in InheritanceMixin.fields:
+                if self.get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -247,12 +323,10 @@ class OverrideFieldData(FieldData):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
         if self.providers and not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+            if name in InheritanceMixin.fields:
+                value = self.get_inherited_override(block, name)
+                if value is not NOTSET:
+                    return value
         return self.fallback.default(block, name)
 
 
@@ -0,0 +1,123 @@
+"""
+Command to benchmark reading the fields of a course's blocks through its field override providers.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+from timeit import default_timer
+
+from django.contrib.auth.models import User
+from django.core.management import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from xblock.fields import Scope
+
+from courseware.field_overrides import OverrideFieldData, clear_resolved_overrides
+from request_cache.middleware import RequestCache
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_field_overrides ccx-v1:edX+DemoX+Demo_Course+ccx@1 staff --settings=devstack
+
+    Reads every settings field of every block of the course, as the given user
+    would see it, a number of times, each time as if in a new request.  The
+    course id can be that of a CCX, whose overrides are then applied, as are
+    those of the other enabled FIELD_OVERRIDE_PROVIDERS and
+    MODULESTORE_FIELD_OVERRIDE_PROVIDERS.
+
+    The fields are read once with the overrides resolved so far in the request
+    kept, as they are when rendering the course, and once with them forgotten
+    before each read, which is what every read cost before they were kept.
+    Prints the timings as JSON.
+    """
+    help = "Benchmarks reading the fields of a course's blocks through its field override providers."
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument('course_id', help='Id of the course or CCX to read.')
+        parser.add_argument('username', help='Username of the user to read the fields as.')
+        parser.add_argument(
+            '--iterations',
+            help='Number of times to read the fields.',
+            default=3,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u"Invalid course_key: '{}'".format(options['course_id']))
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(u"User not found: '{}'".format(options['username']))
+        course = modulestore().get_course(course_key, depth=None)
+        if course is None:
+            raise CommandError(u"Course not found: '{}'".format(course_key))
+
+        blocks = list(_iter_blocks(course))
+        results = {
+            'course_id': unicode(course_key),
+            'iterations': options['iterations'],
+            'blocks': len(blocks),
+            'field_reads': sum(len(_settings_fields(block)) for block in blocks),
+        }
+        for name, memoized in (('memoized', True), ('unmemoized', False)):
+            durations = []
+            for __ in range(options['iterations']):
+                RequestCache.clear_request_cache()
+                start = default_timer()
+                _read_fields(user, course, blocks, memoized)
+                durations.append(default_timer() - start)
+            results[name] = {
+                'mean_seconds': sum(durations) / len(durations),
+                'min_seconds': min(durations),
+            }
+        RequestCache.clear_request_cache()
+
+        self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
+
+
+def _iter_blocks(block):
+    """
+    Yields `block` and all of its descendants.
+    """
+    yield block
+    for child in block.get_children():
+        for descendant in _iter_blocks(child):
+            yield descendant
+
+
+def _settings_fields(block):
+    """
+    Returns the names of the fields of `block` in the settings scope, which
+    are the ones that are overridden.
+    """
+    return [name for name, field in block.fields.iteritems() if field.scope == Scope.settings]
+
+
+def _read_fields(user, course, blocks, memoized):
+    """
+    Reads the settings fields of `blocks` the way XBlock fields read them,
+    through the field data the LMS gives `user`.  Unless `memoized`, the
+    overrides resolved so far are forgotten before each read.
+    """
+    for block in blocks:
+        field_data = OverrideFieldData.wrap(user, course, block._field_data)  # pylint: disable=protected-access
+        for name in _settings_fields(block):
+            if not memoized:
+                clear_resolved_overrides()
+            if field_data.has(block, name):
+                field_data.get(block, name)
+            else:
+                try:
+                    field_data.default(block, name)
+                except KeyError:
+                    pass
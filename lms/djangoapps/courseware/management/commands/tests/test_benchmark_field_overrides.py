@@ -0,0 +1,85 @@
+"""
+Tests for the benchmark_field_overrides management command
+"""
+import datetime
+import json
+from StringIO import StringIO
+
+import pytz
+from ccx_keys.locator import CCXLocator
+from django.core.management import call_command, CommandError
+from django.test.utils import override_settings
+
+from courseware.field_overrides import OverrideFieldData
+from courseware.testutils import FieldOverrideTestMixin
+from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.tests.factories import CcxFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase, TEST_DATA_SPLIT_MODULESTORE
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+@override_settings(
+    XBLOCK_FIELD_DATA_WRAPPERS=['lms.djangoapps.courseware.field_overrides:OverrideModulestoreFieldData.wrap'],
+    MODULESTORE_FIELD_OVERRIDE_PROVIDERS=['ccx.overrides.CustomCoursesForEdxOverrideProvider'],
+)
+class TestBenchmarkFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
+    """
+    Tests for the benchmark_field_overrides management command
+    """
+    MODULESTORE = TEST_DATA_SPLIT_MODULESTORE
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestBenchmarkFieldOverrides, cls).setUpClass()
+        cls.course = CourseFactory.create(enable_ccx=True)
+        cls.blocks = [cls.course]
+        for __ in range(2):
+            chapter = ItemFactory.create(parent=cls.course, category='chapter')
+            cls.blocks.append(chapter)
+            for __ in range(2):
+                sequential = ItemFactory.create(parent=chapter, category='sequential')
+                cls.blocks.append(sequential)
+                cls.blocks.extend(
+                    ItemFactory.create(parent=sequential, category='vertical') for __ in range(2)
+                )
+
+    def setUp(self):
+        super(TestBenchmarkFieldOverrides, self).setUp()
+        self.ccx = CcxFactory.create(course_id=self.course.id)
+        self.ccx_key = CCXLocator.from_course_locator(self.course.id, self.ccx.id)
+
+        # Override the dates of every block of the CCX.
+        start = datetime.datetime(2014, 12, 25, tzinfo=pytz.UTC)
+        due = datetime.datetime(2015, 1, 25, tzinfo=pytz.UTC)
+        for block in self.blocks:
+            override_field_for_ccx(self.ccx, block, 'start', start)
+            override_field_for_ccx(self.ccx, block, 'due', due)
+
+        def cleanup_provider_classes():
+            """
+            Undo the change to OverrideFieldData made by its wrap method.
+            """
+            OverrideFieldData.provider_classes = None
+        self.addCleanup(cleanup_provider_classes)
+
+    def test_invalid_course_key(self):
+        with self.assertRaisesRegexp(CommandError, "Invalid course_key"):
+            call_command('benchmark_field_overrides', 'invalid_key', self.ccx.coach.username)
+
+    def test_unknown_user(self):
+        with self.assertRaisesRegexp(CommandError, "User not found"):
+            call_command('benchmark_field_overrides', unicode(self.ccx_key), 'unknown')
+
+    def test_benchmark(self):
+        output = StringIO()
+        call_command(
+            'benchmark_field_overrides', unicode(self.ccx_key), self.ccx.coach.username, '--iterations', '2',
+            stdout=output
+        )
+        results = json.loads(output.getvalue())
+
+        self.assertEqual(results['course_id'], unicode(self.ccx_key))
+        self.assertEqual(results['blocks'], len(self.blocks))
+        self.assertGreater(results['field_reads'], len(self.blocks))
+        for name in ('memoized', 'unmemoized'):
+            self.assertLessEqual(results[name]['min_seconds'], results[name]['mean_seconds'])
@@ -30,7 +30,7 @@ from xblock.exceptions import NoSuchHandlerError, NoSuchViewError
 from xblock.reference.plugins import FSService
 
 import static_replace
-from courseware.access import has_access, get_user_role
+from courseware.access import has_access, has_access_many, get_user_role
 from courseware.entrance_exams import (
     user_can_skip_entrance_exam,
     user_has_passed_entrance_exam
@@ -53,9 +53,7 @@ from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.util.user_utils import SystemUser
 from openedx.core.lib.xblock_utils import (
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls,
+    replace_urls,
     add_staff_markup,
     wrap_xblock,
     request_token as xblock_request_token,
@@ -160,6 +158,8 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
             return None, None, None
 
         toc_chapters = list()
+        # The children of each block are bound, and the user's access to them
+        # checked, in one batch (see has_access_many).
         chapters = course_module.get_display_items()
 
         # Check for content which needs to be completed
@@ -468,6 +468,40 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             course=course
         )
 
+    def inner_get_modules(descriptors):
+        """
+        Bind each of `descriptors` like inner_get_module(), but check access
+        to all of them in one batch.
+
+        Returns a list with None in place of the descriptors the user can't access.
+        """
+        modules = [
+            get_module_for_descriptor_internal(
+                user=user,
+                descriptor=descriptor,
+                student_data=student_data,
+                course_id=course_id,
+                track_function=track_function,
+                xqueue_callback_url_prefix=xqueue_callback_url_prefix,
+                position=position,
+                wrap_xmodule_display=wrap_xmodule_display,
+                grade_bucket_type=grade_bucket_type,
+                static_asset_path=static_asset_path,
+                user_location=user_location,
+                request_token=request_token,
+                course=course,
+                check_access=False,
+            )
+            for descriptor in descriptors
+        ]
+        if not _user_needs_access_check(user):
+            return modules
+
+        return [
+            module if access else None
+            for module, access in zip(modules, has_access_many(user, 'load', modules, course_id))
+        ]
+
     def publish(block, event_type, event):
         """A function that allows XModules to publish events."""
         if event_type == 'grade' and not is_masquerading_as_specific_student(user, course_id):
@@ -577,27 +611,21 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
-    #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # Rewrite urls in a single pass over the block content:
+    #  * urls beginning in /static point to course-specific content
+    #  * urls of the form '/course/' refer to the root of multicourse directory
+    #    hierarchy of this course
+    #  * intra-courseware links (/jump_to_id/<id>) are rewritten. This format
+    #    is an improvement over the /course/... format for studio authored courses,
+    #    because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
+        getattr(descriptor, 'data_dir', None),
         course_id,
         reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
@@ -645,12 +673,13 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
         # TODO (cpennington): Figure out how to share info between systems
         filestore=descriptor.runtime.resources_fs,
         get_module=inner_get_module,
+        get_modules=inner_get_modules,
         user=user,
         debug=settings.DEBUG,
         hostname=settings.SITE_NAME,
         # TODO (cpennington): This should be removed when all html from
         # a module is coming through get_html and is therefore covered
-        # by the replace_static_urls code below
+        # by the replace_urls block wrapper above
         replace_urls=partial(
             static_replace.replace_static_urls,
             data_directory=getattr(descriptor, 'data_dir', None),
@@ -693,6 +722,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
         rebind_noauth_module_to_user=rebind_noauth_module_to_user,
         user_location=user_location,
         request_token=request_token,
+        fragment_cache=cache if settings.FEATURES.get('ENABLE_XBLOCK_FRAGMENT_CACHE') else None,
     )
 
     # pass position specified in URL to module through ModuleSystem
@@ -725,7 +755,7 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
                                        track_function, xqueue_callback_url_prefix, request_token,
                                        position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                                        static_asset_path='', user_location=None, disable_staff_debug_info=False,
-                                       course=None):
+                                       course=None, check_access=True):
     """
     Actually implement get_module, without requiring a request.
 
@@ -733,6 +763,8 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
 
     Arguments:
         request_token (str): A unique token for this request, used to isolate xblock rendering
+        check_access (bool): Whether to check the user's access to the bound descriptor.
+            Callers that pass False must check it themselves.
     """
 
     (system, student_data) = get_module_system_for_user(
@@ -767,13 +799,20 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
     # Not that the access check needs to happen after the descriptor is bound
     # for the student, since there may be field override data for the student
     # that affects xblock visibility.
-    user_needs_access_check = getattr(user, 'known', True) and not isinstance(user, SystemUser)
-    if user_needs_access_check:
+    if check_access and _user_needs_access_check(user):
         if not has_access(user, 'load', descriptor, course_id):
             return None
     return descriptor
 
 
+def _user_needs_access_check(user):
+    """
+    Returns whether blocks bound for `user` need their access checked,
+    which they don't for noauth requests.
+    """
+    return getattr(user, 'known', True) and not isinstance(user, SystemUser)
+
+
 def load_single_xblock(request, user_id, course_id, usage_key_string, course=None):
     """
     Load a single XBlock identified by usage_key_string.
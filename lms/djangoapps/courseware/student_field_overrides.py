@@ -4,7 +4,7 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from .models import StudentFieldOverride
 
 
@@ -70,6 +70,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_resolved_overrides()
 
 
 def clear_override_for_user(user, block, name):
@@ -85,5 +86,6 @@ def clear_override_for_user(user, block, name):
             student_id=user.id,
             location=block.location,
             field=name).delete()
+        clear_resolved_overrides()
     except StudentFieldOverride.DoesNotExist:
         pass
@@ -501,6 +501,47 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase, MilestonesTes
         mock_unit.start = start
         self.verify_access(mock_unit, expected_access, expected_error_type)
 
+    @ddt.data('load', 'staff', 'instructor')
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_has_access_many(self, action):
+        chapter = ItemFactory.create(category='chapter', parent=self.course)
+        blocks = [
+            ItemFactory.create(category='sequential', parent=chapter),
+            ItemFactory.create(category='sequential', parent=chapter, visible_to_staff_only=True),
+            ItemFactory.create(category='sequential', parent=chapter, start=self.TOMORROW),
+            ItemFactory.create(category='sequential', parent=chapter, start=self.YESTERDAY),
+        ]
+        users = [
+            self.anonymous_user, self.student, self.beta_user, self.course_staff,
+            self.course_instructor, self.global_staff,
+        ]
+        for user in users:
+            self.assertEqual(
+                [bool(response) for response in access.has_access_many(user, action, blocks, self.course.id)],
+                [bool(access.has_access(user, action, block, self.course.id)) for block in blocks],
+            )
+
+    def test_has_access_many_checks_roles_once(self):
+        chapter = ItemFactory.create(category='chapter', parent=self.course)
+        blocks = [ItemFactory.create(category='sequential', parent=chapter) for __ in range(3)]
+
+        with patch(
+            'courseware.access._has_staff_access_to_descriptor', wraps=access._has_staff_access_to_descriptor
+        ) as mock_staff_access:
+            responses = access.has_access_many(self.student, 'load', blocks, self.course.id)
+
+        self.assertTrue(all(responses))
+        self.assertEqual(mock_staff_access.call_count, 1)
+
+    def test_has_access_many_other_objects(self):
+        """
+        Objects other than course content are checked like has_access does.
+        """
+        responses = access.has_access_many(
+            self.course_staff, 'staff', [self.course, self.course.location], self.course.id
+        )
+        self.assertTrue(all(responses))
+
     def test__has_access_course_can_enroll(self):
         yesterday = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1)
         tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
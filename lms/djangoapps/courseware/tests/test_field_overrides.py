@@ -3,15 +3,18 @@ Tests for `field_overrides` module.
 """
 # pylint: disable=missing-docstring
 import unittest
+from mock import Mock
 from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
+from request_cache.middleware import RequestCache
 from xblock.field_data import DictFieldData
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
 from ..field_overrides import (
     resolve_dotted,
+    clear_resolved_overrides,
     disable_overrides,
     FieldOverrideProvider,
     OverrideFieldData,
@@ -142,6 +145,100 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+class CountingOverrideProvider(FieldOverrideProvider):
+    """
+    Overrides the due date of the block at 'chapter', and records every lookup.
+    """
+    lookups = []
+
+    def get(self, block, name, default):
+        self.lookups.append((block.location, name))
+        if name == 'due' and block.location == 'chapter':
+            return 'chapter due'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+class StubBlock(object):
+    """
+    Just enough of a block for `OverrideFieldData`.
+    """
+    def __init__(self, location, parent=None):
+        self.location = location
+        self.parent = parent
+
+    def get_parent(self):
+        return self.parent
+
+
+@attr(shard=1)
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.CountingOverrideProvider',))
+class ResolvedOverridesTests(unittest.TestCase):
+    """
+    Tests for the per-request table of resolved overrides.
+    """
+    def setUp(self):
+        super(ResolvedOverridesTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        self.addCleanup(setattr, OverrideFieldData, 'provider_classes', None)
+        self.addCleanup(RequestCache.clear_request_cache)
+        CountingOverrideProvider.lookups = []
+
+        self.chapter = StubBlock('chapter')
+        self.sequential = StubBlock('sequential', self.chapter)
+        self.vertical = StubBlock('vertical', self.sequential)
+        self.user = Mock(id=1)
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        fallback = Mock()
+        fallback.default.return_value = 'mooc due'
+        return OverrideFieldData.wrap(self.user, None, fallback)
+
+    def test_override_looked_up_once(self):
+        self.assertEqual(self.make_one().get(self.chapter, 'due'), 'chapter due')
+        self.assertEqual(self.make_one().get(self.chapter, 'due'), 'chapter due')
+        self.assertEqual(CountingOverrideProvider.lookups, [('chapter', 'due')])
+
+    def test_inherited_override(self):
+        data = self.make_one()
+        self.assertEqual(data.default(self.vertical, 'due'), 'chapter due')
+        self.assertFalse(data.has(self.vertical, 'due'))
+        self.assertEqual(data.default(self.sequential, 'due'), 'chapter due')
+
+        # Each block was only asked about once, even though the sequential
+        # is an ancestor of the vertical.
+        self.assertEqual(
+            sorted(CountingOverrideProvider.lookups),
+            [('chapter', 'due'), ('sequential', 'due'), ('vertical', 'due')],
+        )
+
+    def test_users_have_separate_tables(self):
+        self.make_one().default(self.vertical, 'due')
+        self.user = Mock(id=2)
+        self.make_one().default(self.vertical, 'due')
+        self.assertEqual(len(CountingOverrideProvider.lookups), 4)
+
+    def test_clear_resolved_overrides(self):
+        data = self.make_one()
+        data.default(self.vertical, 'due')
+        clear_resolved_overrides()
+        data.default(self.vertical, 'due')
+        self.assertEqual(len(CountingOverrideProvider.lookups), 4)
+
+    def test_disabled_overrides_not_cached(self):
+        data = self.make_one()
+        with disable_overrides():
+            self.assertEqual(data.default(self.vertical, 'due'), 'mooc due')
+        self.assertEqual(data.default(self.vertical, 'due'), 'chapter due')
+
+
 @attr(shard=1)
 class ResolveDottedTests(unittest.TestCase):
     """
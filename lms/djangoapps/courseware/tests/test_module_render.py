@@ -39,6 +39,7 @@ from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory, UserFactory, GlobalStaffFactory
 from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
+from lms.djangoapps.lms_xblock import fragment_cache
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from openedx.core.lib.courses import course_image_url
 from openedx.core.lib.gating import api as gating_api
@@ -54,6 +55,8 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.factories import ItemFactory, CourseFactory, ToyCourseFactory, check_mongo_calls
 from xmodule.modulestore.tests.test_asides import AsideTestType
+from request_cache.middleware import RequestCache
+from xmodule.html_module import HtmlModule
 from xmodule.x_module import XModuleDescriptor, XModule, STUDENT_VIEW, CombinedSystem
 
 from openedx.core.djangoapps.credit.models import CreditCourse
@@ -1275,6 +1278,125 @@ class TestHtmlModifiers(ModuleStoreTestCase):
         )
 
 
+@attr(shard=1)
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_FRAGMENT_CACHE': True})
+class TestFragmentCache(ModuleStoreTestCase):
+    """
+    Tests of the cache of student_view fragments for blocks that allow it.
+    """
+    def setUp(self):
+        super(TestFragmentCache, self).setUp()
+        RequestCache.clear_request_cache()
+        self.course = CourseFactory.create()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+        self.descriptor = ItemFactory.create(
+            category='html',
+            parent_location=self.course.location,
+            data='<p>Cached content for %%USER_ID%%</p>',
+        )
+
+    def render_html(self, user=None):
+        """
+        Renders the student_view of the html block for `user`.
+        """
+        user = user or self.user
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, user, self.descriptor)
+        module = render.get_module(user, self.request, self.descriptor.location, field_data_cache)
+        return module.render(STUDENT_VIEW).content
+
+    def test_fragment_is_reused(self):
+        first = self.render_html()
+        with patch.object(HtmlModule, 'get_html', return_value='<p>Rendered again</p>') as mock_get_html:
+            second = self.render_html()
+
+        self.assertFalse(mock_get_html.called)
+        self.assertEqual(first, second)
+        self.assertEqual(fragment_cache.get_request_stats(), (1, 1))
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_FRAGMENT_CACHE': False})
+    def test_cache_disabled(self):
+        self.render_html()
+        with patch.object(HtmlModule, 'get_html', return_value='<p>Rendered again</p>') as mock_get_html:
+            self.assertIn('Rendered again', self.render_html())
+
+        self.assertTrue(mock_get_html.called)
+        self.assertEqual(fragment_cache.get_request_stats(), (0, 0))
+
+    def test_content_change(self):
+        self.render_html()
+        self.descriptor.data = '<p>Updated content</p>'
+        self.store.update_item(self.descriptor, self.user.id)
+
+        self.assertIn('Updated content', self.render_html())
+
+    def test_varies_on_declared_user_properties(self):
+        other_user = UserFactory.create()
+        # Html modules get the per-student anonymized id.
+        self.assertIn(anonymous_id_for_user(self.user, None), self.render_html())
+        self.assertIn(anonymous_id_for_user(other_user, None), self.render_html(other_user))
+        self.assertEqual(fragment_cache.get_request_stats(), (0, 2))
+
+    def test_shared_by_users_in_vertical(self):
+        vertical = ItemFactory.create(category='vertical', parent_location=self.course.location)
+        ItemFactory.create(category='html', parent_location=vertical.location, data='<p>Shared content</p>')
+        other_user = UserFactory.create()
+
+        # The vertical adds the username and bookmark state to the context
+        # of its children, which the html block doesn't depend on.
+        for user in (self.user, other_user):
+            self.request.user = user
+            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, user, vertical)
+            module = render.get_module(user, self.request, vertical.location, field_data_cache)
+            self.assertIn('Shared content', module.render(STUDENT_VIEW).content)
+
+        self.assertEqual(fragment_cache.get_request_stats(), (1, 1))
+
+
+@attr(shard=1)
+class TestBatchedChildAccess(SharedModuleStoreTestCase):
+    """
+    Tests that the children of a block are bound and access checked in one batch.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestBatchedChildAccess, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        chapter = ItemFactory.create(category='chapter', parent_location=cls.course.location)
+        cls.sequential = ItemFactory.create(category='sequential', parent_location=chapter.location)
+        cls.verticals = [
+            ItemFactory.create(
+                category='vertical',
+                parent_location=cls.sequential.location,
+                visible_to_staff_only=(index == 1),
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        super(TestBatchedChildAccess, self).setUp()
+        self.user = UserFactory()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+
+    def test_children_access_checked_in_batch(self):
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.course.id, self.user, self.sequential, depth=1
+        )
+        sequential = render.get_module(self.user, self.request, self.sequential.location, field_data_cache)
+
+        with patch('courseware.module_render.has_access_many', wraps=render.has_access_many) as mock_has_access_many:
+            children = sequential.get_children()
+
+        self.assertEqual(mock_has_access_many.call_count, 1)
+        self.assertEqual(
+            [child.location for child in children],
+            [self.verticals[0].location, self.verticals[2].location],
+        )
+
+
 class XBlockWithJsonInitData(XBlock):
     """
     Pure XBlock to use in tests, with JSON init data.
@@ -27,11 +27,13 @@ try:
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
 
+import dogstats_wrapper as dog_stats_api
 import urllib
 import waffle
 
 from lms.djangoapps.gating.api import get_entrance_exam_score_ratio, get_entrance_exam_usage_key
 from lms.djangoapps.grades.new.course_grade import CourseGradeFactory
+from lms.djangoapps.lms_xblock import fragment_cache
 from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
 from openedx.core.djangoapps.user_api.preferences.api import get_user_preference
@@ -156,7 +158,9 @@ class CoursewareIndex(View):
                 self._save_positions()
                 self._prefetch_and_bind_section()
 
-        return render_to_response('courseware/courseware.html', self._create_courseware_context())
+        courseware_context = self._create_courseware_context()
+        self._record_fragment_cache_stats()
+        return render_to_response('courseware/courseware.html', courseware_context)
 
     def _redirect_if_not_requested_section(self):
         """
@@ -189,6 +193,22 @@ class CoursewareIndex(View):
         newrelic.agent.add_custom_parameter('course_id', unicode(self.course_key))
         newrelic.agent.add_custom_parameter('org', unicode(self.course_key.org))
 
+    def _record_fragment_cache_stats(self):
+        """
+        Report how many of the blocks rendered for the page came from the fragment cache.
+        """
+        hits, misses = fragment_cache.get_request_stats()
+        if not hits + misses:
+            return
+        dog_stats_api.histogram(
+            'lms.courseware.fragment_cache.hit_rate',
+            float(hits) / (hits + misses),
+            tags=[u'course_id:{}'.format(self.course_key)],
+        )
+        if newrelic:
+            newrelic.agent.add_custom_parameter('fragment_cache_hits', hits)
+            newrelic.agent.add_custom_parameter('fragment_cache_misses', misses)
+
     def _clean_position(self):
         """
         Verify that the given position is an integer. If it is not positive, set it to 1.
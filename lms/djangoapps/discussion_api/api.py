@@ -5,12 +5,13 @@ from collections import defaultdict
 from urllib import urlencode
 from urlparse import urlunparse
 
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.http import Http404
 import itertools
 from enum import Enum
-from openedx.core.djangoapps.user_api.accounts.views import AccountViewSet
+from openedx.core.djangoapps.user_api.accounts.serializers import AccountLegacyProfileSerializer
 
 from rest_framework.exceptions import PermissionDenied
 
@@ -26,7 +27,13 @@ from discussion_api.permissions import (
     get_initializable_comment_fields,
     get_initializable_thread_fields,
 )
-from discussion_api.serializers import CommentSerializer, ThreadSerializer, get_context, DiscussionTopicSerializer
+from discussion_api.serializers import (
+    CommentSerializer,
+    DiscussionTopicSerializer,
+    ThreadSerializer,
+    get_context,
+    get_page_context,
+)
 from django_comment_client.base.views import (
     track_comment_created_event,
     track_thread_created_event,
@@ -335,20 +342,26 @@ def _get_user_profile_dict(request, usernames):
     Gets user profile details for a list of usernames and creates a dictionary with
     profile details against username.
 
+    The users and their profiles are fetched in a single query.  The profile
+    image is the only detail included, and is visible to every user.
+
     Parameters:
 
         request: The django request object.
-        usernames: A string of comma separated usernames.
+        usernames: A list of usernames.
 
     Returns:
 
         A dict with username as key and user profile details as value.
     """
-    request.GET = request.GET.copy()  # Make a mutable copy of the GET parameters.
-    request.GET['username'] = usernames
-    user_profile_details = AccountViewSet.as_view({'get': 'list'})(request).data
-
-    return {user['username']: user for user in user_profile_details}
+    users = User.objects.select_related('profile').filter(username__in=usernames)
+    return {
+        user.username: {
+            'username': user.username,
+            'profile_image': AccountLegacyProfileSerializer.get_profile_image(user.profile, user, request),
+        }
+        for user in users
+    }
 
 
 def _user_profile(user_profile):
@@ -409,7 +422,7 @@ def _add_additional_response_fields(
         A list of serialized discussion thread/comment with additional data if requested.
     """
     if include_profile_image:
-        username_profile_dict = _get_user_profile_dict(request, usernames=','.join(usernames))
+        username_profile_dict = _get_user_profile_dict(request, usernames)
         for discussion_entity in serialized_discussion_entities:
             discussion_entity['users'] = _get_users(discussion_entity_type, discussion_entity, username_profile_dict)
 
@@ -446,6 +459,8 @@ def _serialize_discussion_entities(request, context, discussion_entities, reques
     results = []
     usernames = []
     include_profile_image = _include_profile_image(requested_fields)
+    if discussion_entity_type == DiscussionEntity.comment:
+        context = get_page_context(context, discussion_entities)
     for entity in discussion_entities:
         if discussion_entity_type == DiscussionEntity.thread:
             serialized_entity = ThreadSerializer(entity, context=context).data
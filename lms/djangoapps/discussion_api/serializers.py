@@ -21,7 +21,7 @@ from django_comment_common.models import (
     FORUM_ROLE_ADMINISTRATOR,
     FORUM_ROLE_COMMUNITY_TA,
     FORUM_ROLE_MODERATOR,
-    Role,
+    get_role_user_ids,
 )
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
@@ -35,20 +35,11 @@ def get_context(course, request, thread=None):
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
     """
-    # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
-    staff_user_ids = {
-        user.id
-        for role in Role.objects.filter(
-            name__in=[FORUM_ROLE_ADMINISTRATOR, FORUM_ROLE_MODERATOR],
-            course_id=course.id
-        )
-        for user in role.users.all()
-    }
-    ta_user_ids = {
-        user.id
-        for role in Role.objects.filter(name=FORUM_ROLE_COMMUNITY_TA, course_id=course.id)
-        for user in role.users.all()
-    }
+    role_user_ids = get_role_user_ids(course.id)
+    staff_user_ids = set(
+        role_user_ids.get(FORUM_ROLE_ADMINISTRATOR, []) + role_user_ids.get(FORUM_ROLE_MODERATOR, [])
+    )
+    ta_user_ids = set(role_user_ids.get(FORUM_ROLE_COMMUNITY_TA, []))
     requester = request.user
     cc_requester = CommentClientUser.from_django_user(requester).retrieve()
     cc_requester["course_id"] = course.id
@@ -65,6 +56,28 @@ def get_context(course, request, thread=None):
     }
 
 
+def get_page_context(context, comments):
+    """
+    Returns a copy of `context`, the context of a thread, for serializing the
+    given page of its comments with CommentSerializer.
+
+    The usernames of the users who endorsed the comments or their children
+    are fetched together, rather than once for each comment.
+    """
+    endorser_ids = set()
+    pending = list(comments)
+    while pending:
+        comment = pending.pop()
+        if comment.get("endorsement"):
+            endorser_ids.add(int(comment["endorsement"]["user_id"]))
+        pending.extend(comment.get("children", []))
+
+    usernames_by_id = {}
+    if endorser_ids:
+        usernames_by_id = dict(DjangoUser.objects.filter(id__in=endorser_ids).values_list("id", "username"))
+    return dict(context, usernames_by_id=usernames_by_id)
+
+
 def validate_not_blank(value):
     """
     Validate that a value is not an empty string or whitespace.
@@ -341,6 +354,9 @@ class CommentSerializer(_ContentSerializer):
                     self._is_anonymous(self.context["thread"]) and
                     not self._is_user_privileged(endorser_id)
             ):
+                usernames_by_id = self.context.get("usernames_by_id", {})
+                if endorser_id in usernames_by_id:
+                    return usernames_by_id[endorser_id]
                 return DjangoUser.objects.get(id=endorser_id).username
         return None
 
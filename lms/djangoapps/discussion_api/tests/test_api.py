@@ -13,7 +13,9 @@ from nose.plugins.attrib import attr
 from pytz import UTC
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework.exceptions import PermissionDenied
 
@@ -1268,6 +1270,42 @@ class GetCommentListTest(ForumsEnableMixin, CommentsServiceMockMixin, SharedModu
         actual_comments = self.get_comment_list(thread).data["results"]
         self.assertIsNone(actual_comments[0]["endorsed_by"])
 
+    def test_query_count_independent_of_page_size(self):
+        """
+        Ensure that the authors and endorsers of a page of comments are looked
+        up in a constant number of queries, however many comments it holds.
+        """
+        authors = [UserFactory.create() for __ in range(100)]
+        thread = self.make_minimal_cs_thread({
+            "thread_type": "question",
+            "endorsed_responses": [
+                make_minimal_cs_comment({
+                    "id": "comment_{}".format(index),
+                    "user_id": str(author.id),
+                    "username": author.username,
+                    "endorsed": True,
+                    "endorsement": {"user_id": str(authors[index - 1].id), "time": "2015-05-18T12:34:56Z"},
+                })
+                for index, author in enumerate(authors)
+            ],
+        })
+        self.register_get_thread_response(thread)
+
+        def get_page(page_size):
+            """Returns the number of queries getting a page of page_size comments takes."""
+            with CaptureQueriesContext(connection) as captured_queries:
+                results = get_comment_list(
+                    self.request, thread["id"], True, 1, page_size, requested_fields=["profile_image"]
+                ).data["results"]
+            self.assertEqual(len(results), page_size)
+            self.assertEqual(results[1]["endorsed_by"], authors[0].username)
+            return len(captured_queries)
+
+        # Warm up the caches of the course and its roles.
+        get_page(10)
+        query_counts = [get_page(page_size) for page_size in (10, 50, 100)]
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
     @ddt.data(
         ("discussion", None, "children", "resp_total"),
         ("question", False, "non_endorsed_responses", "non_endorsed_resp_total"),
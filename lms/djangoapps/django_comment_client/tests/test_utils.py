@@ -10,14 +10,17 @@ from django.utils.timezone import UTC as django_utc
 
 from django.core.urlresolvers import reverse
 from django.test import TestCase, RequestFactory
+from django.test.utils import override_settings
+from django.utils import translation
 from edxmako import add_lookup
 
 from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 import django_comment_client.utils as utils
-from lms.lib.comment_client.utils import perform_request, CommentClientMaintenanceError
+from lms.lib.comment_client.utils import perform_concurrently, perform_request, CommentClientMaintenanceError
 from django_comment_common.models import ForumsConfig
+from request_cache.middleware import RequestCache
 
 from courseware.tests.factories import InstructorFactory
 from courseware.tabs import get_course_tab_list
@@ -29,7 +32,7 @@ from openedx.core.djangoapps.content.course_structures.models import CourseStruc
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
 from student.roles import CourseStaffRole
 from xmodule.modulestore import ModuleStoreEnum
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, ToyCourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, ToyCourseFactory, check_mongo_calls
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DATA_MIXED_MODULESTORE
 from xmodule.modulestore.django import modulestore
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
@@ -933,6 +936,28 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
             }
         )
 
+    def test_staff_only_discussion(self):
+        self.create_discussion("Chapter", "Discussion")
+        self.create_discussion("Chapter", "Staff Discussion", visible_to_staff_only=True)
+        student = UserFactory.create()
+        CourseEnrollmentFactory.create(user=student, course_id=self.course.id)
+
+        staff_map = utils.get_discussion_category_map(self.course, self.instructor)
+        self.assertEqual(
+            set(staff_map["subcategories"]["Chapter"]["entries"]),
+            {"Discussion", "Staff Discussion"}
+        )
+        student_map = utils.get_discussion_category_map(self.course, student)
+        self.assertEqual(set(student_map["subcategories"]["Chapter"]["entries"]), {"Discussion"})
+
+    def test_discussion_xblocks_not_loaded_when_cached(self):
+        self.create_discussion("Chapter", "Discussion")
+        utils.get_discussion_category_map(self.course, self.instructor)
+
+        with check_mongo_calls(0):
+            category_map = utils.get_discussion_category_map(self.course, self.instructor)
+        self.assertEqual(category_map["subcategories"]["Chapter"]["children"], [("Discussion", TYPE_ENTRY)])
+
     def test_sort_intermediates(self):
         self.create_discussion("Chapter B", "Discussion 2")
         self.create_discussion("Chapter C", "Discussion")
@@ -1478,3 +1503,87 @@ class ClientConfigurationTestCase(TestCase):
 
         result = perform_request('GET', 'http://www.google.com')
         self.assertEqual(result, {})
+
+
+class ClientRequestTestCase(TestCase):
+    """Tests for how the comment client sends requests to the comments service."""
+
+    URL = 'http://localhost:4567/api/v1/threads/1'
+
+    def setUp(self):
+        super(ClientRequestTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        self.addCleanup(RequestCache.clear_request_cache)
+        RequestCache.clear_request_cache()
+
+        patcher = patch('requests.request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_request.return_value = Mock(status_code=200, json=lambda: {'id': '1', 'children': []})
+
+    def in_request(self):
+        """Makes the calls to the comments service as if handling a request."""
+        return patch('crum.get_current_request', return_value=RequestFactory().get('/'))
+
+    def test_identical_gets_sent_once(self):
+        with self.in_request():
+            first = perform_request('get', self.URL, {'with_responses': True})
+            first['children'].append('modified')
+            second = perform_request('get', self.URL, {'with_responses': True})
+            perform_request('get', self.URL, {'with_responses': False})
+
+        self.assertEqual(self.mock_request.call_count, 2)
+        self.assertEqual(second, {'id': '1', 'children': []})
+
+    def test_write_forgets_responses(self):
+        with self.in_request():
+            perform_request('get', self.URL)
+            perform_request('put', self.URL, {'title': 'New title'})
+            perform_request('get', self.URL)
+
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_gets_outside_of_request_sent(self):
+        perform_request('get', self.URL)
+        perform_request('get', self.URL)
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL_SIZE=2)
+    @patch('requests.Session.request')
+    def test_pooled_session(self, mock_session_request):
+        mock_session_request.return_value = self.mock_request.return_value
+        perform_request('get', self.URL)
+        perform_request('get', self.URL)
+
+        self.assertEqual(mock_session_request.call_count, 2)
+        self.assertFalse(self.mock_request.called)
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=2)
+    def test_perform_concurrently(self):
+        with translation.override('fr'):
+            results = perform_concurrently(lambda: 1, translation.get_language, lambda: 3)
+        self.assertEqual(results, [1, 'fr', 3])
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=2)
+    def test_perform_concurrently_in_request(self):
+        with self.in_request():
+            perform_request('get', self.URL)
+            results = perform_concurrently(
+                lambda: perform_request('get', self.URL),
+                lambda: perform_request('get', self.URL + '/comments'),
+            )
+
+        self.assertEqual(results, [{'id': '1', 'children': []}] * 2)
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=2)
+    def test_perform_concurrently_error(self):
+        def fail():
+            """Fails like a request to the comments service."""
+            raise CommentClientMaintenanceError('service disabled')
+
+        with self.assertRaises(CommentClientMaintenanceError):
+            perform_concurrently(lambda: 1, fail)
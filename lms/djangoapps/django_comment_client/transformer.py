@@ -0,0 +1,80 @@
+"""
+Discussion Category Transformer
+"""
+from datetime import datetime
+
+import pytz
+
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+
+class DiscussionCategoryTransformer(BlockStructureTransformer):
+    """
+    The DiscussionCategoryTransformer collects the category map entry of
+    each discussion xblock in the course, so that the category map of a
+    user can be built without loading the course's discussion xblocks.
+
+    No runtime transformations are performed.  Which discussions a user
+    can access is decided by the course blocks access transformers.
+
+    The following value is stored as a transformer_block_field on each
+    discussion block that has the keys the category map requires:
+
+        entry: (dict) the discussion's id, title, sort_key and start_date,
+            and its category, with surrounding whitespace stripped from
+            each of its levels.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+
+    ENTRY_FIELD_NAME = 'entry'
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'discussion_categories'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the category map entries of the course's discussion xblocks.
+        """
+        # Imported here to avoid a circular import.
+        from django_comment_client.utils import has_required_keys
+
+        for block_key in block_structure.topological_traversal():
+            if block_key.block_type != 'discussion':
+                continue
+            xblock = block_structure.get_xblock(block_key)
+            if not has_required_keys(xblock):
+                continue
+            block_structure.set_transformer_block_field(block_key, cls, cls.ENTRY_FIELD_NAME, {
+                "id": xblock.discussion_id,
+                "title": xblock.discussion_target,
+                "sort_key": xblock.sort_key,
+                "category": " / ".join([x.strip() for x in xblock.discussion_category.split("/")]),
+                # Handle case where xblock.start is None
+                "start_date": xblock.start if xblock.start else datetime.max.replace(tzinfo=pytz.UTC),
+            })
+
+    def transform(self, usage_info, block_structure):
+        """
+        Perform no transformations.
+        """
+        pass
+
+    @classmethod
+    def get_entries(cls, block_structure):
+        """
+        Returns the category map entries of the discussion blocks in the
+        given (transformed) block structure.
+        """
+        entries = []
+        for block_key in block_structure.get_block_keys():
+            entry = block_structure.get_transformer_block_field(block_key, cls, cls.ENTRY_FIELD_NAME)
+            if entry is not None:
+                entries.append(entry)
+        return entries
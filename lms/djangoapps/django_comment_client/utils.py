@@ -4,7 +4,6 @@ import json
 import logging
 from django.conf import settings
 
-import pytz
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.db import connection
@@ -15,14 +14,16 @@ from opaque_keys.edx.locations import i4xEncoder
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 
-from django_comment_common.models import Role, FORUM_ROLE_STUDENT
+from django_comment_common.models import Role, get_role_user_ids
 from django_comment_client.permissions import check_permissions_by_view, has_permission, get_team
 from django_comment_client.settings import MAX_COMMENT_DEPTH
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
+from django_comment_client.transformer import DiscussionCategoryTransformer
 from edxmako import lookup_template
 
 from courseware import courses
 from courseware.access import has_access
+from lms.djangoapps.course_blocks.api import get_course_blocks
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_course_cohorted
@@ -74,8 +75,7 @@ def get_role_ids(course_id):
     """
     Returns a dictionary having role names as keys and a list of users as values
     """
-    roles = Role.objects.filter(course_id=course_id).exclude(name=FORUM_ROLE_STUDENT)
-    return dict([(role.name, list(role.users.values_list('id', flat=True))) for role in roles])
+    return get_role_user_ids(course_id)
 
 
 def has_discussion_privileges(user, course_id):
@@ -139,6 +139,19 @@ def get_accessible_discussion_xblocks(course, user, include_all=False):  # pylin
     ]
 
 
+def get_accessible_discussion_entries(course, user):
+    """
+    Returns the category map entries of the discussion xblocks in this course
+    that are accessible to the given user.
+
+    The entries are collected with the course's block structure, which is
+    cached until the course is next published, so the discussion xblocks
+    aren't loaded; the course blocks access transformers decide which of
+    them the user can access.
+    """
+    return DiscussionCategoryTransformer.get_entries(get_course_blocks(user, course.location))
+
+
 def get_discussion_id_map_entry(xblock):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
@@ -308,21 +321,10 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
     """
     unexpanded_category_map = defaultdict(list)
 
-    xblocks = get_accessible_discussion_xblocks(course, user)
-
     course_cohort_settings = get_course_cohort_settings(course.id)
 
-    for xblock in xblocks:
-        discussion_id = xblock.discussion_id
-        title = xblock.discussion_target
-        sort_key = xblock.sort_key
-        category = " / ".join([x.strip() for x in xblock.discussion_category.split("/")])
-        # Handle case where xblock.start is None
-        entry_start_date = xblock.start if xblock.start else datetime.max.replace(tzinfo=pytz.UTC)
-        unexpanded_category_map[category].append({"title": title,
-                                                  "id": discussion_id,
-                                                  "sort_key": sort_key,
-                                                  "start_date": entry_start_date})
+    for entry in get_accessible_discussion_entries(course, user):
+        unexpanded_category_map[entry["category"]].append(entry)
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
     for category_path, entries in unexpanded_category_map.items():
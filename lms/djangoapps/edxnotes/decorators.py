@@ -21,10 +21,11 @@ def edxnotes(cls):
     Decorator that makes components annotatable.
     """
     original_get_html = cls.get_html
+    original_cache_vary_on = getattr(cls, 'student_view_cache_vary_on', None)
 
-    def get_html(self, *args, **kwargs):
+    def get_notes_course(self):
         """
-        Returns raw html for the component.
+        Returns the course if notes are shown on the component, otherwise None.
         """
         is_studio = getattr(self.system, "is_author_mode", False)
         course = self.descriptor.runtime.modulestore.get_course(self.runtime.course_id)
@@ -34,6 +35,15 @@ def edxnotes(cls):
         # - when Harvard Annotation Tool is enabled for the course;
         # - when the feature flag or `edxnotes` setting of the course is set to False.
         if is_studio or not is_feature_enabled(course):
+            return None
+        return course
+
+    def get_html(self, *args, **kwargs):
+        """
+        Returns raw html for the component.
+        """
+        course = get_notes_course(self)
+        if course is None:
             return original_get_html(self, *args, **kwargs)
         else:
             return render_to_string("edxnotes_wrapper.html", {
@@ -54,5 +64,17 @@ def edxnotes(cls):
                 },
             })
 
+    def student_view_cache_vary_on(self):
+        """
+        The notes wrapper embeds a unique id and the learner's notes token,
+        so the output of annotatable components is never cached.
+        """
+        if get_notes_course(self) is not None:
+            return None
+        if isinstance(original_cache_vary_on, property):
+            return original_cache_vary_on.fget(self)
+        return original_cache_vary_on
+
     cls.get_html = get_html
+    cls.student_view_cache_vary_on = property(student_view_cache_vary_on)
     return cls
@@ -0,0 +1,397 @@
+"""
+Batch rescoring of capa problems for instructor tasks.
+
+`rescore_problem_module_state` instantiates a full XModule for every
+StudentModule it visits, which rebuilds the LoncapaProblem (parsing its XML
+and re-running its scripts) once per learner.  For a capa problem, the only
+inputs to that construction that differ between learners are the random seed
+and the stored student state.  The code here builds one LoncapaProblem per
+distinct seed, grades each learner's stored answers against it, and writes
+the resulting state and scores back in batches.
+
+Rescoring a problem for a large number of learners is fanned out across
+subtasks, each of which receives a chunk of StudentModule ids.
+"""
+import json
+import logging
+from collections import OrderedDict
+from time import time
+
+import dogstats_wrapper as dog_stats_api
+from celery.states import FAILURE, SUCCESS
+from django.conf import settings
+from eventtracking import tracker
+
+from capa.correctmap import CorrectMap
+from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
+from courseware.courses import get_course_by_id
+from courseware.models import StudentModule
+from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
+from lms.djangoapps.grades.scores import weighted_score
+from lms.djangoapps.grades.signals.signals import PROBLEM_RAW_SCORE_CHANGED
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
+from lms.djangoapps.instructor_task.tasks_helper import (
+    GRADES_RESCORE_EVENT_TYPE,
+    TaskProgress,
+    UpdateProblemModuleStateError,
+    _get_module_instance_for_task,
+    _get_track_function_for_task,
+)
+from openedx.core.lib.grade_utils import is_score_higher_or_equal
+from track import contexts
+from track.event_transaction_utils import create_new_event_transaction_id, set_event_transaction_type
+from util.db import outer_atomic
+from xmodule.modulestore.django import modulestore
+
+TASK_LOG = logging.getLogger('edx.celery.task')
+
+# Maximum number of seeded LoncapaProblem instances kept in memory by a
+# single CapaBatchRescorer.  Problems that rerandomize "always" can have up
+# to MAX_RANDOMIZATION_BINS distinct seeds.
+MAX_CACHED_PROBLEMS = 100
+
+
+class CapaBatchRescorer(object):
+    """
+    Rescores stored capa problem state for many learners.
+
+    A single capa module instance, bound to any one learner, is used as a
+    template.  A LoncapaProblem is built from it once for each distinct seed
+    that is encountered, and every learner's stored answers are graded
+    against the problem built for their seed.
+    """
+    def __init__(self, instance):
+        self.instance = instance
+        self._problems = OrderedDict()
+
+    @staticmethod
+    def supports(module_descriptor):
+        """
+        Returns whether the problem can be rescored in batches.
+
+        Only capa problems qualify, and only if the problem's scripts do not
+        depend on the identity of the learner: the script context of a
+        LoncapaProblem includes the learner's anonymous_student_id, so such
+        problems have to be rebuilt for each learner.
+        """
+        return (
+            module_descriptor.location.block_type == 'problem' and
+            hasattr(module_descriptor, 'data') and
+            'anonymous_student_id' not in module_descriptor.data
+        )
+
+    def problem_for_seed(self, seed):
+        """
+        Returns the LoncapaProblem for `seed`, building it on first use.
+        """
+        lcp = self._problems.get(seed)
+        if lcp is None:
+            if len(self._problems) >= MAX_CACHED_PROBLEMS:
+                self._problems.popitem(last=False)
+            with dog_stats_api.timer('instructor_tasks.batch_rescore.time.build_problem'):
+                lcp = self.instance.new_lcp({'seed': seed})
+            self._problems[seed] = lcp
+        return lcp
+
+    def rescore_state(self, state):
+        """
+        Grades the answers stored in `state`, a learner's decoded capa state.
+
+        Returns a tuple of (new lcp state, original score dict, new score
+        dict, new correct map).  The state of the shared problem instance is
+        overwritten by each call.
+        """
+        lcp = self.problem_for_seed(state.get('seed', self.instance.seed))
+        lcp.student_answers = state.get('student_answers', {})
+        lcp.has_saved_answers = state.get('has_saved_answers', False)
+        lcp.correct_map = CorrectMap()
+        lcp.correct_map.set_dict(state.get('correct_map', {}))
+        lcp.input_state = state.get('input_state', {})
+        lcp.done = state.get('done', False)
+
+        orig_score = lcp.get_score()
+        correct_map = lcp.rescore_existing_answers()
+        return lcp.get_state(), orig_score, lcp.get_score(), correct_map
+
+
+def _get_batch_rescorer(course_id, student, module_descriptor, xmodule_instance_args):
+    """
+    Returns a CapaBatchRescorer for `module_descriptor`, using a module
+    instance bound to `student` as its template.
+
+    Raises UpdateProblemModuleStateError if the module cannot be instantiated,
+    and NotImplementedError if the problem's definition does not support
+    rescoring, as CapaMixin.rescore_problem does.
+    """
+    course = get_course_by_id(course_id)
+    instance = _get_module_instance_for_task(
+        course_id,
+        student,
+        module_descriptor,
+        xmodule_instance_args,
+        grade_bucket_type='rescore',
+        course=course
+    )
+    if instance is None or not hasattr(instance, 'new_lcp'):
+        raise UpdateProblemModuleStateError("Specified problem does not support batch rescoring.")
+    if not instance.lcp.supports_rescoring():
+        raise NotImplementedError("Problem's definition does not support rescoring.")
+
+    # Hint feedback is never displayed while rescoring, and the hint events
+    # the responders publish through the template instance would otherwise
+    # be attributed to the template's learner.
+    instance.runtime.track_function = lambda event_type, event: None
+    return CapaBatchRescorer(instance)
+
+
+def _save_rescored_modules(module_descriptor, rescored, only_if_higher, xmodule_instance_args):
+    """
+    Writes the new state and grade of each rescored StudentModule in a single
+    transaction, then sends the score changed signals and events for them.
+
+    `rescored` is a list of (student_module, event_info) tuples.  Returns the
+    number of modules whose grade was updated.
+    """
+    usage_key = module_descriptor.location
+    course_id = usage_key.course_key
+    updated = []
+
+    with outer_atomic():
+        for student_module, event_info in rescored:
+            new_score, new_total = event_info['new_score'], event_info['new_total']
+            student_module.state = json.dumps(event_info.pop('new_state'))
+            update_grade = not only_if_higher or student_module.grade is None or is_score_higher_or_equal(
+                student_module.grade, student_module.max_grade, new_score, new_total,
+            )
+            if update_grade:
+                student_module.grade = new_score
+                student_module.max_grade = new_total
+                updated.append((student_module, event_info))
+            student_module.save()
+
+    event_transaction_id = create_new_event_transaction_id()
+    set_event_transaction_type(GRADES_RESCORE_EVENT_TYPE)
+    context = contexts.course_context_from_course_id(course_id)
+    for student_module, event_info in rescored:
+        track_function = _get_track_function_for_task(student_module.student, xmodule_instance_args)
+        track_function('problem_rescore', event_info)
+
+    for student_module, event_info in updated:
+        PROBLEM_RAW_SCORE_CHANGED.send(
+            sender=None,
+            raw_earned=student_module.grade,
+            raw_possible=student_module.max_grade,
+            weight=module_descriptor.weight,
+            user_id=student_module.student_id,
+            course_id=unicode(course_id),
+            usage_id=unicode(usage_key),
+            only_if_higher=only_if_higher,
+            modified=student_module.modified,
+            score_db_table=ScoreDatabaseTableEnum.courseware_student_module,
+        )
+        new_weighted_earned, new_weighted_possible = weighted_score(
+            student_module.grade,
+            student_module.max_grade,
+            module_descriptor.weight,
+        )
+        with tracker.get_tracker().context(GRADES_RESCORE_EVENT_TYPE, context):
+            tracker.emit(
+                unicode(GRADES_RESCORE_EVENT_TYPE),
+                {
+                    'course_id': unicode(course_id),
+                    'user_id': unicode(student_module.student_id),
+                    'problem_id': unicode(usage_key),
+                    'new_weighted_earned': new_weighted_earned,
+                    'new_weighted_possible': new_weighted_possible,
+                    'only_if_higher': only_if_higher,
+                    'instructor_id': unicode(xmodule_instance_args['request_info']['user_id']),
+                    'event_transaction_id': unicode(event_transaction_id),
+                    'event_transaction_type': unicode(GRADES_RESCORE_EVENT_TYPE),
+                }
+            )
+    return len(updated)
+
+
+def rescore_student_modules(xmodule_instance_args, module_descriptor, student_modules, task_input, progress):
+    """
+    Rescores the capa problem `module_descriptor` for each of `student_modules`.
+
+    `progress` is a TaskProgress or SubtaskStatus whose counters are updated
+    as modules are processed.  Learners whose answers fail to grade are
+    counted as failed; modules without any submitted answers are skipped.
+    Any other exception is fatal and is allowed to propagate.
+    """
+    only_if_higher = task_input['only_if_higher']
+    rescorer = None
+    rescored = []
+
+    def _flush():
+        """Saves the modules rescored so far."""
+        if rescored:
+            with dog_stats_api.timer('instructor_tasks.batch_rescore.time.save'):
+                _save_rescored_modules(module_descriptor, rescored, only_if_higher, xmodule_instance_args)
+            del rescored[:]
+            if isinstance(progress, TaskProgress):
+                progress.update_task_state()
+
+    # Decode all states up front so that learners sharing a seed are graded
+    # one after the other against the same problem instance.
+    to_rescore = []
+    for student_module in student_modules:
+        state = json.loads(student_module.state) if student_module.state else {}
+        if state.get('done'):
+            to_rescore.append((state.get('seed'), student_module, state))
+        else:
+            _increment_progress(progress, skipped=1)
+    to_rescore.sort(key=lambda item: item[0])
+
+    for __, student_module, state in to_rescore:
+        if rescorer is None:
+            rescorer = _get_batch_rescorer(
+                student_module.course_id, student_module.student, module_descriptor, xmodule_instance_args
+            )
+
+        try:
+            new_state, orig_score, new_score, correct_map = rescorer.rescore_state(state)
+        except (StudentInputError, ResponseError, LoncapaProblemError):
+            TASK_LOG.warning(
+                u"error processing rescore call for course %s, problem %s and student %s",
+                student_module.course_id, student_module.module_state_key, student_module.student_id,
+                exc_info=True,
+            )
+            _increment_progress(progress, failed=1)
+            continue
+
+        success = 'correct'
+        for answer_id in correct_map:
+            if not correct_map.is_correct(answer_id):
+                success = 'incorrect'
+
+        rescored.append((student_module, {
+            'state': state,
+            'new_state': new_state,
+            'problem_id': module_descriptor.location.to_deprecated_string(),
+            'orig_score': orig_score['score'],
+            'orig_total': orig_score['total'],
+            'new_score': new_score['score'],
+            'new_total': new_score['total'],
+            'correct_map': correct_map.get_dict(),
+            'success': success,
+            'attempts': state.get('attempts', 0),
+        }))
+        _increment_progress(progress, succeeded=1)
+        if len(rescored) >= settings.RESCORE_SAVE_BATCH_SIZE:
+            _flush()
+
+    _flush()
+
+
+def _increment_progress(progress, succeeded=0, failed=0, skipped=0):
+    """Updates the counters of a TaskProgress or a SubtaskStatus."""
+    if isinstance(progress, SubtaskStatus):
+        progress.increment(succeeded=succeeded, failed=failed, skipped=skipped)
+    else:
+        progress.attempted += succeeded + failed + skipped
+        progress.succeeded += succeeded
+        progress.failed += failed
+        progress.skipped += skipped
+
+
+def _modules_to_rescore(course_id, usage_key):
+    """Returns the StudentModules holding submitted answers to `usage_key`."""
+    return StudentModule.objects.filter(
+        course_id=course_id,
+        module_state_key=usage_key,
+        state__contains='"done": true',
+    ).select_related('student').order_by('id')
+
+
+def perform_batch_rescore(xmodule_instance_args, create_subtask_fcn, fallback_fcn,
+                          entry_id, course_id, task_input, action_name):
+    """
+    Rescores a capa problem for all learners who have submitted answers to it.
+
+    Problems with no more than settings.RESCORE_MODULES_PER_TASK submissions are
+    rescored inline, updating the task's progress as each batch is saved.
+    Larger ones are split into chunks of StudentModule ids that are handed to
+    subtasks constructed by `create_subtask_fcn`, a function taking the list of
+    items for a subtask and its initial SubtaskStatus.
+
+    Rescoring a single learner, an entrance exam, or a problem that does not
+    support batch rescoring is delegated to `fallback_fcn`, which takes the
+    same trailing arguments as this function (see `perform_module_state_update`).
+
+    Returns the task progress dict.
+    """
+    problem_url = task_input.get('problem_url')
+    if not problem_url or task_input.get('student') is not None or task_input.get('entrance_exam_url'):
+        return fallback_fcn(entry_id, course_id, task_input, action_name)
+
+    start_time = time()
+    usage_key = course_id.make_usage_key_from_deprecated_string(problem_url)
+    module_descriptor = modulestore().get_item(usage_key)
+    if not CapaBatchRescorer.supports(module_descriptor):
+        return fallback_fcn(entry_id, course_id, task_input, action_name)
+
+    modules_to_update = _modules_to_rescore(course_id, usage_key)
+    total = modules_to_update.count()
+
+    if total > settings.RESCORE_MODULES_PER_TASK:
+        entry = InstructorTask.objects.get(pk=entry_id)
+        return queue_subtasks_for_query(
+            entry,
+            action_name,
+            create_subtask_fcn,
+            [modules_to_update],
+            [],
+            settings.RESCORE_MODULES_PER_TASK,
+            total,
+        )
+
+    task_progress = TaskProgress(action_name, total, start_time)
+    task_progress.update_task_state()
+    with dog_stats_api.timer('instructor_tasks.batch_rescore.time.overall'):
+        with modulestore().bulk_operations(course_id):
+            rescore_student_modules(
+                xmodule_instance_args, module_descriptor, modules_to_update, task_input, task_progress
+            )
+    return task_progress.update_task_state()
+
+
+def run_batch_rescore_subtask(entry_id, module_ids, xmodule_instance_args, subtask_status_dict):
+    """
+    Rescores the StudentModules with ids in `module_ids`, as one subtask of the
+    instructor task `entry_id`, and records the outcome in the parent task.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    task_input = json.loads(entry.task_input)
+    usage_key = course_id.make_usage_key_from_deprecated_string(task_input['problem_url'])
+
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+    try:
+        module_descriptor = modulestore().get_item(usage_key)
+        student_modules = _modules_to_rescore(course_id, usage_key).filter(id__in=module_ids)
+        with dog_stats_api.timer('instructor_tasks.batch_rescore.time.subtask'):
+            with modulestore().bulk_operations(course_id):
+                rescore_student_modules(
+                    xmodule_instance_args, module_descriptor, student_modules, task_input, subtask_status
+                )
+    except Exception:
+        TASK_LOG.exception("Rescore subtask %s for instructor task %s: failed unexpectedly!", current_task_id, entry_id)
+        unprocessed = len(module_ids) - subtask_status.attempted - subtask_status.skipped
+        subtask_status.increment(failed=max(unprocessed, 0), state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
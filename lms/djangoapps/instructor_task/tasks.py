@@ -27,6 +27,7 @@ from django.utils.translation import ugettext_noop
 
 from celery import task
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.batch_rescore import perform_batch_rescore, run_batch_rescore_subtask
 from lms.djangoapps.instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
@@ -80,9 +81,37 @@ def rescore_problem(entry_id, xmodule_instance_args):
         return modules_to_update.filter(state__contains='"done": true')
 
     visit_fcn = partial(perform_module_state_update, update_fcn, filter_fcn)
+
+    if settings.FEATURES.get('ENABLE_BATCH_RESCORE'):
+        def _create_rescore_subtask(item_list, initial_subtask_status):
+            """Creates a subtask to rescore the StudentModules in `item_list`."""
+            return rescore_problem_subtask.subtask(
+                (
+                    entry_id,
+                    [item['pk'] for item in item_list],
+                    xmodule_instance_args,
+                    initial_subtask_status.to_dict(),
+                ),
+                task_id=initial_subtask_status.task_id,
+            )
+
+        visit_fcn = partial(perform_batch_rescore, xmodule_instance_args, _create_rescore_subtask, visit_fcn)
+
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task  # pylint: disable=not-callable
+def rescore_problem_subtask(entry_id, module_ids, xmodule_instance_args, subtask_status_dict):
+    """Rescores a chunk of StudentModules for a problem, as a subtask of `rescore_problem`.
+
+    `module_ids` are the ids of the StudentModule entries to rescore, and
+    `subtask_status_dict` is the initial SubtaskStatus of this subtask.  The
+    problem to rescore is read from the `task_input` of the InstructorTask
+    entry `entry_id`, to which progress is reported.
+    """
+    return run_batch_rescore_subtask(entry_id, module_ids, xmodule_instance_args, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def reset_problem_attempts(entry_id, xmodule_instance_args):
     """Resets problem attempts to zero for a particular problem for all students in a course.
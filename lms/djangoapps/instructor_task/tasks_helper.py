@@ -60,11 +60,11 @@ from shoppingcart.models import (
 from openassessment.data import OraAggregateData
 from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from openedx.core.djangoapps.course_groups.cohorts import get_cohort_ids_for_users, get_cohort_names
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from opaque_keys.edx.keys import UsageKey
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
-from student.models import CourseEnrollment, CourseAccessRole
+from openedx.core.djangoapps.course_groups.cohorts import add_users_to_cohort, is_course_cohorted
+from student.models import CourseEnrollment, CourseAccessRole, get_user_by_username_or_email
 from survey.models import SurveyAnswer
 from track.event_transaction_utils import set_event_transaction_type, create_new_event_transaction_id
 from track.views import task_track
@@ -732,6 +732,10 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
     whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
+    if course_is_cohorted:
+        cohort_names = get_cohort_names(course)
+        student_cohort_ids = get_cohort_ids_for_users(course_id, enrolled_students.values_list('id', flat=True))
+
     # Loop over all our students and build our CSV lists in memory
     rows = []
     err_rows = [["id", "username", "error_msg"]]
@@ -792,8 +796,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
         cohorts_group_name = []
         if course_is_cohorted:
-            group = get_cohort(student, course_id, assign=False)
-            cohorts_group_name.append(group.name if group else '')
+            cohorts_group_name.append(cohort_names.get(student_cohort_ids.get(student.id), ''))
 
         group_configs_group_names = []
         for partition in experiment_partitions:
@@ -1523,6 +1526,36 @@ def generate_students_certificates(
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+# Number of rows of a cohorts CSV whose students are looked up and added to
+# their cohorts together.
+COHORT_CSV_CHUNK_SIZE = 1000
+
+
+def _get_users_by_username_or_email(usernames_or_emails):
+    """
+    Returns a dict of the given usernames and emails to the users they
+    identify, as `get_user_by_username_or_email` looks them up.  Those that
+    don't identify a user are left out.
+    """
+    usernames_or_emails = set(usernames_or_emails)
+    emails = [value for value in usernames_or_emails if '@' in value]
+    usernames = [value for value in usernames_or_emails if '@' not in value]
+    users = {}
+    if emails:
+        users.update((user.email, user) for user in User.objects.filter(email__in=emails))
+    if usernames:
+        users.update((user.username, user) for user in User.objects.filter(username__in=usernames))
+
+    # The database may match values that differ in case from those stored,
+    # so the rest are looked up one by one.
+    for username_or_email in usernames_or_emails - set(users):
+        try:
+            users[username_or_email] = get_user_by_username_or_email(username_or_email)
+        except User.DoesNotExist:
+            pass
+    return {value: users[value] for value in usernames_or_emails if value in users}
+
+
 def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     Within a given course, cohort students in bulk, then upload the results
@@ -1548,7 +1581,39 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     # redundant cohort queries.
     cohorts_status = {}
 
+    def add_students_to_cohorts(rows):
+        """
+        Adds the students of the given (username_or_email, cohort_name) rows
+        to their cohorts, a cohort at a time.
+
+        A student who is in more than one of the rows is only added to the
+        cohort of a later row once the earlier ones have been handled, so
+        that the rows have the same effect as if they were handled in order.
+        """
+        users = _get_users_by_username_or_email(username_or_email for username_or_email, __ in rows)
+        rounds = [OrderedDict()]
+        for username_or_email, cohort_name in rows:
+            user = users.get(username_or_email)
+            if user is None:
+                cohorts_status[cohort_name]['Students Not Found'].add(username_or_email)
+                task_progress.failed += 1
+                continue
+            if any(user.id in cohort_users for cohort_users in rounds[-1].itervalues()):
+                rounds.append(OrderedDict())
+            rounds[-1].setdefault(cohort_name, OrderedDict())[user.id] = user
+
+        for users_by_cohort in rounds:
+            for cohort_name, cohort_users in users_by_cohort.iteritems():
+                added, present = add_users_to_cohort(cohorts_status[cohort_name]['cohort'], cohort_users.values())
+                cohorts_status[cohort_name]['Students Added'] += len(added)
+                task_progress.succeeded += len(added)
+                # Users already in the given cohort are skipped
+                task_progress.skipped += len(present)
+
+        task_progress.update_task_state(extra_meta=current_step)
+
     with DefaultStorage().open(task_input['file_name']) as f:
+        pending_rows = []
         for row in unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'):
             # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
             username_or_email = row.get('email') or row.get('username')
@@ -1575,18 +1640,13 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                 task_progress.failed += 1
                 continue
 
-            try:
-                add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                cohorts_status[cohort_name]['Students Added'] += 1
-                task_progress.succeeded += 1
-            except User.DoesNotExist:
-                cohorts_status[cohort_name]['Students Not Found'].add(username_or_email)
-                task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
-                task_progress.skipped += 1
+            pending_rows.append((username_or_email, cohort_name))
+            if len(pending_rows) >= COHORT_CSV_CHUNK_SIZE:
+                add_students_to_cohorts(pending_rows)
+                pending_rows = []
 
-            task_progress.update_task_state(extra_meta=current_step)
+        if pending_rows:
+            add_students_to_cohorts(pending_rows)
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
@@ -14,12 +14,15 @@ from nose.plugins.attrib import attr
 import textwrap
 
 from celery.states import SUCCESS, FAILURE
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
 
 from openedx.core.djangoapps.util.testing import TestConditionalContent
 from capa.tests.response_xml_factory import (CodeResponseXMLFactory,
                                              CustomResponseXMLFactory)
+from xmodule.capa_module import CapaModule
 from xmodule.modulestore.tests.factories import ItemFactory
 from xmodule.modulestore import ModuleStoreEnum
 
@@ -31,6 +34,7 @@ from lms.djangoapps.instructor_task.api import (
     submit_reset_problem_attempts_for_all_students,
     submit_delete_problem_state_for_all_students
 )
+from lms.djangoapps.instructor_task.batch_rescore import CapaBatchRescorer
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks_helper import upload_grades_csv
 from lms.djangoapps.instructor_task.tests.test_base import (
@@ -433,6 +437,45 @@ class TestRescoringTask(TestIntegrationTask):
             self.check_state(user, descriptor, 0, 1, expected_attempts=2)
 
 
+@attr(shard=3)
+@patch.dict(settings.FEATURES, {'ENABLE_BATCH_RESCORE': True})
+class TestBatchRescoringTask(TestRescoringTask):
+    """
+    Runs the rescoring scenarios against the batch rescoring path, which
+    grades all learners sharing a seed against a single problem instance.
+    """
+
+    @override_settings(RESCORE_MODULES_PER_TASK=1)
+    def test_rescoring_option_problem_in_subtasks(self):
+        """Rescoring more learners than fit in one subtask fans out across subtasks."""
+        self.verify_rescore_results(
+            dict(correct_answer=OPTION_2), (0, 1, 1, 2), 2, rescore_if_higher=False,
+        )
+        instructor_task = InstructorTask.objects.filter(task_type='rescore_problem').latest('id')
+        self.assertEqual(instructor_task.task_state, SUCCESS)
+        self.assertEqual(json.loads(instructor_task.subtasks)['total'], len(self.users))
+        status = json.loads(instructor_task.task_output)
+        self.assertEqual(status['attempted'], len(self.users))
+        self.assertEqual(status['succeeded'], len(self.users))
+
+    def test_problem_built_once_per_seed(self):
+        """Learners sharing a seed are graded against the same problem instance."""
+        problem_url_name = 'H1P1'
+        self.define_option_problem(problem_url_name)
+        for user in self.users:
+            self.submit_student_answer(user.username, problem_url_name, [OPTION_1, OPTION_1])
+        self.redefine_option_problem(problem_url_name, correct_answer=OPTION_2)
+
+        with patch('lms.djangoapps.instructor_task.batch_rescore.CapaBatchRescorer.problem_for_seed',
+                   autospec=True, side_effect=CapaBatchRescorer.problem_for_seed) as mock_problem_for_seed:
+            with patch('xmodule.capa_module.CapaModule.new_lcp', autospec=True, side_effect=CapaModule.new_lcp) as mock_new_lcp:
+                self.submit_rescore_all_student_answers('instructor', problem_url_name)
+
+        self.assertEqual(mock_problem_for_seed.call_count, len(self.users))
+        # One problem for the template module, and one for the (single) seed.
+        self.assertEqual(mock_new_lcp.call_count, 2)
+
+
 class TestResetAttemptsTask(TestIntegrationTask):
     """
     Integration-style tests for resetting problem attempts in a background task.
@@ -1488,6 +1488,31 @@ class TestCohortStudents(TestReportMixin, InstructorTaskCourseTestCase):
             verify_order=False
         )
 
+    def test_same_user_in_several_rows(self):
+        """
+        Test that the rows of a student are applied in order, even when they
+        identify the student differently.
+        """
+        result = self._cohort_students_and_upload(
+            u'username,email,cohort\n'
+            u'student_1\xec,,Cohort 1\n'
+            u',student_1@example.com,Cohort 2\n'
+            u'student_2,,Cohort 2\n'
+            u'student_2,,Cohort 2'
+        )
+        self.assertDictContainsSubset(
+            {'total': 4, 'attempted': 4, 'succeeded': 3, 'skipped': 1, 'failed': 0}, result
+        )
+        self.verify_rows_in_csv(
+            [
+                dict(zip(self.csv_header_row, ['Cohort 1', 'True', '1', ''])),
+                dict(zip(self.csv_header_row, ['Cohort 2', 'True', '2', ''])),
+            ],
+            verify_order=False
+        )
+        self.assertEqual(set(self.cohort_2.users.all()), {self.student_1, self.student_2})
+        self.assertFalse(self.cohort_1.users.exists())
+
     def test_move_users_to_same_cohort(self):
         membership1 = CohortMembership(course_user_group=self.cohort_1, user=self.student_1)
         membership1.save()
@@ -0,0 +1,132 @@
+"""
+Opt-in caching of the fragments rendered by xblock views in the LMS.
+
+A block class opts in by setting `student_view_cache_vary_on` to a tuple of
+the names in USER_VARIANCE_KEYS that its student_view output depends on,
+besides the block's own content and settings and the request language.
+Blocks that leave it as None are always rendered.
+
+The render context is part of the key, except for the keys in
+PER_USER_CONTEXT_KEYS, which parents such as verticals add for every learner.
+A block whose output uses them must declare 'user_id' instead, so that the
+fragments of blocks that don't can be shared by all learners.
+
+The cached value is the fragment returned by the view, before the runtime
+wrappers are applied, so per-request markup such as the request token is
+never cached.
+"""
+import hashlib
+import json
+
+from django.utils import translation
+from xblock.fields import Scope, UserScope
+
+import dogstats_wrapper as dog_stats_api
+from request_cache.middleware import RequestCache
+
+
+# The views whose output may be cached.
+CACHEABLE_VIEWS = ('student_view',)
+
+# The render context keys that identify the learner, which are left out of
+# the cache key.
+PER_USER_CONTEXT_KEYS = ('username', 'bookmarked')
+
+FRAGMENT_CACHE_METRIC_NAME = 'lms.xblock.fragment_cache'
+FRAGMENT_CACHE_STATS_NAME = 'lms_xblock.fragment_cache_stats'
+
+
+def _user_state(runtime, block):  # pylint: disable=unused-argument
+    """
+    Returns the values of the block's fields that are stored per user.
+    """
+    return {
+        name: field.read_json(block)
+        for name, field in block.fields.iteritems()
+        if field.scope.user != UserScope.NONE
+    }
+
+
+# The learner properties a block may declare its output depends on, mapped to
+# functions of (runtime, block) returning their value.
+USER_VARIANCE_KEYS = {
+    'user_id': lambda runtime, block: getattr(runtime, 'user_id', None),
+    'anonymous_student_id': lambda runtime, block: getattr(runtime, 'anonymous_student_id', None),
+    'user_is_staff': lambda runtime, block: getattr(runtime, 'user_is_staff', False),
+    'user_location': lambda runtime, block: getattr(runtime, 'user_location', None),
+    'user_state': _user_state,
+}
+
+
+def _block_version(block):
+    """
+    Returns the values of the block's content and settings fields, which
+    includes any overrides applied to them for the current user.
+    """
+    return {
+        name: field.read_json(block)
+        for name, field in block.fields.iteritems()
+        if field.scope in (Scope.content, Scope.settings, Scope.children)
+    }
+
+
+def get_cache_key(runtime, block, view_name, context):
+    """
+    Returns the key to cache the output of `view_name` for `block` under,
+    or None if it must not be cached.
+    """
+    vary_on = getattr(block, 'student_view_cache_vary_on', None)
+    if vary_on is None or view_name not in CACHEABLE_VIEWS:
+        return None
+
+    unknown_keys = set(vary_on) - set(USER_VARIANCE_KEYS)
+    if unknown_keys:
+        raise ValueError(u'Unknown fragment cache variance keys {} on {}'.format(
+            sorted(unknown_keys), block.scope_ids.block_type
+        ))
+
+    context = {
+        key: value for key, value in (context or {}).iteritems()
+        if key not in PER_USER_CONTEXT_KEYS
+    }
+    try:
+        key_data = json.dumps(
+            [
+                unicode(block.scope_ids.usage_id),
+                view_name,
+                translation.get_language(),
+                context,
+                _block_version(block),
+                {key: USER_VARIANCE_KEYS[key](runtime, block) for key in vary_on},
+            ],
+            sort_keys=True,
+        )
+    except TypeError:
+        # The context or a field value can't be serialized, so there is
+        # nothing stable to key the fragment on.
+        return None
+
+    return u'lms_xblock.fragment.{}'.format(hashlib.sha1(key_data).hexdigest())
+
+
+def record_lookup(block, view_name, hit):
+    """
+    Records the result of a fragment cache lookup for `block`.
+    """
+    stats = RequestCache.get_request_cache(FRAGMENT_CACHE_STATS_NAME)
+    result = 'hit' if hit else 'miss'
+    stats[result] = stats.get(result, 0) + 1
+
+    dog_stats_api.increment(FRAGMENT_CACHE_METRIC_NAME, tags=[
+        u'result:{}'.format(result),
+        u'view_name:{}'.format(view_name),
+        u'block_type:{}'.format(block.scope_ids.block_type),
+    ])
+
+
+def get_request_stats():
+    """
+    Returns the number of fragment cache hits and misses in the current request.
+    """
+    stats = RequestCache.get_request_cache(FRAGMENT_CACHE_STATS_NAME)
+    return stats.get('hit', 0), stats.get('miss', 0)
@@ -10,6 +10,7 @@ from openedx.core.djangoapps.user_api.course_tag import api as user_course_tag_a
 from openedx.core.lib.xblock_utils import xblock_local_resource_url
 from openedx.core.lib.url_utils import quote_slashes
 from request_cache.middleware import RequestCache
+from web_fragments.fragment import Fragment
 import xblock.reference.plugins
 from xmodule.library_tools import LibraryToolsService
 from xmodule.modulestore.django import modulestore, ModuleI18nService
@@ -17,6 +18,7 @@ from xmodule.partitions.partitions_service import PartitionService
 from xmodule.services import SettingsService
 from xmodule.x_module import ModuleSystem
 
+from lms.djangoapps.lms_xblock import fragment_cache
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
 
 
@@ -166,8 +168,46 @@ class LmsModuleSystem(ModuleSystem):  # pylint: disable=abstract-method
         if badges_enabled():
             services['badging'] = BadgingService(course_id=kwargs.get('course_id'), modulestore=store)
         self.request_token = kwargs.pop('request_token', None)
+        self.fragment_cache = kwargs.pop('fragment_cache', None)
+        self._pending_fragment_cache_keys = {}
         super(LmsModuleSystem, self).__init__(**kwargs)
 
+    def render(self, block, view_name, context=None):
+        """
+        Renders `block`, using the fragment cache if the block allows it.
+
+        See :mod:`lms.djangoapps.lms_xblock.fragment_cache`.
+        """
+        cache_key = None
+        if self.fragment_cache is not None and not self.applicable_aside_types(block):
+            cache_key = fragment_cache.get_cache_key(self, block, view_name, context)
+        if cache_key is None:
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+
+        cached_fragment = self.fragment_cache.get(cache_key)
+        fragment_cache.record_lookup(block, view_name, hit=cached_fragment is not None)
+        if cached_fragment is not None:
+            return self.wrap_xblock(block, view_name, Fragment.from_dict(cached_fragment), context)
+
+        # The unwrapped fragment is cached by wrap_xblock, which the
+        # runtime calls with the output of the view.
+        pending_key = (block.scope_ids.usage_id, view_name)
+        self._pending_fragment_cache_keys[pending_key] = cache_key
+        try:
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+        finally:
+            self._pending_fragment_cache_keys.pop(pending_key, None)
+
+    def wrap_xblock(self, block, view, frag, context):
+        """
+        Caches the view output of blocks being rendered through the
+        fragment cache, then applies the wrappers.
+        """
+        cache_key = self._pending_fragment_cache_keys.pop((block.scope_ids.usage_id, view), None)
+        if cache_key is not None:
+            self.fragment_cache.set(cache_key, frag.to_dict(), settings.XBLOCK_FRAGMENT_CACHE_TIMEOUT)
+        return super(LmsModuleSystem, self).wrap_xblock(block, view, frag, context)
+
     def handler_url(self, *args, **kwargs):
         """
         Implement the XBlock runtime handler_url interface.
@@ -116,6 +116,9 @@ CELERYBEAT_SCHEDULE = {}  # For scheduling tasks, entries can be added to this d
 with open(CONFIG_ROOT / CONFIG_PREFIX + "env.json") as env_file:
     ENV_TOKENS = json.load(env_file)
 
+# MAKO_PRECOMPILED_MODULE_DIR holds the templates compiled at build time
+MAKO_PRECOMPILED_MODULE_DIR = ENV_TOKENS.get('MAKO_PRECOMPILED_MODULE_DIR', MAKO_PRECOMPILED_MODULE_DIR)
+
 # STATIC_ROOT specifies the directory where static files are
 # collected
 STATIC_ROOT_BASE = ENV_TOKENS.get('STATIC_ROOT_BASE', None)
@@ -255,6 +258,11 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
     'BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS',
     BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
 )
+BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
+    'BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS',
+    BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS
+)
+BULK_EMAIL_REUSE_CONNECTION = ENV_TOKENS.get('BULK_EMAIL_REUSE_CONNECTION', BULK_EMAIL_REUSE_CONNECTION)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -267,6 +275,14 @@ BULK_EMAIL_ROUTING_KEY_SMALL_JOBS = ENV_TOKENS.get('BULK_EMAIL_ROUTING_KEY_SMALL
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = ENV_TOKENS.get('RECALCULATE_GRADES_ROUTING_KEY', LOW_PRIORITY_QUEUE)
 
+# Batch rescoring overrides
+RESCORE_MODULES_PER_TASK = ENV_TOKENS.get('RESCORE_MODULES_PER_TASK', RESCORE_MODULES_PER_TASK)
+RESCORE_SAVE_BATCH_SIZE = ENV_TOKENS.get('RESCORE_SAVE_BATCH_SIZE', RESCORE_SAVE_BATCH_SIZE)
+
+PROBLEM_HTML_CACHE_TIMEOUT = ENV_TOKENS.get('PROBLEM_HTML_CACHE_TIMEOUT', PROBLEM_HTML_CACHE_TIMEOUT)
+SYMBOLIC_CHECK_TIMEOUT = ENV_TOKENS.get('SYMBOLIC_CHECK_TIMEOUT', SYMBOLIC_CHECK_TIMEOUT)
+XBLOCK_FRAGMENT_CACHE_TIMEOUT = ENV_TOKENS.get('XBLOCK_FRAGMENT_CACHE_TIMEOUT', XBLOCK_FRAGMENT_CACHE_TIMEOUT)
+
 # Message expiry time in seconds
 CELERY_EVENT_QUEUE_TTL = ENV_TOKENS.get('CELERY_EVENT_QUEUE_TTL', None)
 
@@ -339,6 +355,12 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_CONNECTION_POOL_SIZE = ENV_TOKENS.get(
+    "COMMENTS_SERVICE_CONNECTION_POOL_SIZE", COMMENTS_SERVICE_CONNECTION_POOL_SIZE
+)
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    "COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS", COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS
+)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get('ZENDESK_URL', ZENDESK_URL)
 ZENDESK_CUSTOM_FIELDS = ENV_TOKENS.get('ZENDESK_CUSTOM_FIELDS', ZENDESK_CUSTOM_FIELDS)
@@ -551,6 +573,7 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 # use the one from common.py
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
+CONTENTSERVER.update(ENV_TOKENS.get('CONTENTSERVER', {}))
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
@@ -798,6 +821,10 @@ if FEATURES.get('CUSTOM_COURSES_EDX'):
         'lms.djangoapps.ccx.overrides.CustomCoursesForEdxOverrideProvider',
     )
 CCX_MAX_STUDENTS_ALLOWED = ENV_TOKENS.get('CCX_MAX_STUDENTS_ALLOWED', CCX_MAX_STUDENTS_ALLOWED)
+CCX_OVERRIDES_CACHE_TIMEOUT = ENV_TOKENS.get('CCX_OVERRIDES_CACHE_TIMEOUT', CCX_OVERRIDES_CACHE_TIMEOUT)
+CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT', CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT
+)
 
 ##### Individual Due Date Extensions #####
 if FEATURES.get('INDIVIDUAL_DUE_DATES'):
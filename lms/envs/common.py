@@ -59,6 +59,12 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# How many connections to the comments service each process keeps open for
+# reuse (0 opens a new connection for every request), and how many requests
+# to it a page may make at once.
+COMMENTS_SERVICE_CONNECTION_POOL_SIZE = 10
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = 4
+
 LMS_ROOT_URL = "http://localhost:8000"
 ENTERPRISE_API_URL = LMS_ROOT_URL + '/enterprise/api/v1/'
 
@@ -160,6 +166,21 @@ FEATURES = {
     # Enable instructor dash to submit background tasks
     'ENABLE_INSTRUCTOR_BACKGROUND_TASKS': True,
 
+    # Rescore all learners' submissions to a capa problem by grading them in
+    # batches against one problem instance per random seed, instead of
+    # instantiating the problem once per learner.
+    'ENABLE_BATCH_RESCORE': False,
+
+    # Cache the rendered html of capa problems, keyed on the problem
+    # definition and the learner's state, so that unchanged problems are not
+    # re-rendered on every page view.
+    'ENABLE_PROBLEM_HTML_CACHE': False,
+
+    # Cache the student_view output of blocks that declare it cacheable
+    # (student_view_cache_vary_on), keyed on the block's content, the request
+    # language and the learner properties the block depends on.
+    'ENABLE_XBLOCK_FRAGMENT_CACHE': False,
+
     # Enable instructor to assign individual due dates
     # Note: In order for this feature to work, you must also add
     # 'courseware.student_field_overrides.IndividualStudentOverrideProvider' to
@@ -478,6 +499,10 @@ OAUTH2_PROVIDER_APPLICATION_MODEL = 'oauth2_provider.Application'
 # TODO: Move the Mako templating into a different engine in TEMPLATES below.
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_lms')
+# A directory of templates compiled ahead of time by the precompile_mako_templates
+# command, shared read-only by all the servers.  Templates missing from it are
+# compiled into MAKO_MODULE_DIR.
+MAKO_PRECOMPILED_MODULE_DIR = None
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [
     PROJECT_ROOT / 'templates',
@@ -772,6 +797,26 @@ MODULESTORE = {
     }
 }
 
+############################## Course assets ##################################
+
+# Course assets larger than MAX_CACHED_SIZE bytes are streamed from the
+# contentstore rather than cached whole.  If DISK_CACHE_ROOT is set to a local
+# directory, the data of the assets served is cached there instead, up to
+# DISK_CACHE_MAX_SIZE bytes, and only their metadata is cached in memcached.
+# If SENDFILE_HEADER is also set, assets of at least SENDFILE_MIN_SIZE bytes
+# are served by the front-end proxy: the contentserver answers with that
+# header ('X-Accel-Redirect' for nginx) set to the path of the copy under
+# SENDFILE_URL_PREFIX, an internal location the proxy maps to DISK_CACHE_ROOT,
+# or to its absolute path if SENDFILE_URL_PREFIX is None, as X-Sendfile expects.
+CONTENTSERVER = {
+    'MAX_CACHED_SIZE': 1048576,
+    'DISK_CACHE_ROOT': None,
+    'DISK_CACHE_MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    'SENDFILE_HEADER': None,
+    'SENDFILE_MIN_SIZE': 1048576,
+    'SENDFILE_URL_PREFIX': '/protected-course-assets/',
+}
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1870,11 +1915,48 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Maximum delay in seconds between individual mail messages being sent.
+# Each time sending is throttled, a worker doubles its delay between sends,
+# starting from BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS, up to this value, and
+# reduces it again as messages are sent successfully.
+BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS = 1.0
+
+# Flag to indicate if a worker should keep its connection to the email
+# backend open for its next bulk email task, rather than connect for each
+# task.
+BULK_EMAIL_REUSE_CONNECTION = True
+
 ############################# Persistent Grades ####################################
 
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = LOW_PRIORITY_QUEUE
 
+############################# Instructor Task ####################################
+
+# Number of StudentModule entries handed to each subtask when a problem
+# is rescored for all learners with the batch rescoring path.
+RESCORE_MODULES_PER_TASK = 1000
+
+# Number of rescored StudentModule entries written in a single transaction.
+RESCORE_SAVE_BATCH_SIZE = 100
+
+############################# Capa Problems ####################################
+
+# How long, in seconds, rendered problem html is cached when
+# FEATURES['ENABLE_PROBLEM_HTML_CACHE'] is enabled.
+PROBLEM_HTML_CACHE_TIMEOUT = 60 * 60
+
+# If set, symbolic math answers (symbolicresponse) are checked in a separate
+# process, and abandoned after this many seconds, so that a slow
+# simplification cannot tie up a web worker.
+SYMBOLIC_CHECK_TIMEOUT = None
+
+############################# XBlock Fragments #################################
+
+# How long, in seconds, block student_view fragments are cached when
+# FEATURES['ENABLE_XBLOCK_FRAGMENT_CACHE'] is enabled.
+XBLOCK_FRAGMENT_CACHE_TIMEOUT = 5 * 60
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2978,6 +3060,15 @@ PROCTORING_SETTINGS = {}
 # to compete with the MOOC.
 CCX_MAX_STUDENTS_ALLOWED = 200
 
+# How long, in seconds, the field overrides of a CCX are kept in the cache.
+# Changing an override invalidates them immediately.
+CCX_OVERRIDES_CACHE_TIMEOUT = 60 * 60 * 24
+
+# How long, in seconds, each process reuses the field overrides of a CCX
+# without checking the cache for changes.  Other processes may take up to
+# this long to see a coach's changes.
+CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT = 5
+
 # Financial assistance settings
 
 # Maximum and minimum length of answers, in characters, for the
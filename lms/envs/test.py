@@ -60,6 +60,18 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Tests mock requests.request to fake the comments service, so don't send
+# requests to it through a pooled session.
+COMMENTS_SERVICE_CONNECTION_POOL_SIZE = 0
+
+# Tests mock the email backend connection of each bulk email task, so don't
+# reuse one connection across tasks.
+BULK_EMAIL_REUSE_CONNECTION = False
+
+# Don't let tests that throttle sending slow down the emails of later tests
+# by more than the delay of a retried task.
+BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS = BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
@@ -550,6 +562,8 @@ FACEBOOK_API_VERSION = "v2.2"
 ######### custom courses #########
 INSTALLED_APPS += ('lms.djangoapps.ccx', 'openedx.core.djangoapps.ccxcon')
 FEATURES['CUSTOM_COURSES_EDX'] = True
+# Tests reuse CCX ids, so don't keep overrides around in the process.
+CCX_OVERRIDES_LOCAL_CACHE_TIMEOUT = 0
 
 # Set dummy values for profile image settings.
 PROFILE_IMAGE_BACKEND = {
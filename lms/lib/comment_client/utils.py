@@ -1,15 +1,40 @@
 """" Common utilities for comment client wrapper """
 from contextlib import contextmanager
+import copy
 import dogstats_wrapper as dog_stats_api
+import json
 import logging
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+import crum
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
+import request_cache
+
 log = logging.getLogger(__name__)
 
+# The name of the request cache that holds the ForumsConfig and the responses
+# to GET requests to the comments service for the current request.
+REQUEST_CACHE_NAME = 'comment_client'
+
+# The requests Sessions and thread pools of this process, keyed by their
+# type, process id and size, so that a forked process doesn't use its
+# parent's.
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+# The request cache, ForumsConfig and language of the request that a thread
+# of the pool is making calls for.
+_CALLER = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -51,11 +76,138 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
-def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+def _in_pool():
+    """
+    Returns whether the current thread is one of the pool's.
+    """
+    return getattr(_CALLER, 'in_pool', False)
+
+
+def _request_cache():
+    """
+    Returns the request cache of the current request, or None outside of a
+    request.
+    """
+    if _in_pool():
+        return _CALLER.request_cache
+    if crum.get_current_request() is None:
+        return None
+    return request_cache.get_cache(REQUEST_CACHE_NAME)
+
+
+def _forums_config(cache):
+    """
+    Returns the current ForumsConfig, which is only read once per request.
+    """
+    if _in_pool():
+        return _CALLER.config
+
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    if cache is None:
+        return ForumsConfig.current()
+    if 'config' not in cache:
+        cache['config'] = ForumsConfig.current()
+    return cache['config']
+
+
+def _get_pool(factory, size):
+    """
+    Returns the pool of the given size that `factory` creates, creating it
+    the first time it is needed in this process.
+    """
+    key = (factory, os.getpid(), size)
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = factory(size)
+        return _POOLS[key]
+
+
+def _create_session(pool_size):
+    """
+    Returns a requests Session that keeps up to `pool_size` connections to
+    each host open, and reuses them.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _send_request(method, url, **kwargs):
+    """
+    Sends a request to the comments service.
+
+    Connections are reused when settings.COMMENTS_SERVICE_CONNECTION_POOL_SIZE
+    is set; otherwise each request opens a new connection.
+    """
+    pool_size = getattr(settings, 'COMMENTS_SERVICE_CONNECTION_POOL_SIZE', 0)
+    if not pool_size:
+        return requests.request(method, url, **kwargs)
+    return _get_pool(_create_session, pool_size).request(method, url, **kwargs)
+
+
+def _response_key(url, params, raw, language):
+    """
+    Returns the request cache key of the response to a GET request.
+    """
+    params = {key: value for key, value in params.iteritems() if key != 'request_id'}
+    return (url, json.dumps(params, sort_keys=True, default=unicode), raw, language)
+
+
+def _call_for(func, cache, config, language):
+    """
+    Calls `func` in a thread of the pool, for the request whose request cache,
+    ForumsConfig and language are given.
+    """
+    _CALLER.in_pool = True
+    _CALLER.request_cache = cache
+    _CALLER.config = config
+    try:
+        with translation.override(language):
+            return func()
+    finally:
+        _CALLER.in_pool = False
+        _CALLER.request_cache = _CALLER.config = None
+
+
+def perform_concurrently(*funcs):
+    """
+    Calls independent functions that make requests to the comments service
+    at the same time, and returns their results in order.  For example::
+
+        thread, user = perform_concurrently(
+            lambda: cc.Thread.find(thread_id).retrieve(),
+            lambda: cc.User.from_django_user(request.user).retrieve(),
+        )
+
+    Up to settings.COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS of them are called
+    at once.  If any of them raises an exception, the exception of the first
+    of them that did is raised once they have all returned.
+    """
+    max_concurrent = getattr(settings, 'COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS', 1)
+    if len(funcs) < 2 or max_concurrent < 2 or _in_pool():
+        # Calls made from the pool itself are made in turn, so that they
+        # can't wait on each other for a thread of the pool.
+        return [func() for func in funcs]
+
+    # The ForumsConfig is read here, so that the threads of the pool don't
+    # open database connections of their own.
+    cache = _request_cache()
+    caller = (cache, _forums_config(cache), get_language())
+    pool = _get_pool(ThreadPool, max_concurrent)
+    with dog_stats_api.timer('comment_client.concurrent_requests.time', tags=[u'calls:{}'.format(len(funcs))]):
+        results = [pool.apply_async(_call_for, (func,) + caller) for func in funcs]
+        for result in results:
+            result.wait()
+    return [result.get() for result in results]
+
+
+def perform_request(method, url, data_or_params=None, raw=False,
+                    metric_action=None, metric_tags=None, paged_results=False):
+    cache = _request_cache()
+    config = _forums_config(cache)
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -82,8 +234,23 @@ def perform_request(method, url, data_or_params=None, raw=False,
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
+
+    # Identical GET requests made while handling a request are only sent once,
+    # until a request that may change what they return is sent.
+    responses = None
+    response_key = None
+    if cache is not None:
+        responses = cache.setdefault('responses', {})
+        if method.lower() == 'get':
+            response_key = _response_key(url, params, raw, headers['Accept-Language'])
+            if response_key in responses:
+                dog_stats_api.increment('comment_client.request.deduplicated', tags=metric_tags)
+                return copy.deepcopy(responses[response_key])
+        else:
+            responses.clear()
+
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = _send_request(
             method,
             url,
             data=data,
@@ -109,7 +276,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         raise CommentClient500Error(response.text)
     else:
         if raw:
-            return response.text
+            data = response.text
         else:
             try:
                 data = response.json()
@@ -136,7 +303,9 @@ def perform_request(method, url, data_or_params=None, raw=False,
                     value=data.get('num_pages', 1),
                     tags=metric_tags
                 )
-            return data
+        if response_key is not None:
+            responses[response_key] = copy.deepcopy(data)
+        return data
 
 
 class CommentClientError(Exception):
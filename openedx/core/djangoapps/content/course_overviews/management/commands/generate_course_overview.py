@@ -9,7 +9,9 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 
+from openedx.core.djangoapps.content.course_overviews import tasks
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.lib.command_utils import validate_dependent_option
 
 
 log = logging.getLogger(__name__)
@@ -20,6 +22,10 @@ class Command(BaseCommand):
     Example usage:
         $ ./manage.py lms generate_course_overview --all --settings=devstack
         $ ./manage.py lms generate_course_overview 'edX/DemoX/Demo_Course' --settings=devstack
+
+    With --enqueue_task, a task is enqueued for each course instead, so that
+    the celery workers generate and cache the overviews in parallel:
+        $ ./manage.py lms generate_course_overview --all --enqueue_task --settings=devstack
     """
     args = '<course_id course_id ...>'
     help = 'Generates and stores course overview for one or more courses.'
@@ -35,6 +41,18 @@ class Command(BaseCommand):
             default=False,
             help='Generate course overview for all courses.',
         )
+        parser.add_argument(
+            '--enqueue_task',
+            action='store_true',
+            dest='enqueue_task',
+            default=False,
+            help='Enqueue a task for each course, to generate the overviews asynchronously.',
+        )
+        parser.add_argument(
+            '--routing_key',
+            dest='routing_key',
+            help='Routing key to use for asynchronous generation.',
+        )
 
     def handle(self, *args, **options):
 
@@ -48,4 +66,14 @@ class Command(BaseCommand):
             except InvalidKeyError:
                 raise CommandError('Invalid key specified.')
 
-        CourseOverview.get_select_courses(course_keys)
+        validate_dependent_option(options, 'routing_key', 'enqueue_task')
+
+        if options.get('enqueue_task'):
+            task_options = {'routing_key': options['routing_key']} if options.get('routing_key') else {}
+            for course_key in course_keys:
+                tasks.generate_course_overview.apply_async(args=[unicode(course_key)], **task_options)
+            log.info('Enqueued course overview generation for %d courses.', len(course_keys))
+        else:
+            CourseOverview.get_select_courses(course_keys)
+            # Warm the shared cache that CourseOverview.get_from_ids reads.
+            CourseOverview.get_from_ids_if_exists(course_keys)
@@ -49,6 +49,37 @@ class TestGenerateCourseOverview(ModuleStoreTestCase):
         # CourseOverview will be populated with all courses in the modulestore
         self._assert_courses_in_overview(self.course_key_1, self.course_key_2)
 
+    @patch('openedx.core.djangoapps.content.course_overviews.tasks.generate_course_overview.apply_async')
+    def test_enqueue_all(self, mock_apply_async):
+        """
+        Test that a task is enqueued for each course when --enqueue_task is given.
+        """
+        self.command.handle(all=True, enqueue_task=True, routing_key='overviews')
+        self.assertItemsEqual(
+            [call[1]['args'][0] for call in mock_apply_async.call_args_list],
+            [unicode(self.course_key_1), unicode(self.course_key_2)],
+        )
+        for call in mock_apply_async.call_args_list:
+            self.assertEqual(call[1]['routing_key'], 'overviews')
+        self._assert_courses_not_in_overview(self.course_key_1, self.course_key_2)
+
+    def test_enqueue_all_eager(self):
+        """
+        Test that the enqueued tasks generate and cache the course overviews.
+        """
+        self.command.handle(all=True, enqueue_task=True)
+        self._assert_courses_in_overview(self.course_key_1, self.course_key_2)
+        with self.assertNumQueries(0):
+            overviews = CourseOverview.get_from_ids([self.course_key_1, self.course_key_2])
+        self.assertEqual(len(overviews), 2)
+
+    def test_routing_key_without_enqueue(self):
+        """
+        Test that --routing_key requires --enqueue_task.
+        """
+        with self.assertRaises(CommandError):
+            self.command.handle(all=True, routing_key='overviews')
+
     def test_generate_one(self):
         """
         Test that a specified course is loaded into course overviews.
@@ -5,9 +5,11 @@ import json
 import logging
 from urlparse import urlparse, urlunparse
 
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
+from django.dispatch import receiver
 from django.template import defaultfilters
 
 from ccx_keys.locator import CCXLocator
@@ -45,6 +47,19 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 4
 
+    # Overviews are also cached in the shared cache, under keys that include
+    # VERSION so that servers running different versions don't share entries.
+    # Saving or deleting an overview or its image set invalidates its entry,
+    # but that happens before the change is committed, so a request reading
+    # the overview in the meantime can cache its old value again.  The entries
+    # are kept briefly, so that such a stale entry doesn't last long.
+    CACHE_KEY_PREFIX = 'course_overviews.overview'
+    CACHE_TIMEOUT = 60 * 5
+
+    # How long a scheduled regeneration keeps others from being scheduled for
+    # the same course.
+    REGENERATION_LOCK_TIMEOUT = 60 * 5
+
     # Cache entry versioning.
     version = IntegerField()
 
@@ -284,18 +299,83 @@ class CourseOverview(TimeStampedModel):
         ones. It exists only as a small optimization used when CourseOverviews
         are known to exist, for common situations like the student dashboard.
 
+        Overviews are read from the shared cache, and those that aren't cached
+        are loaded from the database in a single query and cached.
+
         Callers should assume that this list is incomplete and fall back to
         get_from_id if they need to guarantee CourseOverview generation.
         """
-        return {
-            overview.id: overview
-            for overview
-            in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
-                version__gte=cls.VERSION
-            )
+        course_ids = set(course_ids)
+        if not course_ids:
+            return {}
+
+        cache_keys = {cls.cache_key(course_id): course_id for course_id in course_ids}
+        overviews = {
+            cache_keys[key]: overview
+            for key, overview in cache.get_many(cache_keys.keys()).iteritems()
+            if overview.version >= cls.VERSION
         }
 
+        missing_ids = course_ids - set(overviews)
+        if missing_ids:
+            loaded_overviews = {
+                overview.id: overview
+                for overview
+                in cls.objects.select_related('image_set').filter(
+                    id__in=missing_ids,
+                    version__gte=cls.VERSION
+                )
+            }
+            cache.set_many(
+                {cls.cache_key(course_id): overview for course_id, overview in loaded_overviews.iteritems()},
+                cls.CACHE_TIMEOUT
+            )
+            overviews.update(loaded_overviews)
+
+        return overviews
+
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, without ever
+        loading courses from the module store.
+
+        This is get_from_ids_if_exists, except that the overviews of courses
+        that are missing or outdated are regenerated by a background task.
+        They are left out of the returned dict, so callers that show many
+        courses, like the course catalog, should skip them or fall back to
+        get_from_id for the few they can't do without.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded.
+        """
+        course_ids = set(course_ids)
+        overviews = cls.get_from_ids_if_exists(course_ids)
+        for course_id in course_ids - set(overviews):
+            cls.schedule_regeneration(course_id)
+        return overviews
+
+    @classmethod
+    def schedule_regeneration(cls, course_id):
+        """
+        Enqueue a task to (re)generate the overview of the given course, unless
+        one was enqueued in the last REGENERATION_LOCK_TIMEOUT seconds.
+        """
+        # Import here to avoid a circular import, as the tasks use this model.
+        from openedx.core.djangoapps.content.course_overviews.tasks import generate_course_overview
+
+        lock_key = u'{}.regenerating.{}'.format(cls.CACHE_KEY_PREFIX, course_id)
+        if cache.add(lock_key, True, cls.REGENERATION_LOCK_TIMEOUT):
+            generate_course_overview.delay(unicode(course_id))
+
+    @classmethod
+    def cache_key(cls, course_id):
+        """
+        Return the key the overview of the given course is cached under.
+        """
+        return u'{}.{}.{}'.format(cls.CACHE_KEY_PREFIX, cls.VERSION, course_id)
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -753,6 +833,20 @@ class CourseOverviewImageSet(TimeStampedModel):
         )
 
 
+@receiver(models.signals.post_save, sender=CourseOverview)
+@receiver(models.signals.post_delete, sender=CourseOverview)
+def invalidate_course_overview_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the cached copy of a course overview. """
+    cache.delete(CourseOverview.cache_key(instance.id))
+
+
+@receiver(models.signals.post_save, sender=CourseOverviewImageSet)
+@receiver(models.signals.post_delete, sender=CourseOverviewImageSet)
+def invalidate_course_overview_image_set_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the cached copy of the course overview an image set belongs to. """
+    cache.delete(CourseOverview.cache_key(instance.course_overview_id))
+
+
 class CourseOverviewImageConfig(ConfigurationModel):
     """
     This sets the size of the thumbnail images that Course Overviews will generate
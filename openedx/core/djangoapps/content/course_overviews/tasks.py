@@ -0,0 +1,30 @@
+"""
+Asynchronous tasks for generating course overviews.
+"""
+import logging
+
+from celery.task import task
+from opaque_keys.edx.keys import CourseKey
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task()
+def generate_course_overview(course_id):
+    """
+    Generates and caches the CourseOverview of the specified course, if it
+    is missing or outdated.
+
+    Arguments:
+        course_id (string): the string serialized value of the course key.
+    """
+    course_key = CourseKey.from_string(course_id)
+    try:
+        course_overview = CourseOverview.get_from_id(course_key)
+    except CourseOverview.DoesNotExist:
+        log.info(u'Not generating the overview of course %s, which does not exist.', course_id)
+        return
+    # Warm the shared cache for the requests that scheduled this task.
+    CourseOverview.get_from_ids_if_exists([course_overview.id])
@@ -544,6 +544,50 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
         self.assertEqual(len(course_ids_to_overviews), 1)
         self.assertIn(course_with_overview_1.id, course_ids_to_overviews)
 
+    def test_get_from_ids_if_exists_cached(self):
+        courses = [CourseFactory.create(emit_signals=True) for __ in range(3)]
+        course_ids = [course.id for course in courses]
+
+        # The overviews are loaded in a single query, and then from the cache.
+        with self.assertNumQueries(1):
+            self.assertEqual(set(CourseOverview.get_from_ids_if_exists(course_ids)), set(course_ids))
+        with self.assertNumQueries(0):
+            course_ids_to_overviews = CourseOverview.get_from_ids_if_exists(course_ids)
+        self.assertEqual(course_ids_to_overviews[course_ids[0]].id, course_ids[0])
+
+        # Saving an overview invalidates its cache entry.
+        overview = course_ids_to_overviews[course_ids[0]]
+        overview.version = CourseOverview.VERSION - 1
+        overview.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(set(CourseOverview.get_from_ids_if_exists(course_ids)), set(course_ids[1:]))
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.tasks.generate_course_overview.delay')
+    def test_get_from_ids(self, mock_delay):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        course_ids = [course_with_overview.id, course_without_overview.id]
+
+        # Missing overviews are left out and regenerated in the background,
+        # without loading the course from the modulestore.
+        with check_mongo_calls(0):
+            course_ids_to_overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(course_ids_to_overviews.keys(), [course_with_overview.id])
+        mock_delay.assert_called_once_with(unicode(course_without_overview.id))
+
+        # Only one regeneration is scheduled at a time for each course.
+        CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(mock_delay.call_count, 1)
+
+    def test_get_from_ids_regenerates(self):
+        course = CourseFactory.create(emit_signals=False)
+
+        # Tasks run eagerly in tests, so the overview is ready for the next call.
+        self.assertEqual(CourseOverview.get_from_ids([course.id]), {})
+        with self.assertNumQueries(0):
+            course_ids_to_overviews = CourseOverview.get_from_ids([course.id])
+        self.assertEqual(course_ids_to_overviews[course.id].display_name, course.display_name)
+
 
 @attr(shard=3)
 @ddt.ddt
@@ -4,7 +4,9 @@ Helper functions for caching course assets.
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContent
+
+from .disk_cache import get_disk_cache
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -21,6 +23,19 @@ def set_cached_content(content):
     CONTENT_CACHE.set(unicode(content.location).encode("utf-8"), content, version=STATIC_CONTENT_VERSION)
 
 
+def set_cached_metadata(content):
+    """
+    Stores the given piece of content in the cache without its data, for
+    content whose data is not cached in memory.  The data of the cached copy is None.
+    """
+    set_cached_content(StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    ))
+
+
 def get_cached_content(location):
     """
     Retrieves the given piece of content by its location if cached.
@@ -30,7 +45,8 @@ def get_cached_content(location):
 
 def del_cached_content(location):
     """
-    Delete content for the given location, as well versions of the content without a run.
+    Delete content for the given location, as well versions of the content without a run,
+    and any copies of them in this server's disk cache.
 
     It's possible that the content could have been cached without knowing the course_key,
     and so without having the run.
@@ -39,11 +55,18 @@ def del_cached_content(location):
         """Force the location to a Unicode string."""
         return unicode(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.delete_many([location_str(loc) for loc in locations], version=STATIC_CONTENT_VERSION)
+
+    # The disk caches of other servers are keyed by content digest, so they
+    # never serve the data of an asset that has been uploaded again.
+    disk_cache = get_disk_cache()
+    if disk_cache is not None:
+        for loc in locations:
+            disk_cache.delete(loc)
@@ -0,0 +1,237 @@
+"""
+A cache of the data of course assets on the server's local disk.
+
+When settings.CONTENTSERVER['DISK_CACHE_ROOT'] is set, the contentserver
+keeps a copy of the data of each asset it serves in that directory, and
+serves later requests for the asset from it instead of fetching the data
+from memcached or the contentstore again.  The metadata of assets, which
+includes their lock state, is still read from the shared cache, so that
+Studio's invalidations reach every server.
+
+Copies are addressed by the asset's location and content digest, so an asset
+that is uploaded again is copied to a new file, and the copies of its old
+versions are never served again.  The least recently used copies are
+removed once the cache grows beyond DISK_CACHE_MAX_SIZE bytes.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+import dogstats_wrapper as dog_stats_api
+from xmodule.contentstore.content import StaticContentStream
+
+DISK_CACHE_METRIC_NAME = 'contentserver.disk_cache'
+DISK_CACHE_BYTES_METRIC_NAME = 'contentserver.disk_cache.bytes'
+
+# Once the cache is over its maximum size, copies are removed until it is
+# down to this fraction of it.
+EVICTION_TARGET = 0.9
+
+# The directory is shared by every process on the server, but each process
+# only knows the size of what it wrote itself since it last scanned it, so it
+# scans it again at least this often (in seconds).
+SCAN_INTERVAL = 60
+
+_DISK_CACHES = {}
+_DISK_CACHES_LOCK = threading.Lock()
+
+
+class AssetDiskCache(object):
+    """
+    A size bounded, least recently used cache of asset data in a directory.
+
+    Each copy is stored at `<root>/<xx>/<location hash>/<version>`, where
+    the version is the asset's content digest.  The modification time of a
+    copy is updated each time it is served, and is what eviction orders the
+    copies by, so any number of processes can share the directory.
+    """
+    def __init__(self, root, max_size):
+        self.root = root
+        self.max_size = max_size
+        # The size of the cache as of the last scan, plus what this process
+        # added since.  Other processes' copies are only counted once the
+        # directory is scanned again, after SCAN_INTERVAL or once this
+        # estimate exceeds max_size.
+        self._size = None
+        self._scanned_at = None
+
+    def _location_dir(self, location):
+        """
+        Returns the directory the copies of the asset at `location` are in.
+        """
+        location_hash = hashlib.sha1(unicode(location).encode('utf-8')).hexdigest()
+        return os.path.join(self.root, location_hash[:2], location_hash)
+
+    def path(self, content):
+        """
+        Returns the path of the copy of `content`, whether or not it exists.
+        """
+        version = content.content_digest or content.last_modified_at.strftime('%Y%m%d%H%M%S%f')
+        return os.path.join(self._location_dir(content.location), version)
+
+    def relative_path(self, content):
+        """
+        Returns the path of the copy of `content` relative to the cache root.
+        """
+        return os.path.relpath(self.path(content), self.root)
+
+    def lookup(self, content):
+        """
+        Returns the path of the copy of `content` if it is cached, marking it
+        as recently used, or None.
+        """
+        path = self.path(content)
+        try:
+            os.utime(path, None)
+        except OSError:
+            record_lookup(content, hit=False)
+            return None
+        record_lookup(content, hit=True)
+        return path
+
+    def get(self, content):
+        """
+        Returns a StaticContentStream of the copy of `content`, or None if it
+        isn't cached.
+        """
+        path = self.lookup(content)
+        if path is None:
+            return None
+        try:
+            return self.open(content, path)
+        except IOError:
+            # The copy was evicted in the meantime.
+            return None
+
+    def add(self, content):
+        """
+        Copies the data of `content` to the cache, and returns a
+        StaticContentStream of the copy.
+        """
+        return self.open(content, self.put(content))
+
+    def open(self, content, path):
+        """
+        Returns a StaticContentStream of `content` that reads its data from
+        the file at `path`.
+        """
+        return StaticContentStream(
+            content.location, content.name, content.content_type, open(path, 'rb'),
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked,
+            content_digest=content.content_digest,
+        )
+
+    def put(self, content):
+        """
+        Copies the data of `content` to the cache, and returns the path of the
+        copy.  The data is streamed to disk, so it is never all in memory.
+
+        The data is written to a temporary file that is then renamed, so that
+        a partly written copy is never served.
+        """
+        path = self.path(content)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another process created it in the meantime.
+                if not os.path.isdir(directory):
+                    raise
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                for chunk in content.stream_data():
+                    temp_file.write(chunk)
+            os.rename(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        if self._size is not None:
+            self._size += content.length or 0
+        if (
+                self._size is None or self._size > self.max_size or
+                time.time() - self._scanned_at > SCAN_INTERVAL
+        ):
+            self.evict()
+        return path
+
+    def delete(self, location):
+        """
+        Removes the copies of all versions of the asset at `location`.
+        """
+        shutil.rmtree(self._location_dir(location), ignore_errors=True)
+
+    def _entries(self):
+        """
+        Returns the (modification time, size, path) of every copy in the cache.
+        """
+        entries = []
+        for dirpath, __, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.startswith('.tmp'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """
+        Removes the least recently used copies until the cache is down to
+        EVICTION_TARGET of its maximum size, going by the size of every copy in
+        the directory, whichever process wrote it.
+        """
+        self._scanned_at = time.time()
+        entries = self._entries()
+        size = sum(entry_size for __, entry_size, __ in entries)
+        if size > self.max_size:
+            for __, entry_size, path in sorted(entries):
+                if size <= self.max_size * EVICTION_TARGET:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+        self._size = size
+
+
+def record_lookup(content, hit):
+    """
+    Records the result of a disk cache lookup for `content`, and the bytes
+    served from the disk cache on a hit.
+    """
+    result = 'hit' if hit else 'miss'
+    dog_stats_api.increment(DISK_CACHE_METRIC_NAME, tags=[u'result:{}'.format(result)])
+    if hit and content.length:
+        dog_stats_api.increment(DISK_CACHE_BYTES_METRIC_NAME, content.length)
+
+
+def get_disk_cache():
+    """
+    Returns the AssetDiskCache configured in settings.CONTENTSERVER, or None
+    if there is none.
+    """
+    contentserver_settings = getattr(settings, 'CONTENTSERVER', {})
+    root = contentserver_settings.get('DISK_CACHE_ROOT')
+    if not root:
+        return None
+
+    max_size = contentserver_settings.get('DISK_CACHE_MAX_SIZE')
+    key = (root, max_size)
+    with _DISK_CACHES_LOCK:
+        if key not in _DISK_CACHES:
+            _DISK_CACHES[key] = AssetDiskCache(root, max_size)
+        return _DISK_CACHES[key]
@@ -9,18 +9,22 @@ try:
     import newrelic.agent
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
+from django.conf import settings
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect,
+    StreamingHttpResponse)
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from . import sendfile
+from .caching import get_cached_content, set_cached_content, set_cached_metadata
+from .disk_cache import get_disk_cache
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -31,6 +35,9 @@ from .models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# The size of the chunks assets are streamed to the client in.
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
 
 class StaticContentServer(object):
     """
@@ -114,18 +121,27 @@ class StaticContentServer(object):
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
+            # If the front-end proxy serves large assets, it also handles any Range header.
+            response = None
+            disk_cache = get_disk_cache()
+            if disk_cache is not None and sendfile.is_enabled_for(content):
+                data_content = self.load_asset_data(content, loc)
+                response = sendfile.sendfile_response(disk_cache, data_content)
+                if response is None:
+                    content = data_content
+                else:
+                    if isinstance(data_content, StaticContentStream):
+                        data_content.close()
+                    if newrelic:
+                        newrelic.agent.add_custom_parameter('contentserver.sendfile', True)
+
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
             # Request -> Range attribute structure: "Range: bytes=first-[last]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
-            response = None
-            if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
+            if response is None and request.META.get('HTTP_RANGE'):
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -150,7 +166,7 @@ class StaticContentServer(object):
 
                         if 0 <= first <= last < content.length:
                             # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            response = self.content_response(content, loc, first, last)
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
@@ -167,7 +183,7 @@ class StaticContentServer(object):
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                response = self.content_response(content, loc)
                 response['Content-Length'] = content.length
 
             if newrelic:
@@ -269,6 +285,10 @@ class StaticContentServer(object):
         """
         Loads an asset based on its location, either retrieving it from a cache
         or loading it directly from the contentstore.
+
+        Assets larger than the MAX_CACHED_SIZE setting, and all assets when
+        there is a local disk cache, are cached without their data, which
+        load_asset_data loads when needed.
         """
 
         # See if we can load this item from cache.
@@ -280,15 +300,81 @@ class StaticContentServer(object):
             except (ItemNotFoundError, NotFoundError):
                 raise
 
+            disk_cache = get_disk_cache()
+            if disk_cache is not None:
+                # The data is served from the local disk, so only the metadata is shared.
+                set_cached_metadata(content)
+                cached_content = disk_cache.get(content)
+                if cached_content is not None:
+                    # Another request already copied this version of the asset.
+                    content.close()
+                    content = cached_content
+                else:
+                    content = self.copy_to_disk_cache(disk_cache, content)
+
             # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-            # because it's the default for memcached and also we don't want to do too much
-            # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
+            # by default because it's the default for memcached and also we don't want to do
+            # too much buffering in memory when we're serving an actual request.
+            elif content.length is not None and content.length < settings.CONTENTSERVER['MAX_CACHED_SIZE']:
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
+            else:
+                set_cached_metadata(content)
 
         return content
 
+    def load_asset_data(self, content, location):
+        """
+        Returns `content` if it holds the data of the asset, or else a
+        StaticContentStream of the asset, read from the local disk cache if
+        there is one, or from the contentstore.
+        """
+        if isinstance(content, StaticContentStream) or content.data is not None:
+            return content
+
+        disk_cache = get_disk_cache()
+        if disk_cache is not None:
+            cached_content = disk_cache.get(content)
+            if cached_content is not None:
+                return cached_content
+            return self.copy_to_disk_cache(disk_cache, AssetManager.find(location, as_stream=True))
+
+        return AssetManager.find(location, as_stream=True)
+
+    def copy_to_disk_cache(self, disk_cache, content):
+        """
+        Copies the StaticContentStream `content` to `disk_cache`, and returns
+        a StaticContentStream of the copy, or of the asset in the contentstore
+        if it can't be copied.  `content` is closed either way.
+        """
+        try:
+            return disk_cache.add(content)
+        except (IOError, OSError):
+            log.exception(u'Unable to copy the asset %s to the disk cache.', unicode(content.location))
+            return AssetManager.find(content.location, as_stream=True)
+        finally:
+            content.close()
+
+    def content_response(self, content, location, first_byte=None, last_byte=None):
+        """
+        Returns a response with the data of `content`, or with the bytes from
+        `first_byte` to `last_byte` (included) of it.
+
+        Data that isn't in memory is streamed from the contentstore as the
+        response is sent, rather than read into memory first.
+        """
+        content = self.load_asset_data(content, location)
+        if isinstance(content, StaticContentStream):
+            if first_byte is None:
+                return StreamingHttpResponse(content.stream_data(chunk_size=RESPONSE_CHUNK_SIZE))
+            return StreamingHttpResponse(
+                content.stream_data_in_range(first_byte, last_byte, chunk_size=RESPONSE_CHUNK_SIZE)
+            )
+
+        if first_byte is None:
+            return HttpResponse(content.data)
+        return HttpResponse(content.data[first_byte:last_byte + 1])
+
 
 def parse_range_header(header_value, content_length):
     """
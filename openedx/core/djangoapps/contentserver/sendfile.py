@@ -0,0 +1,49 @@
+"""
+Serving course assets through the front-end proxy.
+
+When settings.CONTENTSERVER['SENDFILE_HEADER'] is set, large assets that are
+in the local disk cache are not sent by the contentserver.  It answers with
+that header instead, which tells the front-end proxy to send the copy in the
+disk cache itself, as nginx's X-Accel-Redirect and apache's X-Sendfile do.
+The proxy then serves the body and any byte ranges of it without holding up
+a worker.
+"""
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+
+
+def _setting(name):
+    """
+    Returns the given setting of the contentserver.
+    """
+    return getattr(settings, 'CONTENTSERVER', {}).get(name)
+
+
+def is_enabled_for(content):
+    """
+    Returns whether `content` should be served by the front-end proxy.
+    """
+    if not _setting('SENDFILE_HEADER') or content.length is None:
+        return False
+    return content.length >= (_setting('SENDFILE_MIN_SIZE') or 0)
+
+
+def sendfile_response(disk_cache, content):
+    """
+    Returns a response that has the front-end proxy send the copy of
+    `content` in `disk_cache`, or None if there is no copy.
+    """
+    path = disk_cache.path(content)
+    if not os.path.exists(path):
+        return None
+
+    response = HttpResponse()
+    url_prefix = _setting('SENDFILE_URL_PREFIX')
+    if url_prefix is None:
+        response[_setting('SENDFILE_HEADER')] = path
+    else:
+        relative_path = disk_cache.relative_path(content).replace(os.path.sep, '/')
+        response[_setting('SENDFILE_HEADER')] = url_prefix.rstrip('/') + '/' + relative_path
+    return response
@@ -6,6 +6,9 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -402,6 +405,169 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         is_from_cdn = StaticContentServer.is_cdn_request(browser_request)
         self.assertEqual(is_from_cdn, True)
 
+    def _contentserver_settings(self, **kwargs):
+        """
+        Returns the CONTENTSERVER setting with the given values overridden.
+        """
+        contentserver_settings = dict(settings.CONTENTSERVER)
+        contentserver_settings.update(kwargs)
+        return contentserver_settings
+
+    def test_large_asset_streamed(self):
+        """
+        Test that assets too large to be cached are streamed, with only their metadata cached.
+        """
+        data = self.contentstore.find(self.unlocked_asset).data
+        with override_settings(CONTENTSERVER=self._contentserver_settings(MAX_CACHED_SIZE=1)):
+            with patch('openedx.core.djangoapps.contentserver.middleware.set_cached_metadata') as mock_set_metadata:
+                resp = self.client.get(self.url_unlocked)
+                self.assertTrue(mock_set_metadata.called)
+            self.assertEqual(resp.status_code, 200)
+            self.assertTrue(resp.streaming)
+            self.assertEqual(''.join(resp.streaming_content), data)
+
+            first_byte = self.length_unlocked / 4
+            last_byte = self.length_unlocked / 2
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}'.format(
+                first=first_byte, last=last_byte))
+            self.assertEqual(resp.status_code, 206)
+            self.assertTrue(resp.streaming)
+            self.assertEqual(''.join(resp.streaming_content), data[first_byte:last_byte + 1])
+
+    def test_range_request_in_memory(self):
+        """
+        Test that ranges of cached assets are served from memory.
+        """
+        cached_content = self.contentstore.find(self.unlocked_asset)
+        with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content') as mock_get_cached_content:
+            mock_get_cached_content.return_value = cached_content
+            with patch('openedx.core.djangoapps.contentserver.middleware.AssetManager.find') as mock_find:
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+                self.assertFalse(mock_find.called)
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.content, cached_content.data[:10])
+
+    def test_cached_metadata_not_modified(self):
+        """
+        Test that conditional requests for assets whose metadata is cached don't load the asset.
+        """
+        content = self.contentstore.find(self.unlocked_asset)
+        with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content') as mock_get_cached_content:
+            mock_get_cached_content.return_value = StaticContent(
+                content.location, content.name, content.content_type, None,
+                last_modified_at=content.last_modified_at, length=content.length,
+            )
+            with patch('openedx.core.djangoapps.contentserver.middleware.AssetManager.find') as mock_find:
+                resp = self.client.get(
+                    self.url_unlocked,
+                    HTTP_IF_MODIFIED_SINCE=content.last_modified_at.strftime(HTTP_DATE_FORMAT),
+                )
+                self.assertFalse(mock_find.called)
+        self.assertEqual(resp.status_code, 304)
+
+    def _disk_cache_settings(self, **kwargs):
+        """
+        Returns the CONTENTSERVER setting with a disk cache in a temporary
+        directory, and the given values overridden.
+        """
+        disk_cache_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, disk_cache_root)
+        return self._contentserver_settings(DISK_CACHE_ROOT=disk_cache_root, **kwargs)
+
+    def _metadata(self, content):
+        """
+        Returns a copy of `content` without its data, as it is cached along a disk cache.
+        """
+        return StaticContent(
+            content.location, content.name, content.content_type, None,
+            last_modified_at=content.last_modified_at, length=content.length,
+            content_digest=content.content_digest,
+        )
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content')
+    def test_disk_cache(self, mock_get_cached_content):
+        """
+        Test that the data of assets is served from the disk cache once it is copied there.
+        """
+        content = self.contentstore.find(self.unlocked_asset)
+        mock_get_cached_content.return_value = None
+        with override_settings(CONTENTSERVER=self._disk_cache_settings()):
+            with patch('openedx.core.djangoapps.contentserver.middleware.set_cached_metadata') as mock_set_metadata:
+                resp = self.client.get(self.url_unlocked)
+                self.assertTrue(mock_set_metadata.called)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(''.join(resp.streaming_content), content.data)
+
+            mock_get_cached_content.return_value = self._metadata(content)
+            with patch('openedx.core.djangoapps.contentserver.middleware.AssetManager.find') as mock_find:
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+                self.assertFalse(mock_find.called)
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(''.join(resp.streaming_content), content.data[:10])
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content')
+    def test_disk_cache_hit_not_copied_again(self, mock_get_cached_content):
+        """
+        Test that an asset already on disk isn't copied again when its metadata is not cached.
+        """
+        content = self.contentstore.find(self.unlocked_asset)
+        mock_get_cached_content.return_value = None
+        with override_settings(CONTENTSERVER=self._disk_cache_settings()):
+            self.client.get(self.url_unlocked)
+            with patch('openedx.core.djangoapps.contentserver.disk_cache.AssetDiskCache.put') as mock_put:
+                resp = self.client.get(self.url_unlocked)
+                self.assertFalse(mock_put.called)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(''.join(resp.streaming_content), content.data)
+
+    @ddt.data(
+        ('/protected-course-assets/', False),
+        (None, True),
+    )
+    @ddt.unpack
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content')
+    def test_sendfile(self, url_prefix, absolute_path, mock_get_cached_content):
+        """
+        Test that large assets are copied to the disk cache and served by the front-end proxy.
+        """
+        mock_get_cached_content.return_value = None
+        contentserver_settings = self._disk_cache_settings(
+            SENDFILE_HEADER='X-Accel-Redirect',
+            SENDFILE_MIN_SIZE=self.length_unlocked,
+            SENDFILE_URL_PREFIX=url_prefix,
+        )
+        with override_settings(CONTENTSERVER=contentserver_settings):
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, '')
+        self.assertNotIn('Content-Range', resp)
+        header = resp['X-Accel-Redirect']
+        if absolute_path:
+            path = header
+        else:
+            self.assertTrue(header.startswith(url_prefix))
+            path = os.path.join(contentserver_settings['DISK_CACHE_ROOT'], header[len(url_prefix):])
+        with open(path, 'rb') as copied_file:
+            self.assertEqual(copied_file.read(), self.contentstore.find(self.unlocked_asset).data)
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content')
+    def test_sendfile_small_asset(self, mock_get_cached_content):
+        """
+        Test that assets smaller than SENDFILE_MIN_SIZE are served directly.
+        """
+        mock_get_cached_content.return_value = None
+        contentserver_settings = self._disk_cache_settings(
+            SENDFILE_HEADER='X-Accel-Redirect',
+            SENDFILE_MIN_SIZE=self.length_unlocked + 1,
+        )
+        with override_settings(CONTENTSERVER=contentserver_settings):
+            resp = self.client.get(self.url_unlocked)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn('X-Accel-Redirect', resp)
+        self.assertEqual(''.join(resp.streaming_content), self.contentstore.find(self.unlocked_asset).data)
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
@@ -0,0 +1,112 @@
+"""
+Tests for the local disk cache of course assets.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
+from xmodule.contentstore.content import StaticContent
+
+from ..disk_cache import AssetDiskCache, DISK_CACHE_BYTES_METRIC_NAME, DISK_CACHE_METRIC_NAME, SCAN_INTERVAL
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for AssetDiskCache.
+    """
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.disk_cache = AssetDiskCache(self.root, max_size=100)
+        self.course_key = CourseLocator('edX', 'toy', '2012_Fall')
+
+    def _content(self, name, data, digest=None):
+        """
+        Returns a StaticContent of the asset `name` holding `data`.
+        """
+        return StaticContent(
+            self.course_key.make_asset_key('asset', name), name, 'text/plain', data,
+            length=len(data), content_digest=digest or name + str(len(data)),
+        )
+
+    def test_put_and_get(self):
+        content = self._content('a.txt', 'some data')
+        self.assertIsNone(self.disk_cache.get(content))
+
+        self.disk_cache.put(content)
+        cached_content = self.disk_cache.get(content)
+        self.assertEqual(''.join(cached_content.stream_data()), 'some data')
+        self.assertEqual(''.join(cached_content.stream_data_in_range(5, 8)), 'data')
+        self.assertEqual(cached_content.location, content.location)
+        self.assertEqual(cached_content.content_digest, content.content_digest)
+        cached_content.close()
+
+    def test_new_version_misses(self):
+        self.disk_cache.put(self._content('a.txt', 'old data', digest='old'))
+        self.assertIsNone(self.disk_cache.get(self._content('a.txt', 'new data', digest='new')))
+
+    def test_delete(self):
+        first_version = self._content('a.txt', 'old data', digest='old')
+        second_version = self._content('a.txt', 'new data', digest='new')
+        other_content = self._content('b.txt', 'other data')
+        for content in (first_version, second_version, other_content):
+            self.disk_cache.put(content)
+
+        self.disk_cache.delete(first_version.location)
+        self.assertIsNone(self.disk_cache.lookup(first_version))
+        self.assertIsNone(self.disk_cache.lookup(second_version))
+        self.assertIsNotNone(self.disk_cache.lookup(other_content))
+
+    def test_least_recently_used_evicted(self):
+        contents = [self._content('{}.txt'.format(index), 'x' * 40) for index in range(3)]
+        self.disk_cache.put(contents[0])
+        self.disk_cache.put(contents[1])
+        # Use the first copy, so that the second is the least recently used.
+        os.utime(self.disk_cache.path(contents[1]), (0, 0))
+        self.disk_cache.lookup(contents[0])
+
+        # The cache is over its maximum size of 100 bytes once the third is added.
+        self.disk_cache.put(contents[2])
+        self.assertIsNotNone(self.disk_cache.lookup(contents[0]))
+        self.assertIsNone(self.disk_cache.lookup(contents[1]))
+        self.assertIsNotNone(self.disk_cache.lookup(contents[2]))
+
+    def test_other_processes_copies_counted(self):
+        contents = [self._content('{}.txt'.format(index), 'x' * 40) for index in range(3)]
+        self.disk_cache.put(contents[0])
+        # Another process sharing the directory adds a copy this one doesn't know of.
+        AssetDiskCache(self.root, max_size=100).put(contents[1])
+        os.utime(self.disk_cache.path(contents[0]), (0, 0))
+
+        with patch('openedx.core.djangoapps.contentserver.disk_cache.time.time') as mock_time:
+            mock_time.return_value = self.disk_cache._scanned_at + SCAN_INTERVAL + 1  # pylint: disable=protected-access
+            self.disk_cache.put(contents[2])
+        self.assertIsNone(self.disk_cache.lookup(contents[0]))
+        self.assertIsNotNone(self.disk_cache.lookup(contents[1]))
+        self.assertIsNotNone(self.disk_cache.lookup(contents[2]))
+
+    def test_failed_copy_not_cached(self):
+        content = self._content('a.txt', 'some data')
+        with patch.object(StaticContent, 'stream_data', side_effect=IOError):
+            with self.assertRaises(IOError):
+                self.disk_cache.put(content)
+        self.assertIsNone(self.disk_cache.lookup(content))
+        self.assertEqual(
+            [filenames for __, __, filenames in os.walk(self.root) if filenames],
+            []
+        )
+
+    @patch('openedx.core.djangoapps.contentserver.disk_cache.dog_stats_api')
+    def test_metrics(self, mock_dog_stats_api):
+        content = self._content('a.txt', 'some data')
+        self.disk_cache.lookup(content)
+        self.disk_cache.put(content)
+        self.disk_cache.lookup(content)
+
+        mock_dog_stats_api.increment.assert_any_call(DISK_CACHE_METRIC_NAME, tags=[u'result:miss'])
+        mock_dog_stats_api.increment.assert_any_call(DISK_CACHE_METRIC_NAME, tags=[u'result:hit'])
+        mock_dog_stats_api.increment.assert_any_call(DISK_CACHE_BYTES_METRIC_NAME, len('some data'))
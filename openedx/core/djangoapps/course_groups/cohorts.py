@@ -5,9 +5,12 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+import time
+from collections import defaultdict
 
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models.signals import post_delete, post_save, m2m_changed
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import ugettext as _
@@ -28,6 +31,22 @@ from .models import (
 
 log = logging.getLogger(__name__)
 
+# The cohort of each user in a course is cached under the current version of
+# the course's memberships, which is bumped whenever any of them changes.
+COHORT_MEMBERSHIP_CACHE_KEY = u'cohorts.membership.{course_key}.{version}.{user_id}'
+COHORT_MEMBERSHIP_VERSION_KEY = u'cohorts.membership.version.{course_key}'
+
+# How long, in seconds, memberships are cached.  Changes invalidate them right
+# away, so this only bounds how long a membership read while a change was being
+# committed can be served.
+COHORT_MEMBERSHIP_CACHE_TIMEOUT = 60 * 60
+
+# Cached for users who have no cohort, as the cache returns None for misses.
+NO_COHORT = 0
+
+# Number of users whose memberships are looked up in each query.
+COHORT_MEMBERSHIP_QUERY_CHUNK_SIZE = 1000
+
 
 @receiver(post_save, sender=CourseUserGroup)
 def _cohort_added(sender, **kwargs):
@@ -82,6 +101,39 @@ def _cohort_membership_changed(sender, **kwargs):
         tracker.emit(event_name, event)
 
 
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def _invalidate_cached_memberships(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidates the cached cohort memberships of the course each time a membership changes"""
+    _bump_memberships_version(instance.course_id)
+
+
+def _get_memberships_version(course_key):
+    """
+    Returns the current version of the cohort memberships of the course.
+    """
+    version_key = COHORT_MEMBERSHIP_VERSION_KEY.format(course_key=course_key)
+    version = cache.get(version_key)
+    if version is None:
+        # Start from the current time rather than 0, so that memberships
+        # cached before the version was evicted can't be mistaken for current.
+        version = int(time.time() * 1000)
+        cache.add(version_key, version, None)
+        version = cache.get(version_key, version)
+    return version
+
+
+def _bump_memberships_version(course_key):
+    """
+    Invalidates the cached cohort memberships of the course.
+    """
+    version_key = COHORT_MEMBERSHIP_VERSION_KEY.format(course_key=course_key)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, int(time.time() * 1000), None)
+
+
 # A 'default cohort' is an auto-cohort that is automatically created for a course if no cohort with automatic
 # assignment have been specified. It is intended to be used in a cohorted course for users who have yet to be assigned
 # to a cohort, if the course staff have not explicitly created a cohort of type "RANDOM".
@@ -213,6 +265,152 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
         return get_cohort(user, course_key, assign, use_cached)
 
 
+def get_cohort_ids_for_users(course_key, user_ids, assign=False):
+    """Returns the ids of the users' cohorts in the specified course.
+
+    The memberships are looked up in the cache, and those that aren't
+    cached are fetched from the database in a query for each
+    COHORT_MEMBERSHIP_QUERY_CHUNK_SIZE users.
+
+    Arguments:
+        course_key: CourseKey
+        user_ids: ids of Django User objects.
+        assign (bool): if True then the users who don't have a cohort are
+            randomly assigned one, as get_cohort does, in a few queries.
+
+    Returns:
+        A dict of each user id to the id of the user's cohort, or to None if
+        the course isn't cohorted or the user doesn't have a cohort.
+
+    Raises:
+       Http404 if the course doesn't exist.
+    """
+    user_ids = set(user_ids)
+    if not get_course_cohort_settings(course_key).is_cohorted:
+        return dict.fromkeys(user_ids)
+
+    version = _get_memberships_version(course_key)
+    cohort_ids = {}
+    user_ids = sorted(user_ids)
+    for start in range(0, len(user_ids), COHORT_MEMBERSHIP_QUERY_CHUNK_SIZE):
+        cache_keys = {
+            COHORT_MEMBERSHIP_CACHE_KEY.format(course_key=course_key, version=version, user_id=user_id): user_id
+            for user_id in user_ids[start:start + COHORT_MEMBERSHIP_QUERY_CHUNK_SIZE]
+        }
+        cached = cache.get_many(cache_keys.keys())
+        for cache_key, cohort_id in cached.iteritems():
+            cohort_ids[cache_keys[cache_key]] = cohort_id or None
+
+        missing = {cache_key: user_id for cache_key, user_id in cache_keys.iteritems() if cache_key not in cached}
+        if missing:
+            memberships = dict(CohortMembership.objects.filter(
+                course_id=course_key,
+                user_id__in=missing.values(),
+            ).values_list('user_id', 'course_user_group_id'))
+            cache.set_many(
+                {cache_key: memberships.get(user_id, NO_COHORT) for cache_key, user_id in missing.iteritems()},
+                COHORT_MEMBERSHIP_CACHE_TIMEOUT
+            )
+            for user_id in missing.itervalues():
+                cohort_ids[user_id] = memberships.get(user_id)
+
+    if assign:
+        unassigned = [user_id for user_id, cohort_id in cohort_ids.iteritems() if cohort_id is None]
+        if unassigned:
+            cohort_ids.update(_assign_random_cohorts(course_key, unassigned))
+    return cohort_ids
+
+
+def _assign_random_cohorts(course_key, user_ids):
+    """
+    Assigns each of the users, who don't have a cohort in the course, one of
+    its random cohorts, creating the default cohort if it has none.
+
+    Returns a dict of each user id to the id of the user's cohort, which is
+    the one they already had if they were assigned one meanwhile.
+    """
+    random_cohorts = _get_random_cohorts(course_key)
+    user_ids_by_cohort = defaultdict(list)
+    for user_id in user_ids:
+        user_ids_by_cohort[local_random().choice(random_cohorts)].append(user_id)
+
+    cohort_ids = {}
+    for cohort, cohort_user_ids in user_ids_by_cohort.iteritems():
+        for user_id in _add_new_memberships(cohort, cohort_user_ids):
+            cohort_ids[user_id] = cohort.id
+    _bump_memberships_version(course_key)
+
+    assigned_meanwhile = set(user_ids) - set(cohort_ids)
+    if assigned_meanwhile:
+        cohort_ids.update(CohortMembership.objects.filter(
+            course_id=course_key,
+            user_id__in=assigned_meanwhile,
+        ).values_list('user_id', 'course_user_group_id'))
+    return cohort_ids
+
+
+def _add_new_memberships(cohort, user_ids):
+    """
+    Adds the users, who don't have a cohort in the course, to the cohort,
+    creating their memberships in a single query when none of them has been
+    assigned a cohort meanwhile.
+
+    Memberships are created in bulk without calling CohortMembership.save, so
+    callers must invalidate the cached memberships of the course.
+
+    Returns the ids of the users who were added.  Those who were assigned a
+    cohort meanwhile are left in it.
+    """
+    def create_memberships(user_ids):
+        """
+        Creates the memberships of the users, and adds them to the cohort's users.
+        """
+        with transaction.atomic():
+            CohortMembership.objects.bulk_create([
+                CohortMembership(course_user_group=cohort, user_id=user_id, course_id=cohort.course_id)
+                for user_id in user_ids
+            ])
+            cohort.users.add(*user_ids)
+
+    if not user_ids:
+        return []
+    try:
+        create_memberships(user_ids)
+        return list(user_ids)
+    except IntegrityError:
+        log.info(
+            "HANDLING_INTEGRITY_ERROR: Cohort memberships created meanwhile for course '%s', adding users one by one",
+            cohort.course_id
+        )
+
+    added = []
+    for user_id in user_ids:
+        try:
+            create_memberships([user_id])
+            added.append(user_id)
+        except IntegrityError:
+            pass
+    return added
+
+
+def _get_random_cohorts(course_key):
+    """
+    Returns the cohorts of type RANDOM in the course, creating the default
+    cohort if there are none.
+    """
+    course = courses.get_course(course_key)
+    cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
+    if not cohorts:
+        cohorts = [
+            CourseCohort.create(
+                cohort_name=DEFAULT_COHORT_NAME,
+                course_id=course_key,
+                assignment_type=CourseCohort.RANDOM
+            ).course_user_group
+        ]
+    return cohorts
+
+
 def get_random_cohort(course_key):
     """
     Helper method to get a cohort for random assignment.
@@ -220,17 +418,7 @@ def get_random_cohort(course_key):
     If there are multiple cohorts of type RANDOM in the course, one of them will be randomly selected.
     If there are no existing cohorts of type RANDOM in the course, one will be created.
     """
-    course = courses.get_course(course_key)
-    cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
-    if cohorts:
-        cohort = local_random().choice(cohorts)
-    else:
-        cohort = CourseCohort.create(
-            cohort_name=DEFAULT_COHORT_NAME,
-            course_id=course_key,
-            assignment_type=CourseCohort.RANDOM
-        ).course_user_group
-    return cohort
+    return local_random().choice(_get_random_cohorts(course_key))
 
 
 def migrate_cohort_settings(course):
@@ -407,6 +595,80 @@ def add_user_to_cohort(cohort, username_or_email):
     return (user, membership.previous_cohort_name)
 
 
+def add_users_to_cohort(cohort, users):
+    """
+    Add the given users to the specified cohort, moving those who are in
+    another cohort of the course, in a few queries whatever the number of
+    users.
+
+    Arguments:
+        cohort: CourseUserGroup
+        users: Django User objects
+
+    Returns:
+        Tuple of a list of (User object, string (or None) indicating previous
+        cohort) tuples of the users who were added, and a list of the User
+        objects of those who were already present in the cohort.
+    """
+    users = {user.id: user for user in users}
+    previous_cohorts = {}
+    with transaction.atomic():
+        # The memberships are locked, so that they can't be moved to another
+        # cohort before they are moved to this one.
+        memberships = {
+            membership.user_id: membership
+            for membership in CohortMembership.objects.select_for_update().filter(
+                course_id=cohort.course_id,
+                user_id__in=users.keys(),
+            ).select_related('course_user_group')
+        }
+        present = [
+            users[user_id] for user_id, membership in memberships.iteritems()
+            if membership.course_user_group_id == cohort.id
+        ]
+        moved = [membership for membership in memberships.itervalues() if membership.course_user_group_id != cohort.id]
+        if moved:
+            user_ids_by_previous_cohort = defaultdict(list)
+            for membership in moved:
+                user_ids_by_previous_cohort[membership.course_user_group].append(membership.user_id)
+                previous_cohorts[membership.user_id] = membership.course_user_group
+            for previous_cohort, user_ids in user_ids_by_previous_cohort.iteritems():
+                previous_cohort.users.remove(*user_ids)
+            CohortMembership.objects.filter(
+                id__in=[membership.id for membership in moved]
+            ).update(course_user_group=cohort)
+            cohort.users.add(*previous_cohorts.keys())
+
+    new_user_ids = [user_id for user_id in users if user_id not in memberships]
+    added_user_ids = _add_new_memberships(cohort, new_user_ids)
+    _bump_memberships_version(cohort.course_id)
+    added = [(users[user_id], previous_cohorts[user_id]) for user_id in previous_cohorts]
+    added.extend((users[user_id], None) for user_id in added_user_ids)
+
+    # Users who were assigned a cohort meanwhile are added one by one.
+    for user_id in set(new_user_ids) - set(added_user_ids):
+        membership = CohortMembership(course_user_group=cohort, user=users[user_id])
+        try:
+            membership.save()
+        except ValueError:
+            present.append(users[user_id])
+        else:
+            added.append((users[user_id], membership.previous_cohort))
+
+    for user, previous_cohort in added:
+        tracker.emit(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": user.id,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+                "previous_cohort_id": previous_cohort.id if previous_cohort else None,
+                "previous_cohort_name": previous_cohort.name if previous_cohort else None,
+            }
+        )
+    return [(user, previous_cohort.name if previous_cohort else None) for user, previous_cohort in added], present
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
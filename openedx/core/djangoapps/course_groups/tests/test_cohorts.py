@@ -303,6 +303,78 @@ class TestCohorts(ModuleStoreTestCase):
         # get_cohort should return a group for user
         self.assertEquals(cohorts.get_cohort(user, course.id).name, "AutoGroup")
 
+    def test_get_cohort_ids_for_users(self):
+        """
+        Make sure cohorts.get_cohort_ids_for_users() returns the users' cohort
+        ids, and sees the changes to their memberships.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        user1 = UserFactory(username="test", email="a@b.com")
+        user2 = UserFactory(username="test2", email="a2@b.com")
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id]),
+            {user1.id: None, user2.id: None}
+        )
+
+        config_course_cohorts(course, is_cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=[user1])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id]),
+            {user1.id: first_cohort.id, user2.id: None}
+        )
+        # The memberships are cached
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id]),
+                {user1.id: first_cohort.id, user2.id: None}
+            )
+
+        cohorts.add_user_to_cohort(second_cohort, user1.username)
+        cohorts.add_user_to_cohort(first_cohort, user2.username)
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id]),
+            {user1.id: second_cohort.id, user2.id: first_cohort.id}
+        )
+
+        cohorts.remove_user_from_cohort(second_cohort, user1.username)
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id]),
+            {user1.id: None, user2.id: first_cohort.id}
+        )
+
+    def test_get_cohort_ids_for_users_with_assign(self):
+        """
+        Make sure cohorts.get_cohort_ids_for_users() assigns random cohorts
+        to the users who don't have one when asked to.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        user1 = UserFactory(username="test", email="a@b.com")
+        user2 = UserFactory(username="test2", email="a2@b.com")
+        user3 = UserFactory(username="test3", email="a3@b.com")
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=[user1])
+        config_course_cohorts(
+            course,
+            is_cohorted=True,
+            auto_cohorts=["AutoGroup"]
+        )
+        auto_cohort = cohorts.get_cohort_by_name(course.id, "AutoGroup")
+
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id, user3.id], assign=False),
+            {user1.id: cohort.id, user2.id: None, user3.id: None}
+        )
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user1.id, user2.id, user3.id], assign=True),
+            {user1.id: cohort.id, user2.id: auto_cohort.id, user3.id: auto_cohort.id}
+        )
+        self.assertEqual(cohorts.get_cohort(user2, course.id, assign=False), auto_cohort)
+        self.assertEqual(set(auto_cohort.users.all()), {user2, user3})
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user2.id, user3.id]),
+            {user2.id: auto_cohort.id, user3.id: auto_cohort.id}
+        )
+
     def test_cohorting_with_auto_cohorts(self):
         """
         Make sure cohorts.get_cohort() does the right thing.
@@ -633,6 +705,48 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_add_users_to_cohort(self, mock_tracker):
+        """
+        Make sure cohorts.add_users_to_cohort() adds the users who aren't in a
+        cohort, moves those in another cohort, and leaves those in the cohort.
+        """
+        new_user = UserFactory(username="NewUser", email="a@b.com")
+        moved_user = UserFactory(username="MovedUser", email="b@b.com")
+        present_user = UserFactory(username="PresentUser", email="c@b.com")
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=[moved_user])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort", users=[present_user])
+
+        added, present = cohorts.add_users_to_cohort(second_cohort, [new_user, moved_user, present_user])
+        self.assertItemsEqual(added, [(new_user, None), (moved_user, "FirstCohort")])
+        self.assertEqual(present, [present_user])
+
+        self.assertEqual(set(second_cohort.users.all()), {new_user, moved_user, present_user})
+        self.assertFalse(first_cohort.users.exists())
+        for user in (new_user, moved_user, present_user):
+            self.assertEqual(cohorts.get_cohort(user, course.id, assign=False), second_cohort)
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": moved_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": new_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": None,
+                "previous_cohort_name": None,
+            }
+        )
+
     @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
     def add_user_to_cohorts_race_condition(self, mock_tracker):
         """
@@ -20,6 +20,7 @@ from openedx.core.djangoapps.catalog.tests.factories import (
     CourseRunFactory,
     SeatFactory,
 )
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.programs.tests.factories import ProgressFactory
 from openedx.core.djangoapps.programs.utils import (
     DEFAULT_ENROLLMENT_START_DATE, ProgramProgressMeter, ProgramDataExtender, ProgramMarketingDataExtender
@@ -419,6 +420,18 @@ class TestProgramDataExtender(ModuleStoreTestCase):
 
         self.assertEqual(actual, self.program)
 
+    def test_course_overviews_loaded_together(self):
+        """
+        Verify that the overviews of the course runs are loaded with a single
+        multi-get, rather than one at a time.
+        """
+        CourseOverview.get_from_id(self.course.id)
+        with mock.patch.object(CourseOverview, 'get_from_id') as mock_get_from_id:
+            data = ProgramDataExtender(self.program, self.user).extend()
+
+        self.assertFalse(mock_get_from_id.called)
+        self._assert_supplemented(data)
+
     @ddt.data(-1, 0, 1)
     def test_is_enrollment_open(self, days_offset):
         """
@@ -7,16 +7,29 @@ import textwrap
 MAX_LINE_LENGTH = 900
 
 
-def wrap_message(message, width=MAX_LINE_LENGTH):
+def wrap_message(message, width=MAX_LINE_LENGTH, cache=None):
     """
     RFC 2822 states that line lengths in emails must be less than 998. Some MTA's add newlines to messages if any line
     exceeds a certain limit (the exact limit varies). Sendmail goes so far as to add '!\n' after the 990th character in
     a line. To ensure that messages look consistent this helper function wraps long lines to a conservative length.
+
+    If a `cache` dict is given, the wrapped versions of long lines are kept in it, so that the lines that many
+    messages share, such as those of an email to many recipients, are only wrapped once.
     """
-    lines = message.split('\n')
-    wrapped_lines = [textwrap.fill(
-        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
-    ) for line in lines]
+    wrapped_lines = []
+    for line in message.split('\n'):
+        # Lines that are short enough are left as they are, without the cost of wrapping them.
+        if len(line) > width:
+            wrapped_line = cache.get(line) if cache is not None else None
+            if wrapped_line is None:
+                wrapped_line = textwrap.fill(
+                    line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False,
+                    break_on_hyphens=False
+                )
+                if cache is not None:
+                    cache[line] = wrapped_line
+            line = wrapped_line
+        wrapped_lines.append(line)
     wrapped_message = '\n'.join(wrapped_lines)
 
     return wrapped_message
@@ -67,6 +67,10 @@ class DiscussionXBlock(XBlock, StudioEditableXBlockMixin, XmlParserMixin):
 
     has_author_view = True  # Tells Studio to use author_view
 
+    # The LMS may cache student_view per user, as it only depends on the
+    # user's forum permissions (see lms.djangoapps.lms_xblock.fragment_cache)
+    student_view_cache_vary_on = ('user_id',)
+
     # support for legacy OLX format - consumed by XmlParserMixin.load_metadata
     metadata_translations = dict(RawDescriptor.metadata_translations)
     metadata_translations['id'] = 'discussion_id'